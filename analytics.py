@@ -0,0 +1,277 @@
+# analytics.py
+
+from datetime import date, timedelta
+
+import numpy as np
+
+from archive import load_archived
+
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+PERIOD_TITLES = {"day": "Daily", "week": "Weekly", "month": "Monthly"}
+
+
+class History:
+    def __init__(self, start, end, task_ids, days, seconds, names, resolution="day"):
+        """
+        Initialize a date range of per-task daily totals held in NumPy arrays.
+
+        Parameters:
+        - start (str): First day included (YYYY-MM-DD).
+        - end (str): First day excluded (YYYY-MM-DD).
+        - task_ids (numpy.ndarray): Dense task index of each row (0..len(names)-1).
+        - days (numpy.ndarray): Day of each row, as an offset from start.
+        - seconds (numpy.ndarray): Tracked seconds of each row (corrections included).
+        - names (list): Task name of each dense index, sorted by name.
+        - resolution (str): 'day', or 'month' when loaded from the monthly
+          rollup (rows then sit on the first day of their month).
+
+        Behavior:
+        - Every statistic is a bincount/cumsum over these arrays, so daily,
+          weekly and monthly breakdowns of years of history need no further
+          SQL. Use load_history() to build one.
+        """
+        self.start = date.fromisoformat(start)
+        self.end = date.fromisoformat(end)
+        self.day_count = (self.end - self.start).days
+        self.task_ids = task_ids
+        self.days = days
+        self.seconds = seconds
+        self.names = names
+        self.resolution = resolution
+
+    def totals(self):
+        """Return the total seconds of each task (array indexed like names)."""
+        return np.bincount(self.task_ids, weights=self.seconds, minlength=len(self.names))
+
+    def task_totals(self):
+        """
+        Return (name, total_seconds) tuples sorted by name, one per task with
+        entries in the range (the shape reports and exports consume).
+        """
+        return [(name, round_seconds(total)) for name, total in zip(self.names, self.totals().tolist())]
+
+    def matrix(self, buckets, bucket_count):
+        """
+        Sum seconds per task per bucket.
+
+        Parameters:
+        - buckets (numpy.ndarray): Bucket of each day offset (length day_count).
+        - bucket_count (int): Number of buckets.
+
+        Returns:
+        - numpy.ndarray: (tasks x buckets) matrix of seconds.
+        """
+        flat = self.task_ids * bucket_count + buckets[self.days]
+        counts = np.bincount(flat, weights=self.seconds, minlength=len(self.names) * bucket_count)
+        return counts.reshape(len(self.names), bucket_count)
+
+    def per_day(self):
+        """Return the (tasks x days) matrix of seconds."""
+        self.require_days()
+        return self.matrix(np.arange(self.day_count), self.day_count)
+
+    def per_weekday(self):
+        """Return the (tasks x 7) matrix of seconds, Monday first."""
+        self.require_days()
+        weekdays = (np.arange(self.day_count) + self.start.weekday()) % 7
+        return self.matrix(weekdays, 7)
+
+    def per_week(self):
+        """
+        Return the (tasks x weeks) matrix of seconds and the Monday of each week.
+
+        Returns:
+        - tuple: (matrix, list of week start dates as YYYY-MM-DD). Weeks are
+          ISO weeks (Monday to Sunday); the first and last may be partial.
+        """
+        self.require_days()
+        offset = self.start.weekday()
+        weeks = (np.arange(self.day_count) + offset) // 7
+        week_count = int(weeks[-1]) + 1 if self.day_count else 0
+        monday = self.start - timedelta(days=offset)
+        labels = [(monday + timedelta(weeks=week)).isoformat() for week in range(week_count)]
+        return self.matrix(weeks, week_count), labels
+
+    def per_month(self):
+        """
+        Return the (tasks x months) matrix of seconds and the label of each month.
+
+        Returns:
+        - tuple: (matrix, list of YYYY-MM labels).
+        """
+        first = self.start.year * 12 + self.start.month - 1
+        months = np.array([(day.year * 12 + day.month - 1) - first for day in self.dates()], dtype=np.int64)
+        month_count = self.month_count()
+        labels = [f"{(first + month) // 12:04}-{(first + month) % 12 + 1:02}" for month in range(month_count)]
+        return self.matrix(months, month_count), labels
+
+    def require_days(self):
+        """Raise ValueError unless the history was loaded per day."""
+        if self.resolution != "day":
+            raise ValueError("this statistic needs a history loaded with resolution='day'")
+
+    def month_count(self):
+        """Return the number of (possibly partial) months in the range."""
+        if not self.day_count:
+            return 0
+        last = self.end - timedelta(days=1)
+        return (last.year - self.start.year) * 12 + last.month - self.start.month + 1
+
+    def dates(self):
+        """Return the date of each day offset of the range."""
+        return [self.start + timedelta(days=day) for day in range(self.day_count)]
+
+    def top(self, n, values=None):
+        """
+        Return the indexes of the n tasks with the most time, largest first.
+
+        Parameters:
+        - n (int): Number of tasks.
+        - values (numpy.ndarray): Per-task values to rank by (default: totals()).
+        """
+        values = self.totals() if values is None else values
+        n = min(n, len(values))
+        if n == 0:
+            return np.array([], dtype=np.int64)
+        candidates = np.argpartition(-values, n - 1)[:n]
+        return candidates[np.argsort(-values[candidates], kind="stable")]
+
+    def daily_rows(self):
+        """
+        Yield (date, task name, seconds) for each task and day with an entry,
+        by date then name (the 'Daily' detail table of the exports).
+        """
+        self.require_days()
+        width = len(self.names)
+        keys, inverse = np.unique(self.days * width + self.task_ids, return_inverse=True)
+        totals = np.bincount(inverse, weights=self.seconds)
+        for key, total in zip(keys.tolist(), totals.tolist()):
+            day, task = divmod(key, width)
+            yield (self.start + timedelta(days=day)).isoformat(), self.names[task], round_seconds(total)
+
+    def trend_table(self, period="week", top=None, window=None):
+        """
+        Build a per-period table (one column per week or month) for the exports.
+
+        Parameters:
+        - period (str): 'day', 'week' or 'month'.
+        - top (int): Keep the top tasks by total time and group the rest as
+          'Other' (default: every task, sorted by name).
+        - window (int): Add a trailing rolling average of the total over this
+          many periods (default: none).
+
+        Returns:
+        - tuple: (title, header, rows), as accepted by the exports writers.
+        """
+        if period == "day":
+            matrix, labels = self.per_day(), [day.isoformat() for day in self.dates()]
+        elif period == "week":
+            matrix, labels = self.per_week()
+        else:
+            matrix, labels = self.per_month()
+
+        if top is not None and top < len(self.names):
+            keep = self.top(top)
+            rows = [[self.names[index]] + round_row(matrix[index]) for index in keep]
+            other = matrix.sum(axis=0) - matrix[keep].sum(axis=0)
+            rows.append(["Other"] + round_row(other))
+        else:
+            rows = [[name] + round_row(values) for name, values in zip(self.names, matrix)]
+
+        total = matrix.sum(axis=0)
+        rows.append(["Total"] + round_row(total))
+        if window:
+            rows.append([f"Rolling average ({window})"] + round_row(rolling_average(total, window)))
+        return PERIOD_TITLES[period], ["Task Name"] + labels, rows
+
+
+def load_history(cursor, start, end, resolution="day"):
+    """
+    Load a half-open date range of per-task totals into a History.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): Cursor to access the task data from the database.
+    - start (str): First day included (YYYY-MM-DD).
+    - end (str): First day excluded (YYYY-MM-DD).
+    - resolution (str): 'day' (daily rollup, every statistic available) or
+      'month' (monthly rollup, whole months only: totals and per_month).
+
+    Returns:
+    - History: The range as arrays, with a dense task index sorted by name.
+
+    Notes:
+    - A single query over one rollup, whatever the length of the range; day
+      offsets are computed by SQLite so only numbers cross into Python.
+    - 'month' reads roughly 20x fewer rows, for multi-year monthly trends.
+    - Years sealed into the archive (archive.py) are read from their
+      memory-mapped columns, only the days in the range, and merged with
+      the live rows.
+    """
+    if resolution == "month":
+        if not (start.endswith("-01") and end.endswith("-01")):
+            raise ValueError("resolution='month' needs a range of whole months")
+        cursor.execute("""
+            SELECT CAST(julianday(month || '-01') - julianday(?) AS INTEGER), task_id, total_time
+            FROM monthly_totals
+            WHERE month >= ? AND month < ?
+        """, (start, start[:7], end[:7]))
+    else:
+        cursor.execute("""
+            SELECT CAST(julianday(day) - julianday(?) AS INTEGER), task_id, total_time
+            FROM daily_totals
+            WHERE day >= ? AND day < ?
+        """, (start, start, end))
+    data = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 3)
+    archived_ids, archived_days, archived_seconds = load_archived(cursor, start, end)
+    days = np.concatenate([data[:, 0].astype(np.int64), archived_offsets(archived_days, start, resolution)])
+    raw_ids = np.concatenate([data[:, 1].astype(np.int64), archived_ids.astype(np.int64)])
+    seconds = np.concatenate([data[:, 2], archived_seconds])
+
+    ids, dense = np.unique(raw_ids, return_inverse=True)
+    cursor.execute("SELECT id, name FROM task_names")
+    name_of = dict(cursor.fetchall())
+    names = [name_of[task_id] for task_id in ids.tolist()]
+
+    # Re-number the dense index in name order, the order reports list tasks in
+    order = sorted(range(len(names)), key=names.__getitem__)
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return History(start, end, rank[dense], days, seconds, [names[index] for index in order], resolution)
+
+
+def archived_offsets(days, start, resolution):
+    """
+    Convert archived day ordinals to the row offsets of a History starting at start.
+
+    With resolution 'month', each day is moved to the first day of its
+    month, like the rows of the monthly rollup.
+    """
+    offsets = days.astype(np.int64)
+    if resolution == "month":
+        epoch = date(1970, 1, 1).toordinal()
+        months = (offsets - epoch).astype("datetime64[D]").astype("datetime64[M]")
+        offsets = months.astype("datetime64[D]").astype(np.int64) + epoch
+    return offsets - date.fromisoformat(start).toordinal()
+
+
+def rolling_average(values, window):
+    """
+    Return the trailing average of values over window positions.
+
+    The first window-1 positions average over the values available so far.
+    """
+    sums = np.cumsum(values, dtype=np.float64)
+    result = sums.copy()
+    result[window:] = sums[window:] - sums[:-window]
+    counts = np.minimum(np.arange(1, len(values) + 1), window)
+    return result / counts
+
+
+def round_seconds(value):
+    """Return seconds as an int when whole (the usual case), else rounded to 0.1s."""
+    return int(value) if float(value).is_integer() else round(float(value), 1)
+
+
+def round_row(values):
+    """Return a row of seconds as plain Python numbers, for the exports."""
+    return [round_seconds(value) for value in values.tolist()]
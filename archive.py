@@ -0,0 +1,245 @@
+# archive.py
+#
+# Cold archive of closed years. A sealed year is stored as three columnar
+# NumPy files (task id, day ordinal, seconds; one row per task per day,
+# sorted by day) in '<database>_archive/<year>.<generation>/', and its rows
+# are removed from 'tasks' and the rollups. Readers memory-map the files and
+# only touch the slice of days they ask for. analytics.load_history() merges
+# the archive with the live tables, so reports see one history.
+
+import json
+import os
+import shutil
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+import db
+
+ARCHIVE_FORMAT = 1
+COLUMNS = {"task_id": np.int32, "day": np.int32, "seconds": np.float64}
+# julianday() of day ordinal 0, so that julianday(date) - JULIAN_OFFSET == date.toordinal()
+JULIAN_OFFSET = 1721424.5
+
+
+def database_path(cursor):
+    """Return the file of the main database of cursor ('' for in-memory databases)."""
+    cursor.execute("PRAGMA database_list")
+    return cursor.fetchone()[2]
+
+
+def archive_root(db_path):
+    """Return the archive folder of a database file."""
+    return os.path.splitext(os.path.abspath(db_path))[0] + "_archive"
+
+
+def year_path(root, year, generation):
+    """Return the folder of one generation of a sealed year."""
+    return os.path.join(root, f"{year}.{generation}")
+
+
+class YearArchive:
+    def __init__(self, path):
+        """
+        Open the columns of a sealed year, memory-mapped read-only.
+
+        Parameters:
+        - path (str): Folder of the year (see year_path).
+
+        Behavior:
+        - Opening maps the files without reading them; pages are loaded by
+          the OS as slices are used, and shared between processes.
+        """
+        self.path = path
+        self.task_ids = np.load(os.path.join(path, "task_id.npy"), mmap_mode="r")
+        self.days = np.load(os.path.join(path, "day.npy"), mmap_mode="r")
+        self.seconds = np.load(os.path.join(path, "seconds.npy"), mmap_mode="r")
+
+    def slice(self, start, end):
+        """
+        Return the rows of a half-open range of day ordinals.
+
+        Returns:
+        - tuple: (task_ids, days, seconds) array views into the mapped files.
+        """
+        lo, hi = np.searchsorted(self.days, [start, end]).tolist()
+        return self.task_ids[lo:hi], self.days[lo:hi], self.seconds[lo:hi]
+
+
+def empty_columns():
+    """Return (task_ids, days, seconds) with no rows."""
+    return tuple(np.empty(0, dtype=dtype) for dtype in COLUMNS.values())
+
+
+def load_archived(cursor, start, end):
+    """
+    Return the archived rows of a half-open date range.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): Cursor on the live database.
+    - start (str): First day included (YYYY-MM-DD).
+    - end (str): First day excluded (YYYY-MM-DD).
+
+    Returns:
+    - tuple: (task_ids, day ordinals, seconds) arrays; views into the mapped
+      files when the range falls within one sealed year.
+    """
+    path = database_path(cursor)
+    last_year = (date.fromisoformat(end) - timedelta(days=1)).isoformat()[:4]
+    cursor.execute(
+        "SELECT year, generation FROM archived_years WHERE year >= ? AND year <= ? ORDER BY year",
+        (start[:4], last_year),
+    )
+    sealed = cursor.fetchall()
+    if not path or not sealed:
+        return empty_columns()
+
+    root = archive_root(path)
+    bounds = date.fromisoformat(start).toordinal(), date.fromisoformat(end).toordinal()
+    parts = [YearArchive(year_path(root, year, generation)).slice(*bounds) for year, generation in sealed]
+    if len(parts) == 1:
+        return parts[0]
+    return tuple(np.concatenate(column) for column in zip(*parts))
+
+
+def fetch_year(cursor, start, end, batch_size=50000):
+    """
+    Read the live per-task daily totals of a range into (task_ids, days, seconds) arrays.
+
+    Notes:
+    - Aggregates the raw 'tasks' rows (entries and corrections), fetched in
+      batches so that no whole year is held as Python tuples.
+    """
+    cursor.execute(f"""
+        SELECT task_id, CAST(julianday(date) - {JULIAN_OFFSET} AS INTEGER), SUM(COALESCE(total_time, 0))
+        FROM tasks
+        WHERE date >= ? AND date < ?
+        GROUP BY date, task_id
+    """, (start, end))
+    chunks = []
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            break
+        chunks.append(np.array(batch, dtype=np.float64))
+    data = np.concatenate(chunks) if chunks else np.empty((0, 3))
+    return data[:, 0].astype(np.int32), data[:, 1].astype(np.int32), data[:, 2]
+
+
+def merge_rows(task_ids, days, seconds):
+    """
+    Sum rows sharing a (task, day) and sort them by day, then task.
+    """
+    if not len(task_ids):
+        return empty_columns()
+    width = int(task_ids.max()) + 1
+    keys, inverse = np.unique(days.astype(np.int64) * width + task_ids, return_inverse=True)
+    totals = np.bincount(inverse, weights=seconds)
+    return (keys % width).astype(np.int32), (keys // width).astype(np.int32), totals
+
+
+def write_columns(path, columns, meta):
+    """
+    Write the column files and meta.json of a year folder.
+
+    Behavior:
+    - Written to '<path>.partial' and renamed into place, so a folder that
+      exists is always complete.
+    """
+    partial = path + ".partial"
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+    for (name, dtype), values in zip(COLUMNS.items(), columns):
+        np.save(os.path.join(partial, f"{name}.npy"), np.ascontiguousarray(values, dtype=dtype))
+    with open(os.path.join(partial, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(partial, path)
+
+
+def seal_year(conn, year):
+    """
+    Move a completed year from the live tables into the archive.
+
+    Parameters:
+    - conn (sqlite3.Connection): Connection opened with isolation_level=None.
+    - year (int or str): Year to seal; it must be over.
+
+    Returns:
+    - dict: year, rows (archived), deleted (rows removed from 'tasks'),
+      total_time and path.
+
+    Raises:
+    - ValueError: If the year is not over, has no entries or still has a
+      running session.
+
+    Behavior:
+    - Runs under the write lock: the year's rows are read, written to a new
+      archive generation, then deleted from 'tasks' and the rollups and the
+      year registered in 'archived_years', all in one transaction. A crash
+      before the commit leaves an unregistered folder that is never read.
+    - Entries written for the year after it was sealed (e.g. corrections)
+      are read from the live tables alongside the archive; sealing the year
+      again merges them into a new generation.
+    - Work sessions ('intervals') stay in the live database.
+    """
+    year = int(year)
+    if year >= date.today().year:
+        raise ValueError(f"{year} is not over yet")
+    key = f"{year:04}"
+    start, end = f"{year:04}-01-01", f"{year + 1:04}-01-01"
+
+    cursor = conn.cursor()
+    root = archive_root(database_path(cursor))
+    new_path = None
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status = 'running' AND date >= ? AND date < ?", (start, end)
+        )
+        if cursor.fetchone()[0]:
+            raise ValueError(f"{year} still has a running session; start the app once to close it")
+        cursor.execute("SELECT generation FROM archived_years WHERE year = ?", (key,))
+        row = cursor.fetchone()
+        old_generation = row[0] if row else None
+
+        columns = fetch_year(cursor, start, end)
+        if old_generation is None and not len(columns[0]):
+            raise ValueError(f"{year} has no entries")
+        if old_generation is not None:
+            old = YearArchive(year_path(root, key, old_generation)).slice(0, np.iinfo(np.int32).max)
+            # Copies, so the old files are no longer mapped when they are deleted
+            columns = tuple(np.concatenate([np.array(a), b]) for a, b in zip(old, columns))
+            del old
+        columns = merge_rows(*columns)
+        total_time = float(columns[2].sum())
+
+        generation = (old_generation or 0) + 1
+        new_path = year_path(root, key, generation)
+        write_columns(new_path, columns, {
+            "format": ARCHIVE_FORMAT,
+            "year": key,
+            "generation": generation,
+            "rows": len(columns[0]),
+            "total_time": total_time,
+        })
+
+        cursor.execute("DELETE FROM tasks WHERE date >= ? AND date < ?", (start, end))
+        deleted = cursor.rowcount
+        for table, (column, _) in db.ROLLUPS.items():
+            low, high = (start, end) if column == "day" else (start[:7], end[:7])
+            cursor.execute(f"DELETE FROM {table} WHERE {column} >= ? AND {column} < ?", (low, high))
+        cursor.execute(
+            "INSERT OR REPLACE INTO archived_years (year, generation, rows, total_time, sealed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, generation, len(columns[0]), total_time, datetime.now().isoformat(timespec="seconds")),
+        )
+        cursor.execute("COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        if new_path is not None:
+            shutil.rmtree(new_path, ignore_errors=True)
+        raise
+
+    if old_generation is not None:
+        shutil.rmtree(year_path(root, key, old_generation), ignore_errors=True)
+    return {"year": key, "rows": len(columns[0]), "deleted": deleted, "total_time": total_time, "path": new_path}
@@ -0,0 +1,71 @@
+# archive_cli.py
+#
+# Seal closed years into the columnar archive (see archive.py).
+#
+# Usage:
+#     python archive_cli.py list
+#     python archive_cli.py seal 2019 2020 2021
+#     python archive_cli.py seal 2022 --db path/to/tasks.db --vacuum
+
+import argparse
+import sqlite3
+import sys
+import time
+
+import db
+from archive import seal_year
+
+
+def list_years(conn):
+    """Print the sealed years with their row counts and totals."""
+    rows = conn.execute("SELECT year, generation, rows, total_time, sealed_at FROM archived_years ORDER BY year").fetchall()
+    if not rows:
+        print("No archived years.")
+    for year, generation, count, total_time, sealed_at in rows:
+        print(f"{year}  generation {generation}  {count:>10,} rows  {total_time / 3600:>12,.1f} h  sealed {sealed_at}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Move closed years out of the live database into the columnar archive.")
+    parser.add_argument("command", choices=["list", "seal"], help="'list' the archived years or 'seal' years.")
+    parser.add_argument("years", type=int, nargs="*", help="Years to seal (each must be over).")
+    parser.add_argument("--db", default=db.DB_PATH, help="Database file (default is db.DB_PATH).")
+    parser.add_argument("--vacuum", action="store_true", help="Compact the database file after sealing.")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    db.migrate(conn)
+    try:
+        if args.command == "list":
+            list_years(conn)
+            return
+        if not args.years:
+            parser.error("seal needs at least one year")
+
+        failed = 0
+        for year in args.years:
+            started = time.perf_counter()
+            try:
+                result = seal_year(conn, year)
+            except ValueError as e:
+                print(f"{year}: {e}, skipped", file=sys.stderr)
+                failed += 1
+                continue
+            print(
+                f"{result['year']}  {result['rows']:>10,} rows archived  {result['deleted']:>10,} rows removed  "
+                f"{time.perf_counter() - started:8.3f}s  {result['path']}"
+            )
+
+        # Hand the freed pages back: the WAL is truncated, and VACUUM shrinks the file
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        if args.vacuum:
+            conn.execute("VACUUM")
+    finally:
+        conn.close()
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+# benchmarks
+#
+# Standalone performance scripts, run from the repository root with
+# python -m benchmarks.<script>. Not part of the application.
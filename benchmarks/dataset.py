@@ -0,0 +1,144 @@
+# benchmarks/dataset.py
+#
+# Generates realistic synthetic 'tasks' databases: several years of weekday
+# entries over a large pool of task names (projects come and go, so each day
+# draws from a sliding window of active names), with a share of correction
+# rows, built at any schema version.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.dataset --rows 1000000 --schema 6 --out /tmp/tasks-1m.db
+#     python -m benchmarks.dataset --rows 20000000 --names 20000 --years 10 --out big.db
+
+import argparse
+import os
+import random
+import sqlite3
+import time
+from datetime import date, timedelta
+
+import db
+
+CHUNK = 50000
+
+
+def task_name(number):
+    """Return the synthetic name of task number (mixed case, as users type them)."""
+    return f"Project {number // 8:05} - {('Dev', 'Review', 'Meeting', 'Support', 'Docs', 'QA', 'Ops', 'Design')[number % 8]}"
+
+
+def workdays(first_year, years):
+    """Return every weekday of the given years as ISO strings."""
+    day = date(first_year, 1, 1)
+    end = date(first_year + years, 1, 1)
+    days = []
+    while day < end:
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+        day += timedelta(days=1)
+    return days
+
+
+def generate_rows(rows, names, first_year, years, correction_rate, seed):
+    """
+    Yield (name, start_time, end_time, total_time, status, date) rows in date order.
+
+    Parameters:
+    - rows (int): Number of rows to generate (daily entries plus corrections).
+    - names (int): Size of the task name pool.
+    - first_year (int): First year of history.
+    - years (int): Number of years of history.
+    - correction_rate (float): Share of rows that are corrections (0-1).
+    - seed (int): Random seed; the same arguments always give the same rows.
+
+    Behavior:
+    - Rows are spread evenly over the weekdays; each day uses distinct names
+      drawn from a window of active names that slides through the pool.
+    - Corrections are negative and follow the entry they correct.
+    """
+    rng = random.Random(seed)
+    days = workdays(first_year, years)
+    entries = round(rows / (1 + correction_rate))
+    active = min(names, max(3 * entries // len(days), 50))
+    produced = 0
+    for index, day in enumerate(days):
+        count = (index + 1) * entries // len(days) - index * entries // len(days)
+        window_start = index * (names - active) // len(days)
+        for number in rng.sample(range(window_start, window_start + active), min(count, active)):
+            name = task_name(number)
+            yield (name, None, None, rng.randint(5, 480) * 30, "paused", day)
+            produced += 1
+            if rng.random() < correction_rate:
+                yield (name, None, None, -rng.randint(1, 60) * 60, "correction", day)
+                produced += 1
+            if produced >= rows:
+                return
+    # Short of rows (random corrections, or a pool too small for the daily
+    # volume): top up with entries after the last year
+    extra_day = date(first_year + years, 1, 1)
+    while produced < rows:
+        for number in range(min(names, rows - produced)):
+            yield (task_name(number), None, None, 1800, "paused", extra_day.isoformat())
+            produced += 1
+        extra_day += timedelta(days=1)
+
+
+def build(path, rows, schema=None, names=5000, first_year=2020, years=5, correction_rate=0.02, seed=1):
+    """
+    Create a synthetic database at path.
+
+    Parameters:
+    - path (str): Output file (must not exist).
+    - rows (int): Number of 'tasks' rows.
+    - schema (int): Schema version to build (default: the latest).
+    - names, first_year, years, correction_rate, seed: See generate_rows.
+
+    Returns:
+    - float: Seconds taken.
+
+    Behavior:
+    - Rows are bulk-loaded into the version 1 table, then the remaining
+      migrations run over them, so indexes, rollups and the task_names
+      dictionary are built exactly as on a real upgraded database.
+    """
+    started = time.perf_counter()
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=OFF")
+    conn.execute("PRAGMA synchronous=OFF")
+    db.migrate(conn, 1)
+
+    generator = generate_rows(rows, names, first_year, years, correction_rate, seed)
+    insert = "INSERT INTO tasks (name, start_time, end_time, total_time, status, date) VALUES (?, ?, ?, ?, ?, ?)"
+    while True:
+        chunk = [row for _, row in zip(range(CHUNK), generator)]
+        if not chunk:
+            break
+        conn.execute("BEGIN")
+        conn.executemany(insert, chunk)
+        conn.execute("COMMIT")
+
+    db.migrate(conn, schema)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.close()
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic tasks database.")
+    parser.add_argument("--rows", type=int, required=True, help="Number of 'tasks' rows.")
+    parser.add_argument("--out", required=True, help="Output database file.")
+    parser.add_argument("--schema", type=int, default=None, help=f"Schema version 1-{len(db.MIGRATIONS)} (default latest).")
+    parser.add_argument("--names", type=int, default=5000, help="Task name pool size (default 5000).")
+    parser.add_argument("--first-year", type=int, default=2020, help="First year of history (default 2020).")
+    parser.add_argument("--years", type=int, default=5, help="Years of history (default 5).")
+    parser.add_argument("--corrections", type=float, default=0.02, help="Share of correction rows (default 0.02).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default 1).")
+    args = parser.parse_args()
+
+    if os.path.exists(args.out):
+        parser.error(f"{args.out} already exists")
+    seconds = build(args.out, args.rows, args.schema, args.names, args.first_year, args.years, args.corrections, args.seed)
+    print(f"{args.rows} rows written to {args.out} in {seconds:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
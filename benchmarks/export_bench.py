@@ -0,0 +1,58 @@
+# benchmarks/export_bench.py
+#
+# Measures peak Python memory of the streaming report writers as the number
+# of exported rows grows. Peak memory should stay flat for every format.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.export_bench --sizes 10000,100000,1000000
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from exports import write_xlsx, write_csv, write_jsonl
+
+HEADER = ["Date", "Task Name", "Started At", "Ended At", "Seconds"]
+
+
+def make_rows(count):
+    """Generate synthetic interval detail rows."""
+    for i in range(count):
+        yield ("2025-03-01", f"task-{i % 500}", "2025-03-01T09:00:00", "2025-03-01T09:30:00", 1800.0)
+
+
+WRITERS = {
+    "xlsx": lambda path, rows: write_xlsx(path, [("Intervals", HEADER, rows)]),
+    "csv": lambda path, rows: write_csv(path, HEADER, rows),
+    "jsonl": lambda path, rows: write_jsonl(path, HEADER, rows),
+}
+
+
+def run(sizes, formats):
+    """Write each size in each format and print duration and peak traced memory."""
+    print(f"{'format':<7} {'rows':>10} {'seconds':>9} {'peak KiB':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in formats:
+            for size in sizes:
+                path = os.path.join(tmp, f"bench.{fmt}")
+                tracemalloc.start()
+                started = time.perf_counter()
+                WRITERS[fmt](path, make_rows(size))
+                seconds = time.perf_counter() - started
+                _, peak = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                print(f"{fmt:<7} {size:>10} {seconds:>9.3f} {peak / 1024:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark peak memory of the streaming exports.")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated row counts.")
+    parser.add_argument("--formats", default="xlsx,csv,jsonl", help="Comma-separated formats.")
+    args = parser.parse_args()
+    run(sorted(int(size) for size in args.sizes.split(",")), args.formats.split(","))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/lookup_bench.py
+#
+# Times the hot 'tasks' lookups as history grows, on the original schema
+# (name TEXT, no indexes) and on the current migrated schema.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.lookup_bench --sizes 10000,100000,1000000
+
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date
+
+import db
+
+TASKS_PER_DAY = 20
+TASK_NAMES = 500
+FIRST_DAY = date(2000, 1, 1).toordinal()
+
+
+def make_rows(start, stop, named):
+    """
+    Generate synthetic task rows with ids in [start, stop).
+
+    Each day gets TASKS_PER_DAY entries picked from a pool of TASK_NAMES names,
+    identified by name (baseline schema) or by task_id (current schema).
+    """
+    for i in range(start, stop):
+        day = date.fromordinal(FIRST_DAY + i // TASKS_PER_DAY).isoformat()
+        number = (i * 7919) % TASK_NAMES
+        yield (f"task-{number}" if named else number + 1, 1800, "paused", day)
+
+
+def open_database(path, current):
+    """
+    Create a benchmark database at path with the baseline or the current schema.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    if current:
+        db.migrate(conn)
+        with conn:
+            conn.executemany(
+                "INSERT INTO task_names (id, name, name_key) VALUES (?, ?, ?)",
+                [(number + 1, f"task-{number}", f"task-{number}") for number in range(TASK_NAMES)],
+            )
+    else:
+        db.create_tasks_table(conn.cursor())
+        conn.commit()
+    return conn
+
+
+def time_query(conn, sql, params_list):
+    """
+    Run sql once per params in params_list and return the mean time in ms.
+    """
+    started = time.perf_counter()
+    for params in params_list:
+        conn.execute(sql, params).fetchall()
+    return (time.perf_counter() - started) / len(params_list) * 1000
+
+
+def run(sizes, lookups):
+    """
+    Grow a baseline and a current-schema database through sizes and print timings.
+    """
+    queries = {
+        "baseline": {
+            "name+date": "SELECT total_time FROM tasks WHERE name = ? AND date = ?",
+            "distinct name": "SELECT DISTINCT name FROM tasks",
+        },
+        "current": {
+            "name+date": "SELECT total_time FROM tasks WHERE task_id = (SELECT id FROM task_names WHERE name = ?) AND date = ?",
+            "distinct name": "SELECT name FROM task_names",
+        },
+    }
+    inserts = {
+        "baseline": "INSERT INTO tasks (name, total_time, status, date) VALUES (?, ?, ?, ?)",
+        "current": "INSERT INTO tasks (task_id, total_time, status, date) VALUES (?, ?, ?, ?)",
+    }
+    print(f"{'schema':<10} {'rows':>10} {'query':<15} {'ms/query':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for schema in ("baseline", "current"):
+            conn = open_database(os.path.join(tmp, f"{schema}.db"), schema == "current")
+            rows = 0
+            for size in sizes:
+                with conn:
+                    conn.executemany(inserts[schema], make_rows(rows, size, schema == "baseline"))
+                rows = size
+
+                rng = random.Random(size)
+                last_day = FIRST_DAY + (rows - 1) // TASKS_PER_DAY
+                lookup_params = [
+                    (f"task-{rng.randrange(TASK_NAMES)}", date.fromordinal(rng.randint(FIRST_DAY, last_day)).isoformat())
+                    for _ in range(lookups)
+                ]
+                params = {
+                    "name+date": lookup_params,
+                    "distinct name": [()] * max(1, lookups // 10),
+                }
+                for label, sql in queries[schema].items():
+                    ms = time_query(conn, sql, params[label])
+                    print(f"{schema:<10} {rows:>10} {label:<15} {ms:>10.3f}")
+            conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark 'tasks' lookups as history grows.")
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="Comma-separated row counts.")
+    parser.add_argument("--lookups", type=int, default=50, help="Lookups timed per size.")
+    args = parser.parse_args()
+    run(sorted(int(size) for size in args.sizes.split(",")), args.lookups)
+
+
+if __name__ == "__main__":
+    main()
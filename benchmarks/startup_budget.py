@@ -0,0 +1,131 @@
+# benchmarks/startup_budget.py
+#
+# Cold-start budget check. Exits with status 1 when a budget is exceeded, so it
+# can run in CI or before a release:
+#   - the heavy, dialog-only dependencies (openpyxl, tkcalendar, pynput) and the
+#     report modules must not be imported by `import main`;
+#   - the median time of `import main` in a fresh interpreter must stay under
+#     --import-budget-ms (the slowest modules are listed from -X importtime);
+#   - with a display available, the time to first paint reported by
+#     TIMELOGTRACKR_STARTUP=exit must stay under --paint-budget-ms. This starts
+#     the real app against db.DB_PATH.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.startup_budget --runs 5 --import-budget-ms 150 --paint-budget-ms 800
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+DEFERRED = ("openpyxl", "tkcalendar", "pynput", "reports", "report_queries")
+
+IMPORT_PROBE = f"""
+import sys, time
+started = time.perf_counter()
+import main
+elapsed = (time.perf_counter() - started) * 1000
+print(elapsed, ",".join(m for m in {DEFERRED!r} if m in sys.modules))
+"""
+
+
+def run_python(args, env=None):
+    """Run a fresh interpreter from the repository root and return the completed process."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return subprocess.run([sys.executable] + args, cwd=root, env=env, capture_output=True, text=True, timeout=120)
+
+
+def measure_imports(runs):
+    """
+    Time `import main` in fresh interpreters.
+
+    Returns:
+    - tuple: (median ms, list of deferred modules that were imported anyway).
+    """
+    times = []
+    eager = set()
+    for _ in range(runs):
+        result = run_python(["-c", IMPORT_PROBE])
+        if result.returncode != 0:
+            sys.exit(result.stderr)
+        elapsed, loaded = result.stdout.split(" ", 1)
+        times.append(float(elapsed))
+        eager.update(name for name in loaded.strip().split(",") if name)
+    return statistics.median(times), sorted(eager)
+
+
+def slowest_imports(count):
+    """
+    Return the count slowest imports of `import main` as (cumulative us, module), from -X importtime.
+    """
+    result = run_python(["-X", "importtime", "-c", "import main"])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def measure_first_paint(runs):
+    """
+    Start the app with TIMELOGTRACKR_STARTUP=exit and collect its startup reports.
+
+    Returns:
+    - list: One startup.report() dict per run.
+    """
+    env = dict(os.environ, TIMELOGTRACKR_STARTUP="exit")
+    reports = []
+    for _ in range(runs):
+        result = run_python(["main.py"], env=env)
+        lines = [line for line in result.stderr.splitlines() if line.startswith("{")]
+        if not lines:
+            sys.exit(result.stderr)
+        reports.append(json.loads(lines[-1]))
+    return reports
+
+
+def has_display():
+    """Return True when a Tk window can be opened (always on Windows/macOS)."""
+    return sys.platform in ("win32", "darwin") or bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the cold-start budget of the GUI.")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement (default 5).")
+    parser.add_argument("--import-budget-ms", type=float, default=150.0, help="Budget for `import main` (median).")
+    parser.add_argument("--paint-budget-ms", type=float, default=800.0, help="Budget for time to first paint (median).")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list.")
+    args = parser.parse_args()
+
+    failures = []
+
+    import_ms, eager = measure_imports(args.runs)
+    print(f"import main: {import_ms:.1f} ms (budget {args.import_budget_ms:.0f} ms)")
+    for cumulative, name in slowest_imports(args.top):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import main took {import_ms:.1f} ms")
+    if eager:
+        failures.append("imported at startup: " + ", ".join(eager))
+
+    if has_display():
+        reports = measure_first_paint(args.runs)
+        paint_ms = statistics.median(report["first_paint"] for report in reports)
+        print(f"first paint: {paint_ms:.1f} ms (budget {args.paint_budget_ms:.0f} ms)")
+        print("  last run: " + json.dumps(reports[-1]))
+        if paint_ms > args.paint_budget_ms:
+            failures.append(f"first paint took {paint_ms:.1f} ms")
+    else:
+        print("first paint: skipped (no display)")
+
+    for failure in failures:
+        print(f"OVER BUDGET: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
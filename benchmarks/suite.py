@@ -0,0 +1,305 @@
+# benchmarks/suite.py
+#
+# Times the app's hot queries on synthetic databases (see dataset.py) across
+# history sizes and schema versions, and prints one machine-readable row per
+# (schema, rows, query) so results can be compared across commits.
+#
+# Each schema version runs the queries the app issued at that version:
+#   1    original queries (strftime month filter, DISTINCT scans, per-second UPDATE)
+#   2    same data, sargable date ranges over the (date, name) / (name, date) indexes
+#   3-4  reports and years from the monthly rollup
+#   5+   integer task ids, task_names dictionary
+#   8+   year list includes the archived years; reports via analytics.load_history
+#
+# Write queries commit like the app does; they write back unchanged totals
+# (and zero-second intervals), so a cached data set does not drift.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.suite --rows 10000,1000000 --schemas 1,6 --format csv > results.csv
+#     python -m benchmarks.suite --rows 10000000 --data-dir ~/bench-data --format json
+
+import argparse
+import csv
+import json
+import os
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import db
+from benchmarks.dataset import build
+from analytics import load_history
+from report_queries import month_range
+
+FIELDS = ["commit", "schema", "rows", "query", "runs", "mean_ms", "p50_ms", "p95_ms", "max_ms"]
+
+
+def monthly_report(conn, version, sample):
+    """The monthly report totals of the sample's month."""
+    year, month = int(sample["date"][:4]), int(sample["date"][5:7])
+    start, end = month_range(year, month)
+    if version == 1:
+        sql = "SELECT name, SUM(total_time) FROM tasks WHERE strftime('%m', date) = ? AND strftime('%Y', date) = ? GROUP BY name"
+        return conn.execute(sql, (f"{month:02}", str(year))).fetchall()
+    if version == 2:
+        sql = "SELECT name, SUM(total_time) FROM tasks WHERE date >= ? AND date < ? GROUP BY name ORDER BY name"
+        return conn.execute(sql, (start, end)).fetchall()
+    if version <= 4:
+        sql = "SELECT name, SUM(total_time) FROM monthly_totals WHERE month >= ? AND month < ? GROUP BY name ORDER BY name"
+        return conn.execute(sql, (start[:7], end[:7])).fetchall()
+    if version <= 7:
+        sql = """
+            SELECT n.name, r.total_time
+            FROM (SELECT task_id, SUM(total_time) AS total_time FROM monthly_totals WHERE month >= ? AND month < ? GROUP BY task_id) r
+            JOIN task_names n ON n.id = r.task_id
+            ORDER BY n.name
+        """
+        return conn.execute(sql, (start[:7], end[:7])).fetchall()
+    return load_history(conn.cursor(), start, end, resolution="month").task_totals()
+
+
+def distinct_names(conn, version, sample):
+    """The task name list of the Add Task / negative time dialogs."""
+    if version <= 4:
+        return conn.execute("SELECT DISTINCT name FROM tasks ORDER BY name").fetchall()
+    return conn.execute("SELECT name FROM task_names ORDER BY name").fetchall()
+
+
+def years(conn, version, sample):
+    """The year list of the report dialog."""
+    if version == 1:
+        return conn.execute("SELECT DISTINCT date FROM tasks").fetchall()
+    if version == 2:
+        return conn.execute("SELECT DISTINCT substr(date, 1, 4) FROM tasks ORDER BY 1").fetchall()
+    if version <= 7:
+        return conn.execute("SELECT DISTINCT substr(month, 1, 4) FROM monthly_totals ORDER BY 1").fetchall()
+    return conn.execute("SELECT substr(month, 1, 4) FROM monthly_totals UNION SELECT year FROM archived_years ORDER BY 1").fetchall()
+
+
+def update_timer(conn, version, sample):
+    """The per-second total write of a running timer (one committed UPDATE)."""
+    if version <= 4:
+        conn.execute(
+            "UPDATE tasks SET total_time = ? WHERE name = ? AND date = ? AND status != 'correction'",
+            (sample["total_time"], sample["name"], sample["date"]),
+        )
+    else:
+        conn.execute(
+            "UPDATE tasks SET total_time = ? WHERE task_id = ? AND date = ? AND status != 'correction'",
+            (sample["total_time"], sample["task_id"], sample["date"]),
+        )
+    conn.commit()
+
+
+def pause_task(conn, version, sample):
+    """The write of a paused session."""
+    if version == 1:
+        # The original pause rewrote the total of every day of the task
+        conn.execute("UPDATE tasks SET total_time = total_time WHERE name = ?", (sample["name"],))
+    elif version <= 3:
+        conn.execute(
+            "UPDATE tasks SET total_time = ? WHERE name = ? AND date = ? AND status != 'correction'",
+            (sample["total_time"], sample["name"], sample["date"]),
+        )
+    else:
+        key = "name" if version == 4 else "task_id"
+        stamp = sample["date"] + "T12:00:00"
+        conn.execute(
+            f"INSERT INTO intervals ({key}, date, started_at, ended_at, seconds) VALUES (?, ?, ?, ?, 0)",
+            (sample[key], sample["date"], stamp, stamp),
+        )
+        if version >= 6:
+            conn.execute(
+                "UPDATE tasks SET status = 'paused', start_time = NULL WHERE task_id = ? AND date = ? AND status = 'running'",
+                (sample["task_id"], sample["date"]),
+            )
+    conn.commit()
+
+
+def confirm_lookups(conn, version, sample):
+    """The duplicate check and total lookups of TrackerEngine.add_task."""
+    if version == 1:
+        conn.execute("SELECT 1 FROM tasks WHERE LOWER(name) = ? AND date = ?", (sample["name"].lower(), sample["date"])).fetchall()
+        conn.execute("SELECT total_time FROM tasks WHERE name = ? AND date = ?", (sample["name"], sample["date"])).fetchall()
+        return
+    if version <= 4:
+        conn.execute(
+            "SELECT 1 FROM tasks WHERE date = ? AND LOWER(name) = ? AND status != 'correction'",
+            (sample["date"], sample["name"].lower()),
+        ).fetchall()
+        conn.execute(
+            "SELECT total_time FROM tasks WHERE name = ? AND date = ? AND status != 'correction'",
+            (sample["name"], sample["date"]),
+        ).fetchall()
+        conn.execute(
+            "SELECT SUM(total_time) FROM tasks WHERE name = ? AND date = ? AND status = 'correction'",
+            (sample["name"], sample["date"]),
+        ).fetchall()
+        return
+    conn.execute("""
+        SELECT 1 FROM tasks t JOIN task_names n ON n.id = t.task_id
+        WHERE t.date = ? AND n.name_key = ? AND t.status != 'correction'
+    """, (sample["date"], db.name_key(sample["name"]))).fetchall()
+    task_id = db.find_task_id(conn.cursor(), sample["name"])
+    conn.execute(
+        "SELECT total_time FROM tasks WHERE task_id = ? AND date = ? AND status != 'correction'",
+        (task_id, sample["date"]),
+    ).fetchall()
+    conn.execute(
+        "SELECT SUM(total_time) FROM tasks WHERE task_id = ? AND date = ? AND status = 'correction'",
+        (task_id, sample["date"]),
+    ).fetchall()
+
+
+QUERIES = {
+    "monthly_report": monthly_report,
+    "distinct_names": distinct_names,
+    "years": years,
+    "update_timer": update_timer,
+    "pause_task": pause_task,
+    "confirm_lookups": confirm_lookups,
+}
+
+
+def load_samples(conn, version, count, seed):
+    """
+    Pick count random daily entries (not corrections) to drive the queries.
+
+    Returns:
+    - list: dicts with name, task_id (schema 5+), date and total_time.
+    """
+    rng = random.Random(seed)
+    max_id = conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0]
+    if version <= 4:
+        sql = "SELECT name, NULL, date, total_time FROM tasks WHERE id = ? AND status != 'correction'"
+    else:
+        sql = """
+            SELECT n.name, t.task_id, t.date, t.total_time
+            FROM tasks t JOIN task_names n ON n.id = t.task_id
+            WHERE t.id = ? AND t.status != 'correction'
+        """
+    samples = []
+    while len(samples) < count:
+        row = conn.execute(sql, (rng.randint(1, max_id),)).fetchone()
+        if row:
+            samples.append({"name": row[0], "task_id": row[1], "date": row[2], "total_time": row[3]})
+    return samples
+
+
+def time_query(conn, version, query, samples):
+    """
+    Run query once per sample and return its timings in ms.
+    """
+    timings = []
+    for sample in samples:
+        started = time.perf_counter()
+        query(conn, version, sample)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def summarize(timings):
+    """Return mean/p50/p95/max of timings (ms), rounded to the microsecond."""
+    ordered = sorted(timings)
+    return {
+        "runs": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered), 3),
+        "p50_ms": round(ordered[len(ordered) // 2], 3),
+        "p95_ms": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def current_commit():
+    """Return the short hash of HEAD, or '' outside a git checkout."""
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True)
+    except OSError:
+        return ""
+    return result.stdout.strip()
+
+
+def run(sizes, schemas, queries, runs, data_dir, names, seed):
+    """
+    Build (or reuse) a data set per (rows, schema) and yield one result dict per query.
+
+    Parameters:
+    - sizes (list): Row counts.
+    - schemas (list): Schema versions.
+    - queries (list): Names from QUERIES.
+    - runs (int): Timed runs per query.
+    - data_dir (str): Folder of the generated databases, reused when present.
+    - names (int): Task name pool size of the data sets.
+    - seed (int): Random seed of the data sets and samples.
+    """
+    commit = current_commit()
+    for rows in sizes:
+        for version in schemas:
+            path = os.path.join(data_dir, f"tasks-v{version}-{rows}-n{names}-s{seed}.db")
+            if not os.path.exists(path):
+                seconds = build(path, rows, version, names=names, seed=seed)
+                print(f"built {path} in {seconds:.1f}s", file=sys.stderr)
+            conn = sqlite3.connect(path)
+            samples = load_samples(conn, version, runs, seed)
+            for name in queries:
+                timings = time_query(conn, version, QUERIES[name], samples)
+                yield dict(commit=commit, schema=version, rows=rows, query=name, **summarize(timings))
+            conn.close()
+
+
+def write_results(results, fmt, out):
+    """
+    Write result dicts as an aligned table, CSV or a JSON list.
+    """
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+            out.flush()
+    elif fmt == "json":
+        json.dump(list(results), out, indent=2)
+        out.write("\n")
+    else:
+        out.write(f"{'schema':>6} {'rows':>10} {'query':<16} {'runs':>5} {'mean_ms':>10} {'p50_ms':>10} {'p95_ms':>10} {'max_ms':>10}\n")
+        for r in results:
+            out.write(
+                f"{r['schema']:>6} {r['rows']:>10} {r['query']:<16} {r['runs']:>5} "
+                f"{r['mean_ms']:>10.3f} {r['p50_ms']:>10.3f} {r['p95_ms']:>10.3f} {r['max_ms']:>10.3f}\n"
+            )
+            out.flush()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the hot queries on synthetic histories.")
+    parser.add_argument("--rows", default="10000,100000,1000000", help="Comma-separated row counts.")
+    parser.add_argument("--schemas", default=str(len(db.MIGRATIONS)), help="Comma-separated schema versions (default latest).")
+    parser.add_argument("--queries", default=",".join(QUERIES), help="Comma-separated queries (default all).")
+    parser.add_argument("--runs", type=int, default=50, help="Timed runs per query (default 50).")
+    parser.add_argument("--names", type=int, default=5000, help="Task name pool size (default 5000).")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default 1).")
+    parser.add_argument("--data-dir", default=None, help="Keep generated databases here and reuse them (default: temporary).")
+    parser.add_argument("--format", choices=["table", "csv", "json"], default="table", help="Output format (default table).")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.rows.split(","))
+    schemas = [int(version) for version in args.schemas.split(",")]
+    queries = args.queries.split(",")
+    unknown = [name for name in queries if name not in QUERIES]
+    if unknown:
+        parser.error("unknown queries: " + ", ".join(unknown))
+
+    if args.data_dir:
+        os.makedirs(args.data_dir, exist_ok=True)
+        write_results(run(sizes, schemas, queries, args.runs, args.data_dir, args.names, args.seed), args.format, sys.stdout)
+    else:
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_results(run(sizes, schemas, queries, args.runs, data_dir, args.names, args.seed), args.format, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
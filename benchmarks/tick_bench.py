@@ -0,0 +1,102 @@
+# benchmarks/tick_bench.py
+#
+# Measures the per-tick cost of refreshing thousands of running tasks (elapsed
+# time + hh:mm:ss formatting + label change check) and the memory per Task,
+# comparing the monotonic, __slots__-based Task with the previous
+# datetime-based implementation.
+#
+# Usage (from the repository root):
+#     python -m benchmarks.tick_bench --tasks 1000,5000,20000 --ticks 20
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from exports import format_time
+from task_model import Task
+
+
+class DatetimeTask:
+    """The previous Task timing core: wall-clock datetimes, per-instance __dict__."""
+
+    def __init__(self, name, total_time=0):
+        self.name = name
+        self.total_time = total_time
+        self.correction_time = 0
+        self.running = False
+        self.start_time = None
+        self.row_widget = None
+        self.timer_label = None
+        self.label_text = None
+
+    def start(self):
+        self.start_time = datetime.now()
+        self.running = True
+
+    def get_elapsed_time(self):
+        if self.running and self.start_time:
+            return self.total_time + (datetime.now() - self.start_time).total_seconds()
+        return self.total_time
+
+
+class NullLabel:
+    """Stand-in for a tk.Label so the benchmark measures the Python side only."""
+
+    def config(self, **kwargs):
+        pass
+
+
+def render(task):
+    """Same work as Task.render, usable for both implementations."""
+    text = format_time(task.get_elapsed_time() + task.correction_time)
+    if text != task.label_text:
+        task.timer_label.config(text=text)
+        task.label_text = text
+
+
+def make_tasks(cls, count):
+    """Create and start count tasks of the given class."""
+    tasks = [cls(f"task-{i}", total_time=i) for i in range(count)]
+    label = NullLabel()
+    for task in tasks:
+        task.timer_label = label
+        task.start()
+    return tasks
+
+
+def memory_per_task(cls, count):
+    """Return the traced bytes allocated per task instance."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = [cls(f"t{i}") for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tasks
+    return (after - before) / count
+
+
+def run(counts, ticks):
+    """Print per-tick cost and memory per task for each implementation and size."""
+    print(f"{'impl':<10} {'tasks':>7} {'us/tick':>10} {'ns/task':>9} {'bytes/task':>11}")
+    for label, cls in (("datetime", DatetimeTask), ("monotonic", Task)):
+        for count in counts:
+            tasks = make_tasks(cls, count)
+            started = time.perf_counter_ns()
+            for _ in range(ticks):
+                for task in tasks:
+                    render(task)
+            per_tick = (time.perf_counter_ns() - started) / ticks
+            print(f"{label:<10} {count:>7} {per_tick / 1000:>10.1f} {per_tick / count:>9.0f} {memory_per_task(cls, count):>11.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-tick cost of running tasks.")
+    parser.add_argument("--tasks", default="1000,5000,20000", help="Comma-separated task counts.")
+    parser.add_argument("--ticks", type=int, default=20, help="Ticks timed per size.")
+    args = parser.parse_args()
+    run([int(count) for count in args.tasks.split(",")], args.ticks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+# daemon.py
+#
+# Headless tracking daemon: owns the database and today's task timers
+# (engine.TrackerEngine) and serves them over a Unix domain socket, so the
+# Tk window, tracker_cli.py and other clients share one state and running
+# tasks keep running when the window is closed. Protocol: see engine_client.py.
+#
+# Usage:
+#     python daemon.py
+#     python daemon.py --db path/to/tasks.db --socket /tmp/timelogtrackr.sock
+
+import argparse
+import logging
+import os
+import signal
+import socketserver
+import sys
+import threading
+
+import db
+from engine import EngineError, TrackerEngine
+from engine_client import DaemonClient, decode, encode, socket_path
+
+log = logging.getLogger(__name__)
+
+NAME = ("name", str)
+SECONDS = ("seconds", (int, float))
+
+# op: (TrackerEngine method, request fields passed to it with their JSON types)
+OPERATIONS = {
+    "info": ("info", ()),
+    "list": ("list_tasks", ()),
+    "changes": ("changes", (("since", (int, type(None))),)),
+    "add": ("add_task", (NAME,)),
+    "start": ("start", (NAME,)),
+    "pause": ("pause", (NAME,)),
+    "toggle": ("toggle", (NAME,)),
+    "pause_all": ("pause_all", ()),
+    "set_time": ("set_time", (NAME, SECONDS)),
+    "correct": ("add_correction", (NAME, ("date", str), SECONDS)),
+    "search": ("search", (("text", str), ("limit", int))),
+    "find": ("find_task_name", (NAME,)),
+    "years": ("get_years", ()),
+    "stats": ("stats", ()),
+}
+
+
+def handle_request(engine, request):
+    """
+    Run one protocol request against the engine.
+
+    Parameters:
+    - engine (TrackerEngine): Engine of the daemon.
+    - request (dict): Decoded request ({"op": ..., fields}).
+
+    Returns:
+    - dict: {"ok": true, "result": ...} or {"ok": false, "error": message}.
+
+    Behavior:
+    - Fields are checked against their types; missing optional fields keep
+      the engine's defaults.
+    - Unknown ops, invalid values and unexpected engine errors (logged) are
+      answered with an error, never by dropping the client.
+    """
+    op = request.get("op") if isinstance(request, dict) else None
+    if op not in OPERATIONS:
+        return {"ok": False, "error": f"Unknown operation {op!r}."}
+    method, fields = OPERATIONS[op]
+    params = {}
+    for field, types in fields:
+        if field not in request:
+            continue
+        value = request[field]
+        if not isinstance(value, types) or isinstance(value, bool):
+            return {"ok": False, "error": f"Invalid request: '{field}' cannot be {value!r}."}
+        params[field] = value
+    try:
+        return {"ok": True, "result": getattr(engine, method)(**params)}
+    except EngineError as e:
+        return {"ok": False, "error": str(e)}
+    except (TypeError, ValueError) as e:
+        return {"ok": False, "error": f"Invalid request: {e}"}
+    except Exception as e:
+        log.exception("%s request failed", op)
+        return {"ok": False, "error": f"Internal error: {e}"}
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        """Answer the requests of one client, one line each, until it disconnects."""
+        for line in self.rfile:
+            try:
+                response = handle_request(self.server.engine, decode(line))
+            except ValueError:
+                response = {"ok": False, "error": "Malformed request."}
+            self.wfile.write(encode(response))
+
+
+class TrackerDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, engine, path):
+        """
+        Initialize the daemon's socket server.
+
+        Parameters:
+        - engine (TrackerEngine): Engine the requests run against.
+        - path (str): Socket file.
+
+        Behavior:
+        - Each client is served on its own thread; the engine serializes them.
+        - The socket is only accessible to the current user (mode 0600).
+        """
+        self.engine = engine
+        old_umask = os.umask(0o177)
+        try:
+            super().__init__(path, RequestHandler)
+        finally:
+            os.umask(old_umask)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the tracking engine headless, serving clients over a Unix socket.")
+    parser.add_argument("--db", default=db.DB_PATH, help="Database file (default is db.DB_PATH).")
+    parser.add_argument("--socket", default=None, help="Socket file (default is TIMELOGTRACKR_SOCKET or '<database>.sock').")
+    args = parser.parse_args()
+
+    db.DB_PATH = args.db
+    path = args.socket or socket_path()
+
+    if os.path.exists(path):
+        try:
+            DaemonClient(path, timeout=1).info()
+            sys.exit(f"A daemon is already listening on {path}.")
+        except ConnectionError:
+            os.unlink(path)  # left over by a daemon that did not exit cleanly
+
+    engine = TrackerEngine(args.db).start_flushing()
+    server = TrackerDaemon(engine, path)
+    # shutdown() waits for serve_forever() to return, so it runs off the main thread
+    stop = lambda *_: threading.Thread(target=server.shutdown).start()
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    print(f"Serving {engine.info()['db']} on {path}", flush=True)
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        engine.close()
+        os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
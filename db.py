@@ -1,13 +1,24 @@
 # db.py
 
+import queue
 import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, timedelta
+from pathlib import Path
+
+import metrics
 
 DB_PATH = "pATH TO tasks.db"
 
-def get_connection():
+def get_connection(path=None):
     """
     Establishes and returns a connection to the SQLite database.
 
+    Parameters:
+        path (str): Database file (default is DB_PATH).
+
     Returns:
         sqlite3.Connection: An active database connection with WAL mode enabled.
 
@@ -16,13 +27,208 @@ def get_connection():
         - Timeout is set to 10 seconds.
         - check_same_thread=False allows connection sharing across threads.
     """
-    conn = sqlite3.connect(DB_PATH, timeout=10, check_same_thread=False)
+    conn = sqlite3.connect(path or DB_PATH, timeout=10, check_same_thread=False)
     conn.execute("PRAGMA journal_mode=WAL;")
     return conn
 
-def initialize_database():
+def get_read_connection(path=None, check_same_thread=True):
+    """
+    Opens a read-only connection to the SQLite database.
+
+    Parameters:
+        path (str): Database file (default is DB_PATH).
+        check_same_thread (bool): False for a connection used from several
+            threads under the caller's own lock (see engine.TrackerEngine).
+
+    Returns:
+        sqlite3.Connection: A connection that cannot write to the database.
+
+    Notes:
+        - Intended for background readers (e.g. report workers in other
+          processes); each caller gets its own connection.
+        - Its cursors record statement timings while metrics are enabled.
     """
-    Initializes the database by creating the 'tasks' table if it doesn't exist.
+    uri = Path(path or DB_PATH).resolve().as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True, timeout=10, check_same_thread=check_same_thread, factory=metrics.TimedConnection)
+
+class ConnectionManager:
+    def __init__(self, path=None, batch_size=64):
+        """
+        Owns the single writer thread and the per-thread read connections.
+
+        Parameters:
+            path (str): Database file (default is DB_PATH).
+            batch_size (int): Maximum number of queued write jobs committed together.
+
+        Notes:
+            - Writes are jobs (functions taking a cursor) run on the writer
+              thread; submit() returns immediately with a Future.
+            - Jobs waiting in the queue are run in one transaction, so a
+              burst of writes costs a single commit.
+            - Reads use read-only connections, one per thread (see reader()).
+        """
+        self.path = path or DB_PATH
+        self.batch_size = batch_size
+        self.jobs = queue.Queue()
+        self.local = threading.local()
+
+        self.commits = 0
+        self.jobs_run = 0
+        self.max_batch = 0
+        self.busy_waits = 0
+        self.busy_wait_time = 0.0
+        self.commit_time = 0.0
+
+        self.writer = threading.Thread(target=self.writer_loop, name="db-writer", daemon=True)
+        self.writer.start()
+
+    def submit(self, job, *args):
+        """
+        Queues a write job for the writer thread.
+
+        Parameters:
+            job (function): Called as job(cursor, *args) inside a transaction.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the job's return value.
+        """
+        future = Future()
+        self.jobs.put((job, args, future))
+        return future
+
+    def reader(self):
+        """
+        Returns the read-only connection of the calling thread, opening it on first use.
+        """
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = get_read_connection(self.path)
+            self.local.conn = conn
+        return conn
+
+    def close(self):
+        """
+        Runs every queued job, stops the writer thread and closes this thread's reader.
+        """
+        self.jobs.put(None)
+        self.writer.join()
+        conn = getattr(self.local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self.local.conn = None
+
+    def stats(self):
+        """
+        Returns writer counters: commits, jobs, largest batch, queue depth and
+        SQLite busy waits (count and total ms).
+        """
+        return {
+            "commits": self.commits,
+            "jobs": self.jobs_run,
+            "max_batch": self.max_batch,
+            "queued": self.jobs.qsize(),
+            "busy_waits": self.busy_waits,
+            "busy_wait_ms": self.busy_wait_time * 1000,
+            "avg_commit_ms": (self.commit_time / self.commits * 1000) if self.commits else 0.0,
+        }
+
+    def begin(self, cursor):
+        """
+        Starts a write transaction, retrying (and counting) while the database is busy.
+        """
+        delay = 0.001
+        deadline = time.monotonic() + 10
+        while True:
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                return
+            except sqlite3.OperationalError as e:
+                if "locked" not in str(e) and "busy" not in str(e) or time.monotonic() > deadline:
+                    raise
+                self.busy_waits += 1
+                self.busy_wait_time += delay
+                time.sleep(delay)
+                delay = min(delay * 2, 0.1)
+
+    def run_batch(self, cursor, batch):
+        """
+        Runs a batch of jobs in one transaction and resolves their futures.
+
+        Returns:
+            Exception: The error that rolled the batch back, or None on success.
+        """
+        started = time.perf_counter()
+        try:
+            self.begin(cursor)
+        except Exception as e:
+            return e
+        try:
+            if metrics.enabled:
+                results = [self.run_timed(cursor, job, args) for job, args, _ in batch]
+            else:
+                results = [job(cursor, *args) for job, args, _ in batch]
+            cursor.execute("COMMIT")
+        except Exception as e:
+            cursor.execute("ROLLBACK")
+            return e
+        elapsed = time.perf_counter() - started
+        self.commits += 1
+        self.commit_time += elapsed
+        if metrics.enabled:
+            metrics.record("db.commit", elapsed)
+        for (_, _, future), result in zip(batch, results):
+            future.set_result(result)
+        return None
+
+    def run_timed(self, cursor, job, args):
+        """
+        Runs one job and records its duration as metric 'db.job.<job name>'.
+        """
+        started = time.perf_counter()
+        result = job(cursor, *args)
+        metrics.record(f"db.job.{job.__name__}", time.perf_counter() - started)
+        return result
+
+    def writer_loop(self):
+        """
+        Writer thread: waits for jobs and commits them in batches.
+
+        Notes:
+            - If a batch fails, its jobs are retried one per transaction so a
+              single bad job only fails its own future.
+        """
+        conn = sqlite3.connect(self.path, timeout=0, isolation_level=None, factory=metrics.TimedConnection)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        cursor = conn.cursor()
+        stopping = False
+        while not stopping:
+            batch = [self.jobs.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.jobs.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = [item for item in batch if item is not None]
+            if not batch:
+                continue
+
+            self.jobs_run += len(batch)
+            self.max_batch = max(self.max_batch, len(batch))
+            error = self.run_batch(cursor, batch)
+            if error is not None and len(batch) == 1:
+                batch[0][2].set_exception(error)
+            elif error is not None:
+                for item in batch:
+                    error = self.run_batch(cursor, [item])
+                    if error is not None:
+                        item[2].set_exception(error)
+        conn.close()
+
+def create_tasks_table(cursor):
+    """
+    Migration 1: create the 'tasks' table.
 
     Table schema:
         - id: Unique ID for each task entry.
@@ -32,11 +238,7 @@ def initialize_database():
         - total_time: Total accumulated time in seconds (can be negative for corrections).
         - status: Task status (e.g., 'paused', 'running', 'correction').
         - date: Date string (YYYY-MM-DD) used for daily tracking.
-
-    This function ensures the database is ready for use at application startup.
     """
-    conn = get_connection()
-    cursor = conn.cursor()
     cursor.execute("""
         CREATE TABLE IF NOT EXISTS tasks (
             id INTEGER PRIMARY KEY,
@@ -48,5 +250,504 @@ def initialize_database():
             date TEXT
         )
     """)
-    conn.commit()
+
+def add_task_indexes(cursor):
+    """
+    Migration 2: index the hot 'tasks' lookups.
+
+    Indexes:
+        - (date, name): per-day lookups and date range scans (reports, years).
+        - (name, date): per-task lookups and SELECT DISTINCT name.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_date_name ON tasks (date, name)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_name_date ON tasks (name, date)")
+
+# Rollup tables and the substr() expression that derives each key from tasks.date
+ROLLUPS = {
+    "daily_totals": ("day", "date"),
+    "monthly_totals": ("month", "substr(date, 1, 7)"),
+}
+
+def create_rollups(cursor, column):
+    """
+    Creates, triggers and fills the rollup tables for a given task key column.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor inside the migration's transaction.
+        column (str): Column identifying the task in 'tasks' ('name' up to
+            schema v4, 'task_id' from v5).
+    """
+    key_type = "TEXT" if column == "name" else "INTEGER"
+    for table, (key, expression) in ROLLUPS.items():
+        cursor.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                {key} TEXT NOT NULL,
+                {column} {key_type} NOT NULL,
+                total_time INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY ({key}, {column})
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table} ({column}, {key})")
+
+        def upsert(row, sign):
+            value = expression.replace("date", f"{row}.date")
+            return f"""
+                INSERT INTO {table} ({key}, {column}, total_time)
+                VALUES ({value}, {row}.{column}, {sign}COALESCE({row}.total_time, 0))
+                ON CONFLICT ({key}, {column}) DO UPDATE SET total_time = total_time + excluded.total_time;
+            """
+
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_insert AFTER INSERT ON tasks
+            BEGIN {upsert("NEW", "")} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_update AFTER UPDATE OF {column}, date, total_time ON tasks
+            BEGIN {upsert("OLD", "-")} {upsert("NEW", "")} END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_delete AFTER DELETE ON tasks
+            BEGIN {upsert("OLD", "-")} END
+        """)
+    rebuild_rollups(cursor, column)
+
+def drop_rollups(cursor):
+    """
+    Drops the rollup tables and their triggers on 'tasks'.
+    """
+    for table in ROLLUPS:
+        for event in ("insert", "update", "delete"):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_{table}_{event}")
+        cursor.execute(f"DROP TABLE IF EXISTS {table}")
+
+def add_rollup_tables(cursor):
+    """
+    Migration 3: per-task daily and monthly rollups kept current by triggers.
+
+    Tables:
+        - daily_totals (day, name, total_time): one row per task per day.
+        - monthly_totals (month, name, total_time): one row per task per month (YYYY-MM).
+
+    Every INSERT, UPDATE and DELETE on 'tasks' (including corrections) adjusts
+    the matching rollup rows, so reports read precomputed sums instead of
+    aggregating the raw history.
+    """
+    create_rollups(cursor, "name")
+
+def rebuild_rollups(cursor, column="task_id"):
+    """
+    Recomputes every rollup table from the raw 'tasks' rows.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor inside the caller's transaction.
+        column (str): Column identifying the task (see create_rollups).
+    """
+    for table, (key, expression) in ROLLUPS.items():
+        cursor.execute(f"DELETE FROM {table}")
+        cursor.execute(f"""
+            INSERT INTO {table} ({key}, {column}, total_time)
+            SELECT {expression}, {column}, SUM(COALESCE(total_time, 0))
+            FROM tasks
+            WHERE date IS NOT NULL
+            GROUP BY {expression}, {column}
+        """)
+
+def check_rollups(conn, repair=False):
+    """
+    Compares the rollup tables against sums computed from the raw 'tasks' rows.
+
+    Parameters:
+        conn (sqlite3.Connection): Database connection.
+        repair (bool): Rebuild the rollups when a mismatch is found.
+
+    Returns:
+        list: (table, key, task_id, rollup_total, raw_total) for every mismatch.
+    """
+    mismatches = []
+    for table, (key, expression) in ROLLUPS.items():
+        raw = f"""
+            SELECT {expression} AS k, task_id, SUM(COALESCE(total_time, 0)) AS total_time
+            FROM tasks WHERE date IS NOT NULL GROUP BY k, task_id
+        """
+        rows = conn.execute(f"""
+            SELECT r.{key}, r.task_id, r.total_time, t.total_time
+            FROM {table} r
+            LEFT JOIN ({raw}) t ON t.k = r.{key} AND t.task_id = r.task_id
+            WHERE t.total_time IS NULL AND r.total_time != 0 OR t.total_time != r.total_time
+            UNION ALL
+            SELECT t.k, t.task_id, NULL, t.total_time
+            FROM ({raw}) t
+            LEFT JOIN {table} r ON r.{key} = t.k AND r.task_id = t.task_id
+            WHERE r.task_id IS NULL AND t.total_time != 0
+        """).fetchall()
+        mismatches.extend((table,) + tuple(row) for row in rows)
+
+    if mismatches and repair:
+        with conn:
+            rebuild_rollups(conn.cursor())
+    return mismatches
+
+def add_intervals_table(cursor):
+    """
+    Migration 4: append-only log of work sessions.
+
+    Table schema:
+        - id: Unique ID for each session.
+        - name: Name of the task.
+        - date: Date of the daily entry the session belongs to (YYYY-MM-DD).
+        - started_at: Session start timestamp (ISO 8601).
+        - ended_at: Session end timestamp (ISO 8601).
+        - seconds: Tracked seconds of the session.
+
+    Each row is written once, when the session ends. A trigger adds the
+    session's seconds to the matching daily entry in 'tasks', which in turn
+    keeps the rollups current.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS intervals (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            date TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            ended_at TEXT NOT NULL,
+            seconds REAL NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_intervals_date_name ON intervals (date, name)")
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_intervals_insert AFTER INSERT ON intervals
+        BEGIN
+            UPDATE tasks SET total_time = COALESCE(total_time, 0) + NEW.seconds
+            WHERE name = NEW.name AND date = NEW.date AND status != 'correction';
+        END
+    """)
+
+def normalize_task_names(cursor):
+    """
+    Migration 5: move task names into a 'task_names' dictionary table.
+
+    Table schema:
+        - task_names.id: Integer key of the task.
+        - task_names.name: Task name as entered (unique).
+        - task_names.name_key: Lower-cased name, for case-insensitive lookups.
+
+    'tasks', 'intervals' and the rollups are rebuilt with an integer
+    'task_id' column in place of the repeated name text, so fact rows are
+    smaller and filters, joins and GROUP BYs compare integers.
+    """
+    cursor.connection.create_function("name_key", 1, lambda name: name.lower(), deterministic=True)
+    cursor.execute("""
+        CREATE TABLE task_names (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            name_key TEXT NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX idx_task_names_key ON task_names (name_key)")
+    cursor.execute("""
+        INSERT INTO task_names (name, name_key)
+        SELECT name, name_key(name) FROM (SELECT name FROM tasks UNION SELECT name FROM intervals)
+        ORDER BY name
+    """)
+
+    drop_rollups(cursor)
+    cursor.execute("DROP TRIGGER IF EXISTS trg_intervals_insert")
+
+    cursor.execute("""
+        CREATE TABLE tasks_v5 (
+            id INTEGER PRIMARY KEY,
+            task_id INTEGER NOT NULL REFERENCES task_names (id),
+            start_time TEXT,
+            end_time TEXT,
+            total_time INTEGER DEFAULT 0,
+            status TEXT,
+            date TEXT
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO tasks_v5 (id, task_id, start_time, end_time, total_time, status, date)
+        SELECT t.id, n.id, t.start_time, t.end_time, t.total_time, t.status, t.date
+        FROM tasks t JOIN task_names n ON n.name = t.name
+    """)
+    cursor.execute("DROP TABLE tasks")
+    cursor.execute("ALTER TABLE tasks_v5 RENAME TO tasks")
+    cursor.execute("CREATE INDEX idx_tasks_date_task ON tasks (date, task_id)")
+    cursor.execute("CREATE INDEX idx_tasks_task_date ON tasks (task_id, date)")
+
+    cursor.execute("""
+        CREATE TABLE intervals_v5 (
+            id INTEGER PRIMARY KEY,
+            task_id INTEGER NOT NULL REFERENCES task_names (id),
+            date TEXT NOT NULL,
+            started_at TEXT NOT NULL,
+            ended_at TEXT NOT NULL,
+            seconds REAL NOT NULL
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO intervals_v5 (id, task_id, date, started_at, ended_at, seconds)
+        SELECT i.id, n.id, i.date, i.started_at, i.ended_at, i.seconds
+        FROM intervals i JOIN task_names n ON n.name = i.name
+    """)
+    cursor.execute("DROP TABLE intervals")
+    cursor.execute("ALTER TABLE intervals_v5 RENAME TO intervals")
+    cursor.execute("CREATE INDEX idx_intervals_date_task ON intervals (date, task_id)")
+    cursor.execute("""
+        CREATE TRIGGER trg_intervals_insert AFTER INSERT ON intervals
+        BEGIN
+            UPDATE tasks SET total_time = COALESCE(total_time, 0) + NEW.seconds
+            WHERE task_id = NEW.task_id AND date = NEW.date AND status != 'correction';
+        END
+    """)
+
+    create_rollups(cursor, "task_id")
+
+def add_running_index(cursor):
+    """
+    Migration 6: partial index over the daily entries of running sessions.
+
+    A task's daily entry is marked status 'running' with its session start in
+    'start_time' while the session is open, so a session interrupted by a
+    crash can be found and recovered at the next launch. Only the few open
+    entries are indexed.
+    """
+    cursor.execute("CREATE INDEX idx_tasks_running ON tasks (date) WHERE status = 'running'")
+
+def add_data_versions(cursor):
+    """
+    Migration 7: per-month data version counters.
+
+    Table:
+        - data_versions (month, version): bumped by triggers whenever a row of
+          'tasks' dated in that month (YYYY-MM) is inserted, deleted, or has
+          its task, date or time changed, including corrections and the
+          totals added by finished sessions.
+
+    The report cache keys files on these versions, so a cached report is
+    reused exactly as long as nothing in its period has changed.
+    """
+    cursor.execute("""
+        CREATE TABLE data_versions (
+            month TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+    def bump(row):
+        return f"""
+            INSERT INTO data_versions (month, version) VALUES (substr({row}.date, 1, 7), 1)
+            ON CONFLICT (month) DO UPDATE SET version = version + 1;
+        """
+
+    cursor.execute(f"CREATE TRIGGER trg_data_versions_insert AFTER INSERT ON tasks BEGIN {bump('NEW')} END")
+    cursor.execute(f"""
+        CREATE TRIGGER trg_data_versions_update AFTER UPDATE OF task_id, date, total_time ON tasks
+        BEGIN {bump('OLD')} {bump('NEW')} END
+    """)
+    cursor.execute(f"CREATE TRIGGER trg_data_versions_delete AFTER DELETE ON tasks BEGIN {bump('OLD')} END")
+
+def add_archived_years(cursor):
+    """
+    Migration 8: registry of the years sealed into the columnar archive.
+
+    Table schema:
+        - year: Sealed year (YYYY).
+        - generation: Archive folder of the year ('<year>.<generation>');
+          sealing a year again writes a new generation.
+        - rows: Number of (task, day) rows archived.
+        - total_time: Seconds archived, for checks.
+        - sealed_at: When the year was (last) sealed (ISO 8601).
+
+    A year's rows leave 'tasks' and the rollups in the same transaction
+    that registers it here, so no row is ever read from both places
+    (see archive.py).
+    """
+    cursor.execute("""
+        CREATE TABLE archived_years (
+            year TEXT PRIMARY KEY,
+            generation INTEGER NOT NULL,
+            rows INTEGER NOT NULL,
+            total_time REAL NOT NULL,
+            sealed_at TEXT NOT NULL
+        ) WITHOUT ROWID
+    """)
+
+def unique_task_name_keys(cursor):
+    """
+    Migration 9: make task_names.name_key unique, folded like the name search.
+
+    Table schema:
+        - task_names.name_key: name_key(name), the key of the task's name
+          search (whitespace collapsed, case-folded); unique, so the writer
+          resolves names by key and another process cannot add a name that
+          differs only in case.
+
+    Names that folded to an existing key (case-only duplicates added before
+    this version) have their 'tasks' and 'intervals' rows moved to the oldest
+    spelling, and same-day entries merged. They stay in 'task_names' with a
+    NULL key, for the task ids of sealed archive years.
+    """
+    cursor.execute("SELECT id, name FROM task_names ORDER BY id")
+    rows = cursor.fetchall()
+    first, aliases = {}, {}
+    for task_id, name in rows:
+        key = name_key(name)
+        if key in first:
+            aliases[task_id] = first[key]
+        else:
+            first[key] = task_id
+
+    cursor.execute("""
+        CREATE TABLE task_names_v9 (
+            id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE,
+            name_key TEXT UNIQUE
+        )
+    """)
+    cursor.executemany(
+        "INSERT INTO task_names_v9 (id, name, name_key) VALUES (?, ?, ?)",
+        [(task_id, name, None if task_id in aliases else name_key(name)) for task_id, name in rows],
+    )
+    cursor.execute("DROP TABLE task_names")
+    cursor.execute("ALTER TABLE task_names_v9 RENAME TO task_names")
+
+    # The rollup and data version triggers follow these updates
+    for alias, task_id in aliases.items():
+        cursor.execute("UPDATE tasks SET task_id = ? WHERE task_id = ?", (task_id, alias))
+        cursor.execute("UPDATE intervals SET task_id = ? WHERE task_id = ?", (task_id, alias))
+    for task_id in set(aliases.values()):
+        cursor.execute("""
+            SELECT date, MIN(id), SUM(COALESCE(total_time, 0)),
+                   MIN(CASE WHEN status = 'running' THEN start_time END)
+            FROM tasks WHERE task_id = ? AND status != 'correction'
+            GROUP BY date HAVING COUNT(*) > 1
+        """, (task_id,))
+        for day, entry_id, total_time, start_time in cursor.fetchall():
+            cursor.execute(
+                "DELETE FROM tasks WHERE task_id = ? AND date = ? AND status != 'correction' AND id != ?",
+                (task_id, day, entry_id),
+            )
+            cursor.execute(
+                "UPDATE tasks SET total_time = ?, status = IFNULL(?, status), start_time = IFNULL(?, start_time) WHERE id = ?",
+                (total_time, start_time and "running", start_time, entry_id),
+            )
+
+# Ordered list of migrations; the schema version is the number of migrations applied.
+# Only ever append to this list.
+MIGRATIONS = [
+    create_tasks_table,
+    add_task_indexes,
+    add_rollup_tables,
+    add_intervals_table,
+    normalize_task_names,
+    add_running_index,
+    add_data_versions,
+    add_archived_years,
+    unique_task_name_keys,
+]
+
+def get_schema_version(conn):
+    """
+    Returns the schema version recorded in the database (PRAGMA user_version).
+    """
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(conn, target=None):
+    """
+    Brings the database schema up to date in place.
+
+    Parameters:
+        conn (sqlite3.Connection): Connection to the database to migrate.
+        target (int): Stop at this schema version (default: the latest).
+            Used by the benchmarks to build databases at older versions.
+
+    Returns:
+        int: The schema version after migrating.
+
+    Notes:
+        - Each pending migration runs in its own transaction together with the
+          version bump, so an interrupted upgrade resumes where it stopped.
+        - Databases created before versioning (user_version 0) are handled by
+          the idempotent first migration.
+    """
+    version = get_schema_version(conn)
+    for number, migration in enumerate(MIGRATIONS[version:target], start=version + 1):
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            migration(cursor)
+            cursor.execute(f"PRAGMA user_version = {number}")
+            cursor.execute("COMMIT")
+        except Exception:
+            cursor.execute("ROLLBACK")
+            raise
+    return get_schema_version(conn)
+
+def name_key(name):
+    """
+    Returns the key task names are matched on: whitespace collapsed and
+    case-folded, so 'Code  review' and 'CODE REVIEW' are the same task.
+
+    Notes:
+        - Stored as task_names.name_key and used by the name search
+          (lookup_cache), so both sides agree on which names are duplicates.
+    """
+    return " ".join(name.split()).casefold()
+
+def find_task_id(cursor, name):
+    """
+    Returns the integer key of a task name, matched by name_key(), or None
+    if the name is unknown.
+    """
+    cursor.execute("SELECT id FROM task_names WHERE name_key = ?", (name_key(name),))
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+def get_task_id(cursor, name):
+    """
+    Returns the integer key of a task name, adding the name if it is new.
+
+    Notes:
+        - A new name is inserted in the caller's transaction; commit it
+          together with the rows that use the key.
+        - Names are resolved by name_key(), which is unique: a name another
+          process added in a different case is reused, never duplicated.
+    """
+    task_id = find_task_id(cursor, name)
+    if task_id is None:
+        cursor.execute("INSERT OR IGNORE INTO task_names (name, name_key) VALUES (?, ?)", (name, name_key(name)))
+        task_id = find_task_id(cursor, name)
+    return task_id
+
+def get_data_version(cursor, start, end):
+    """
+    Returns the data version of a half-open date range.
+
+    Parameters:
+        cursor (sqlite3.Cursor): Cursor to access the database.
+        start (str): First day included (YYYY-MM-DD).
+        end (str): First day excluded (YYYY-MM-DD).
+
+    Returns:
+        str: 'month:version' pairs of every changed month the range touches;
+            it changes whenever any data in the range does.
+    """
+    last_month = (date.fromisoformat(end) - timedelta(days=1)).isoformat()[:7]
+    cursor.execute(
+        "SELECT month, version FROM data_versions WHERE month >= ? AND month <= ? ORDER BY month",
+        (start[:7], last_month),
+    )
+    return ",".join(f"{month}:{version}" for month, version in cursor.fetchall())
+
+def initialize_database(path=None):
+    """
+    Initializes the database by applying any pending schema migrations.
+
+    This function ensures the database is ready for use at application startup.
+
+    Parameters:
+        path (str): Database file (default is DB_PATH).
+    """
+    conn = get_connection(path)
+    migrate(conn)
     conn.close()
@@ -0,0 +1,104 @@
+# debug_window.py
+
+import time
+import tkinter as tk
+from tkinter import filedialog
+
+import metrics
+
+
+def open_debug_window(root, sources, refresh_ms=1000):
+    """
+    Open the (hidden) performance window: live metrics and a JSON snapshot export.
+
+    Parameters:
+    - root (tk.Tk): The main application window.
+    - sources (dict): Extra counters shown and exported with the metrics
+      (name -> function returning a dict, see metrics.snapshot).
+    - refresh_ms (int): Refresh interval in milliseconds (default is 1000).
+
+    Returns:
+    - tk.Toplevel: The window.
+
+    Behavior:
+    - 'Collect' turns instrumentation on and off; while off the probes cost
+      a single flag check.
+    - Refreshes itself until closed.
+    """
+    window = tk.Toplevel(root)
+    window.title("Performance")
+    window.geometry("760x520")
+
+    controls = tk.Frame(window)
+    controls.pack(fill=tk.X, padx=10, pady=5)
+
+    collect_var = tk.BooleanVar(value=metrics.enabled)
+    tk.Checkbutton(
+        controls,
+        text="Collect",
+        variable=collect_var,
+        command=lambda: metrics.enable(collect_var.get()),
+    ).pack(side=tk.LEFT)
+    tk.Button(controls, text="Reset", command=metrics.reset).pack(side=tk.LEFT, padx=5)
+    tk.Button(controls, text="Save JSON...", command=lambda: save_snapshot(window, sources)).pack(side=tk.LEFT, padx=5)
+
+    text_widget = tk.Text(window, wrap="none", font=("Courier New", 9))
+    text_widget.pack(fill=tk.BOTH, expand=True, padx=10, pady=(0, 10))
+
+    def refresh():
+        if not window.winfo_exists():
+            return
+        text = format_snapshot(metrics.snapshot(sources))
+        text_widget.config(state="normal")
+        text_widget.delete("1.0", tk.END)
+        text_widget.insert("1.0", text)
+        text_widget.config(state="disabled")
+        window.after(refresh_ms, refresh)
+
+    refresh()
+    return window
+
+
+def save_snapshot(window, sources):
+    """
+    Ask for a file name and write the current metrics snapshot to it as JSON.
+    """
+    path = filedialog.asksaveasfilename(
+        parent=window,
+        defaultextension=".json",
+        initialfile=time.strftime("metrics-%Y%m%d-%H%M%S.json"),
+        filetypes=[("JSON", "*.json")],
+    )
+    if path:
+        metrics.dump(path, sources)
+
+
+def format_snapshot(data, sql_limit=15):
+    """
+    Render a metrics snapshot as plain-text tables.
+
+    Parameters:
+    - data (dict): As returned by metrics.snapshot.
+    - sql_limit (int): Number of statements listed, slowest total first.
+
+    Returns:
+    - str: The text shown in the debug window.
+    """
+    state = "on" if data["enabled"] else "off"
+    lines = [f"Collecting: {state}    uptime: {data['uptime_s']:.0f}s", ""]
+
+    header = f"{'count':>8} {'/s':>8} {'avg ms':>9} {'max ms':>9} {'total ms':>10}  "
+    for title, rows, limit in (("Timers", data["timers"], None), ("SQL", data["sql"], sql_limit)):
+        lines.append(f"{header}{title}")
+        for row in rows[:limit]:
+            lines.append(
+                f"{row['count']:>8} {row['per_second']:>8.2f} {row['avg_ms']:>9.3f} "
+                f"{row['max_ms']:>9.3f} {row['total_ms']:>10.1f}  {row['name'][:90]}"
+            )
+        lines.append("")
+
+    for name, stats in data.items():
+        if isinstance(stats, dict):
+            values = ", ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}" for key, value in stats.items())
+            lines.append(f"{name}: {values}")
+    return "\n".join(lines)
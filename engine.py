@@ -0,0 +1,405 @@
+# engine.py
+
+import math
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+from db import ConnectionManager, initialize_database, get_read_connection, find_task_id, name_key
+from lookup_cache import LookupCache
+from persistence import WriteBehindQueue
+from task_model import Task
+
+
+class EngineError(Exception):
+    """Raised for a request the engine refuses (unknown or duplicate task, bad input)."""
+
+
+def number(value):
+    """Return value as a finite float, or raise EngineError."""
+    try:
+        seconds = float(value)
+    except (TypeError, ValueError):
+        seconds = math.nan
+    if not math.isfinite(seconds):
+        raise EngineError(f"Invalid number of seconds {value!r}.")
+    return seconds
+
+
+class TrackerEngine:
+    def __init__(self, path=None, flush_interval=5.0):
+        """
+        Initialize the tracking engine: today's tasks, their timers and their persistence.
+
+        Parameters:
+        - path (str): Database file (default is db.DB_PATH).
+        - flush_interval (float): Seconds between periodic flushes (default is 5).
+
+        Behavior:
+        - Migrates the database, starts its writer thread and reloads today's
+          tasks, recovering sessions left open by a crash.
+        - Every operation runs under one lock, so the Tk thread, daemon
+          clients and the flush thread can call it concurrently.
+        - Operations take and return plain data (names, numbers, dicts; see
+          snapshot), so the engine can run in-process or behind the daemon
+          socket (daemon.py) with the same calls.
+        """
+        initialize_database(path)
+        self.db = ConnectionManager(path)
+        self.lock = threading.RLock()
+        self.tasks = {}
+        self.version = 0
+
+        # Reads happen under self.lock, from whichever thread holds it
+        self.reader = get_read_connection(self.db.path, check_same_thread=False)
+        self.cursor = self.reader.cursor()
+        self.lookup_cache = LookupCache(self.cursor)
+        self.persistence = WriteBehindQueue(self.db, interval=flush_interval)
+        self.stopping = threading.Event()
+        self.flusher = None
+        self.restore_today()
+
+    def start_flushing(self):
+        """
+        Start the thread flushing the write-behind queue every flush interval.
+        """
+        self.flusher = threading.Thread(target=self.flush_loop, name="engine-flush", daemon=True)
+        self.flusher.start()
+        return self
+
+    def flush_loop(self):
+        """
+        Flush thread body: flush until close() is called.
+
+        Behavior:
+        - Also picks up names and years written by other processes (see
+          LookupCache.refresh).
+        """
+        while not self.stopping.wait(self.persistence.interval):
+            with self.lock:
+                if self.stopping.is_set():
+                    break
+                self.persistence.flush()
+                self.lookup_cache.refresh()
+
+    def flush(self):
+        """Send the pending writes to the writer thread."""
+        with self.lock:
+            self.persistence.flush()
+
+    def close(self):
+        """
+        Stop the engine.
+
+        Behavior:
+        - Ends the sessions of running tasks and flushes them, retrying a
+          flush the database refused (see WriteBehindQueue.drain).
+        - Waits for the writer thread to commit and closes DB connections.
+        """
+        self.stopping.set()
+        with self.lock:
+            for task in self.tasks.values():
+                if task.running:
+                    self.persistence.record_interval(task.name, *task.pause())
+            self.persistence.drain()
+            self.db.close()
+            self.reader.close()
+
+    def snapshot(self, task):
+        """
+        Return the state of a task as plain data.
+
+        Returns:
+        - dict: name, total (seconds before the current session), session
+          (seconds of the current session), correction (today's corrections)
+          and running.
+        """
+        session = (time.monotonic_ns() - task.start_ns) / 1e9 if task.running else 0.0
+        return {
+            "name": task.name,
+            "total": task.total_time,
+            "session": session,
+            "correction": task.correction_time,
+            "running": task.running,
+        }
+
+    def changed(self):
+        """Count a change of today's tasks (see changes)."""
+        self.version += 1
+
+    def info(self):
+        """Return the database file and the number of today's tasks."""
+        with self.lock:
+            return {"db": os.path.abspath(self.db.path), "tasks": len(self.tasks), "version": self.version}
+
+    def list_tasks(self):
+        """Return the snapshots of today's tasks, in the order they were added."""
+        with self.lock:
+            return [self.snapshot(task) for task in self.tasks.values()]
+
+    def changes(self, since=None):
+        """
+        Return today's tasks if they changed since a version.
+
+        Parameters:
+        - since (int): Version returned by an earlier call (None for everything).
+
+        Returns:
+        - dict: version, and tasks (list of snapshots, or None if nothing
+          changed since that version).
+
+        Behavior:
+        - Starting, pausing, adding or editing a task changes the version;
+          the ticking of running timers does not (clients extrapolate from
+          'session'), so polling an idle engine returns almost nothing.
+        """
+        with self.lock:
+            tasks = None if since == self.version else [self.snapshot(task) for task in self.tasks.values()]
+            return {"version": self.version, "tasks": tasks}
+
+    def get(self, name):
+        """
+        Return one of today's tasks, or raise EngineError.
+
+        Behavior:
+        - Like add_task, matches the name case-insensitively (through the
+          lookup cache), so 'code review' finds 'Code review'.
+        """
+        task = self.tasks.get(name)
+        if task is None:
+            task = self.tasks.get(self.lookup_cache.find_task_name(name))
+        if task is None:
+            raise EngineError(f"No task '{name}' today.")
+        return task
+
+    def load_task(self, name, total_time=0, correction_time=0):
+        """
+        Create the Task of one of today's tasks.
+
+        Returns:
+        - Task: The new task.
+        """
+        task = Task(name=name, total_time=total_time)
+        task.correction_time = correction_time
+        self.tasks[name] = task
+        self.changed()
+        return task
+
+    def restore_today(self):
+        """
+        Reload today's tasks and recover sessions left open by a crash.
+
+        Behavior:
+        - One query returns today's entries with their correction sums, plus
+          the entries of earlier days still marked 'running' (found through the
+          partial index idx_tasks_running, not a scan).
+        - Today's open sessions resume from their persisted start, as if the
+          app had kept running; the session is logged when it is paused.
+        - Sessions left open on an earlier day are closed at the end of that
+          day and logged as intervals.
+        """
+        today = datetime.now().strftime("%Y-%m-%d")
+        with self.lock:
+            self.cursor.execute("""
+                SELECT t.id, n.name, t.date, t.total_time, t.status, t.start_time,
+                       (SELECT SUM(c.total_time) FROM tasks c
+                        WHERE c.task_id = t.task_id AND c.date = t.date AND c.status = 'correction')
+                FROM tasks t JOIN task_names n ON n.id = t.task_id
+                WHERE t.date = ? AND t.status != 'correction'
+                UNION ALL
+                SELECT t.id, n.name, t.date, t.total_time, t.status, t.start_time, NULL
+                FROM tasks t JOIN task_names n ON n.id = t.task_id
+                WHERE t.status = 'running' AND t.date < ?
+                ORDER BY 1
+            """, (today, today))
+
+            for _, name, date, total_time, status, start_time, correction_time in self.cursor.fetchall():
+                started_at = datetime.fromisoformat(start_time) if status == "running" and start_time else None
+                if date != today:
+                    if started_at:
+                        ended_at = datetime.combine(started_at.date() + timedelta(days=1), datetime.min.time())
+                        self.persistence.record_interval(name, started_at, ended_at, (ended_at - started_at).total_seconds())
+                    continue
+
+                task = self.load_task(name, total_time or 0, correction_time or 0)
+                if started_at:
+                    task.resume(started_at)
+            self.persistence.flush()
+
+    def add_task(self, name):
+        """
+        Add a task to today's list, or load an existing task for today.
+
+        Parameters:
+        - name (str): Typed or chosen task name.
+
+        Returns:
+        - dict: Snapshot of the task.
+
+        Raises:
+        - EngineError: If the name is empty or the task already exists today.
+
+        Behavior:
+        - A name matching a known task case-insensitively uses that task's
+          spelling, so no near-duplicate task is created.
+        - Inserts task in DB if it's new.
+        """
+        name = " ".join(name.split())
+        if not name:
+            raise EngineError("Please enter a task name.")
+        today = datetime.now().strftime("%Y-%m-%d")
+        with self.lock:
+            name = self.lookup_cache.find_task_name(name) or name
+
+            # Loaded tasks are checked first (their entry may still be queued for
+            # the writer), then today's rows via the indexed name_key.
+            if name in self.tasks:
+                raise EngineError(f"Task '{name}' already exists for today.")
+            self.cursor.execute("""
+                SELECT 1 FROM tasks t JOIN task_names n ON n.id = t.task_id
+                WHERE t.date = ? AND n.name_key = ? AND t.status != 'correction'
+            """, (today, name_key(name)))
+            if self.cursor.fetchone():
+                raise EngineError(f"Task '{name}' already exists for today.")
+
+            task_id = find_task_id(self.cursor, name)
+            self.cursor.execute(
+                "SELECT SUM(total_time) FROM tasks WHERE task_id = ? AND date = ? AND status = 'correction'",
+                (task_id, today),
+            )
+            correction_time = self.cursor.fetchone()[0] or 0
+
+            self.persistence.add_entry(name, today)
+            self.persistence.flush()
+            self.lookup_cache.add(name, today)
+            return self.snapshot(self.load_task(name, 0, correction_time))
+
+    def start(self, name):
+        """
+        Start or resume a task.
+
+        Behavior:
+        - Persists the session start once, so it survives a crash.
+        """
+        with self.lock:
+            task = self.get(name)
+            if not task.running:
+                task.start()
+                self.persistence.record_start(task.name, task.start_time)
+                self.persistence.flush()
+                self.changed()
+            return self.snapshot(task)
+
+    def pause(self, name):
+        """
+        Pause a task and log the finished session in the DB.
+        """
+        with self.lock:
+            task = self.get(name)
+            if task.running:
+                self.persistence.record_interval(task.name, *task.pause())
+                self.persistence.flush()
+                self.changed()
+            return self.snapshot(task)
+
+    def toggle(self, name):
+        """Pause a running task and start (or continue) any other."""
+        with self.lock:
+            return self.pause(name) if self.get(name).running else self.start(name)
+
+    def pause_all(self):
+        """
+        Pause all running tasks.
+
+        Returns:
+        - list: Snapshots of today's tasks.
+        """
+        with self.lock:
+            for task in self.tasks.values():
+                if task.running:
+                    self.pause(task.name)
+            return self.list_tasks()
+
+    def set_time(self, name, seconds):
+        """
+        Manually set the time of one of today's tasks.
+
+        Parameters:
+        - name (str): Task name.
+        - seconds (float): New time of the day in seconds, as displayed
+          (today's corrections included).
+
+        Raises:
+        - EngineError: If the task is unknown or seconds is not a number >= 0.
+
+        Behavior:
+        - The daily entry is set to seconds minus today's corrections, so the
+          timer shows exactly the time typed and the day adds up to it.
+        """
+        seconds = number(seconds)
+        if seconds < 0:
+            raise EngineError("The time of a task cannot be negative.")
+        with self.lock:
+            task = self.get(name)
+            total = seconds - task.correction_time
+            task.set_manual_time(total)
+            self.persistence.mark_dirty(task.name, datetime.now().strftime("%Y-%m-%d"), total)
+            self.persistence.flush()
+            self.changed()
+            return self.snapshot(task)
+
+    def add_correction(self, name, date, seconds):
+        """
+        Add a correction row for a known task on any day.
+
+        Parameters:
+        - name (str): Task name (matched case-insensitively).
+        - date (str): Day the correction applies to (YYYY-MM-DD).
+        - seconds (int): Seconds to add (negative to subtract).
+
+        Returns:
+        - dict: Snapshot of the task if it is one of today's, else None.
+
+        Raises:
+        - EngineError: If the task is unknown or date is not a YYYY-MM-DD day.
+        """
+        seconds = int(number(seconds))
+        try:
+            date = datetime.strptime(date, "%Y-%m-%d").strftime("%Y-%m-%d")
+        except (TypeError, ValueError):
+            raise EngineError(f"Invalid date {date!r}, expected YYYY-MM-DD.") from None
+        with self.lock:
+            task_name = self.lookup_cache.find_task_name(name)
+            if task_name is None:
+                raise EngineError(f"Unknown task '{name}'.")
+            self.persistence.add_correction(task_name, date, seconds)
+            self.persistence.flush()
+            self.lookup_cache.add(task_name, date)
+
+            task = self.tasks.get(task_name)
+            if task is None or date != datetime.now().strftime("%Y-%m-%d"):
+                return None
+            task.correction_time += seconds
+            self.changed()
+            return self.snapshot(task)
+
+    def search(self, text, limit=50):
+        """Return up to limit known task names matching text (see lookup_cache.NameIndex)."""
+        with self.lock:
+            return self.lookup_cache.search(text, limit)
+
+    def find_task_name(self, name):
+        """Return the known spelling of a task name, matched case-insensitively, or None."""
+        with self.lock:
+            return self.lookup_cache.find_task_name(name)
+
+    def get_years(self):
+        """Return all years (YYYY) with tracked entries, sorted."""
+        with self.lock:
+            return self.lookup_cache.get_years()
+
+    def stats(self):
+        """Return the writer and write-behind queue counters."""
+        with self.lock:
+            return {"writer": self.db.stats(), "persistence": self.persistence.stats()}
@@ -0,0 +1,186 @@
+# engine_client.py
+#
+# Client side of the tracking daemon (see daemon.py). The protocol is one
+# compact JSON object per line over a Unix domain socket:
+#
+#     -> {"op":"start","name":"Email"}
+#     <- {"ok":true,"result":{"name":"Email","total":120.0,...}}
+#     <- {"ok":false,"error":"No task 'Email' today."}
+#
+# A connection stays open for any number of requests, so polling costs one
+# short round trip and no connection setup.
+
+import json
+import os
+import socket
+
+import db
+from engine import EngineError, TrackerEngine
+
+
+# Ops that change nothing, so a request whose reply was lost can be sent again
+READ_ONLY = {"info", "list", "changes", "search", "find", "years", "stats"}
+
+
+def socket_path():
+    """
+    Return the socket the daemon listens on.
+
+    Behavior:
+    - TIMELOGTRACKR_SOCKET if set, else '<database file without extension>.sock'.
+    """
+    return os.environ.get("TIMELOGTRACKR_SOCKET") or os.path.splitext(os.path.abspath(db.DB_PATH))[0] + ".sock"
+
+
+def encode(message):
+    """Return a message as one protocol line (bytes)."""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def decode(line):
+    """Return the message of one protocol line."""
+    return json.loads(line)
+
+
+class DaemonClient:
+    def __init__(self, path=None, timeout=5.0):
+        """
+        Initialize a client of the tracking daemon.
+
+        Parameters:
+        - path (str): Socket of the daemon (default is socket_path()).
+        - timeout (float): Seconds to wait for a reply (default is 5).
+
+        Behavior:
+        - Offers the same operations as engine.TrackerEngine, so the UI can
+          use either; the connection is opened on first use and reopened once
+          if the daemon dropped it.
+        """
+        self.path = path or socket_path()
+        self.timeout = timeout
+        self.sock = None
+        self.reader = None
+
+    def connect(self):
+        """Open the connection to the daemon."""
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        try:
+            self.sock.connect(self.path)
+        except OSError:
+            self.disconnect()
+            raise
+        self.reader = self.sock.makefile("rb")
+
+    def disconnect(self):
+        """Close the connection; the next call reconnects."""
+        if self.reader is not None:
+            self.reader.close()
+        if self.sock is not None:
+            self.sock.close()
+        self.sock = self.reader = None
+
+    def call(self, op, **params):
+        """
+        Send one request and return its result.
+
+        Raises:
+        - EngineError: If the daemon refused the request.
+        - ConnectionError: If the daemon cannot be reached, or the reply to a
+          request that changes state was lost.
+
+        Behavior:
+        - A request that could not be sent is sent once more on a new
+          connection. Once sent, only READ_ONLY requests are sent again, so
+          e.g. a toggle or a correction never runs twice.
+        """
+        request = encode(dict(params, op=op))
+        for attempt in range(2):
+            sent = False
+            try:
+                if self.sock is None:
+                    self.connect()
+                self.sock.sendall(request)
+                sent = True
+                line = self.reader.readline()
+                if not line:
+                    raise ConnectionError("daemon closed the connection")
+                break
+            except OSError as e:
+                self.disconnect()
+                if attempt or (sent and op not in READ_ONLY):
+                    raise ConnectionError(f"tracking daemon at {self.path} is not reachable: {e}") from e
+        response = decode(line)
+        if not response["ok"]:
+            raise EngineError(response["error"])
+        return response["result"]
+
+    def close(self):
+        """Disconnect; the daemon and its running tasks keep going."""
+        self.disconnect()
+
+    def info(self):
+        return self.call("info")
+
+    def list_tasks(self):
+        return self.call("list")
+
+    def changes(self, since=None):
+        return self.call("changes", since=since)
+
+    def add_task(self, name):
+        return self.call("add", name=name)
+
+    def start(self, name):
+        return self.call("start", name=name)
+
+    def pause(self, name):
+        return self.call("pause", name=name)
+
+    def toggle(self, name):
+        return self.call("toggle", name=name)
+
+    def pause_all(self):
+        return self.call("pause_all")
+
+    def set_time(self, name, seconds):
+        return self.call("set_time", name=name, seconds=seconds)
+
+    def add_correction(self, name, date, seconds):
+        return self.call("correct", name=name, date=date, seconds=seconds)
+
+    def search(self, text, limit=50):
+        return self.call("search", text=text, limit=limit)
+
+    def find_task_name(self, name):
+        return self.call("find", name=name)
+
+    def get_years(self):
+        return self.call("years")
+
+    def stats(self):
+        return self.call("stats")
+
+
+def connect_engine(path=None):
+    """
+    Return the daemon client if a daemon is running, else an in-process engine.
+
+    Parameters:
+    - path (str): Socket of the daemon (default is socket_path()).
+
+    Returns:
+    - DaemonClient or TrackerEngine: Either offers the same operations.
+
+    Behavior:
+    - Without a daemon (or on platforms without Unix sockets) the app owns
+      the database itself, as before, with periodic flushing started.
+    """
+    if hasattr(socket, "AF_UNIX"):
+        client = DaemonClient(path)
+        try:
+            client.info()
+            return client
+        except ConnectionError:
+            client.close()
+    return TrackerEngine().start_flushing()
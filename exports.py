@@ -0,0 +1,198 @@
+# exports.py
+
+import csv
+import json
+import os
+import random
+import string
+
+
+def format_time(seconds):
+    """
+    Format time from seconds to hh:mm:ss.
+
+    Parameters:
+    - seconds (int or float): Total seconds to format.
+
+    Returns:
+    - str: Time formatted as hh:mm:ss.
+    """
+    h, rest = divmod(int(seconds // 1), 3600)
+    m, s = divmod(rest, 60)
+    return f"{h:02}:{m:02}:{s:02}"
+
+
+def default_report_dir():
+    """Return the 'reports' folder under the current directory."""
+    return os.path.join(os.getcwd(), "reports")
+
+
+def report_path(period, extension, report_dir=None, suffix=""):
+    """
+    Build a unique report path like reports/report_2025_03_8OL83X.xlsx.
+
+    Parameters:
+    - period (str): Period label (e.g., '2025-03').
+    - extension (str): File extension without the dot.
+    - report_dir (str): Output folder (default is ./reports, created if missing).
+    - suffix (str): Optional suffix appended after the random part (e.g., '_daily').
+    """
+    # === 1. Generate unique filename ===
+    rand_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
+    filename = f"report_{period.replace('-', '_')}_{rand_str}{suffix}.{extension}"
+
+    # === 2. Create 'reports' folder if it doesn't exist ===
+    report_dir = report_dir or default_report_dir()
+    os.makedirs(report_dir, exist_ok=True)
+
+    return os.path.join(report_dir, filename)
+
+
+def summary_rows(rows, format_time=format_time):
+    """
+    Yield per-task summary rows: name, hh:mm:ss and share of the period in percent.
+
+    Parameters:
+    - rows (list): (name, total_seconds) tuples.
+    - format_time (function): Function to convert seconds to hh:mm:ss string.
+    """
+    total_time = sum(row[1] for row in rows)
+    for name, time in rows:
+        percent = (time / total_time) * 100
+        yield [name, format_time(time), f"{percent:.1f}"]
+
+
+SUMMARY_HEADER = ["Task Name", "Total Time", "Percentage"]
+
+
+def write_xlsx(path, sheets):
+    """
+    Stream one or more tables into an Excel file with openpyxl's write-only mode.
+
+    Parameters:
+    - path (str): Output file.
+    - sheets (list): (title, header, rows) tuples; rows can be any iterable.
+
+    Returns:
+    - int: Number of data rows written.
+
+    Notes:
+    - Write-only worksheets flush rows to disk as they are appended, so memory
+      use does not grow with the number of rows.
+    - openpyxl is imported on first use, so importing this module (e.g. for
+      format_time at startup) stays cheap.
+    """
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    count = 0
+    for title, header, rows in sheets:
+        ws = wb.create_sheet(title=title[:31])
+        ws.append(header)
+        for row in rows:
+            ws.append(list(row))
+            count += 1
+    wb.save(path)
+    return count
+
+
+def write_csv(path, header, rows):
+    """
+    Stream a table into a CSV file.
+
+    Parameters:
+    - path (str): Output file.
+    - header (list): Column names.
+    - rows (iterable): Row sequences.
+
+    Returns:
+    - int: Number of data rows written.
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return count
+
+
+def write_jsonl(path, header, rows):
+    """
+    Stream a table into a JSON Lines file, one object per row keyed by header.
+
+    Parameters:
+    - path (str): Output file.
+    - header (list): Column names.
+    - rows (iterable): Row sequences.
+
+    Returns:
+    - int: Number of data rows written.
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(header, row)), ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+# Table writers by format (see write_csv / write_jsonl)
+TABLE_SINKS = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+}
+
+
+def save_summary_workbook(rows, period, format_time=format_time, report_dir=None, detail=None, file_path=None):
+    """
+    Save a per-task summary (time and share of the period) to an Excel file.
+
+    Parameters:
+    - rows (list): (name, total_seconds) tuples.
+    - period (str): Period label used in the sheet title and filename (e.g., '2025-03').
+    - format_time (function): Function to convert seconds to hh:mm:ss string.
+    - report_dir (str): Output folder (default is ./reports, created if missing).
+    - detail (tuple): Optional (title, header, rows) detail sheet streamed after the summary.
+    - file_path (str): Output file (default is a new unique path from report_path).
+
+    Returns:
+    - str: Path of the saved workbook.
+    """
+    file_path = file_path or report_path(period, "xlsx", report_dir)
+
+    sheets = [(f"{period} Report", SUMMARY_HEADER, summary_rows(rows, format_time))]
+    if detail is not None:
+        sheets.append(detail)
+    write_xlsx(file_path, sheets)
+    return file_path
+
+
+def save_report_tables(rows, period, fmt, format_time=format_time, report_dir=None, detail=None):
+    """
+    Save a per-task summary, and optionally a detail table, as CSV or JSONL files.
+
+    Parameters:
+    - rows (list): (name, total_seconds) tuples.
+    - period (str): Period label used in the filename (e.g., '2025-03').
+    - fmt (str): 'csv' or 'jsonl'.
+    - format_time (function): Function to convert seconds to hh:mm:ss string.
+    - report_dir (str): Output folder (default is ./reports, created if missing).
+    - detail (tuple): Optional (title, header, rows) detail table, saved to its own file.
+
+    Returns:
+    - list: Paths of the saved files (summary first).
+    """
+    sink = TABLE_SINKS[fmt]
+    summary_path = report_path(period, fmt, report_dir)
+    sink(summary_path, SUMMARY_HEADER, summary_rows(rows, format_time))
+    paths = [summary_path]
+
+    if detail is not None:
+        title, header, detail_rows = detail
+        detail_path = summary_path[:-len(fmt) - 1] + f"_{title.lower()}.{fmt}"
+        sink(detail_path, header, detail_rows)
+        paths.append(detail_path)
+    return paths
@@ -0,0 +1,61 @@
+# idle.py
+
+import time
+
+
+class IdleMonitor:
+    def __init__(self, debounce=0.25):
+        """
+        Initialize an idle monitor driven by mouse and keyboard activity.
+
+        Parameters:
+        - debounce (float): Minimum seconds between two recorded activity
+          timestamps (default is 0.25).
+
+        Behavior:
+        - Input callbacks only compare and store a monotonic timestamp, so the
+          hundreds of mouse events per second pynput can deliver stay cheap.
+        - Idle time is the difference between now and the last activity, so
+          it does not drift when the Tk loop stalls.
+        """
+        self.debounce = debounce
+        self.last_activity = time.monotonic()
+        self.listeners = []
+
+    def on_activity(self, *args):
+        """Record user activity (pynput callback, runs on the listener threads)."""
+        now = time.monotonic()
+        if now - self.last_activity >= self.debounce:
+            self.last_activity = now
+
+    def reset(self):
+        """Restart the idle countdown from now."""
+        self.last_activity = time.monotonic()
+
+    def idle_seconds(self):
+        """Return seconds since the last recorded activity."""
+        return time.monotonic() - self.last_activity
+
+    def start(self):
+        """
+        Start listening to mouse moves, clicks, scrolls and key presses.
+
+        Behavior:
+        - pynput is imported here rather than at module level, so the app can
+          call this after its first paint.
+        """
+        from pynput import mouse, keyboard
+
+        self.listeners = [
+            mouse.Listener(on_move=self.on_activity, on_click=self.on_activity, on_scroll=self.on_activity),
+            keyboard.Listener(on_press=self.on_activity),
+        ]
+        for listener in self.listeners:
+            listener.daemon = True
+            listener.start()
+
+    def stop(self):
+        """Stop the input listeners."""
+        for listener in self.listeners:
+            listener.stop()
+        self.listeners = []
@@ -0,0 +1,377 @@
+# import_cli.py
+#
+# Bulk import of timesheet history exported from other trackers (CSV or JSONL).
+#
+# Usage:
+#     python import_cli.py history.csv
+#     python import_cli.py 2019.jsonl 2020.jsonl --db path/to/tasks.db
+#     python import_cli.py history.csv --dry-run
+#
+# Each record needs a task name, a date and the time tracked that day:
+#     name,date,seconds                 {"task": "Docs", "date": "2024-03-01", "duration": "1:30:00"}
+#     Docs,2024-03-01,5400
+# Accepted columns: name/task/task_name, date/day, seconds/total_time/duration.
+# Dates: YYYY-MM-DD (a time part is ignored), YYYY/MM/DD or DD.MM.YYYY.
+# Times: seconds, or h:mm[:ss].
+
+import argparse
+import csv
+import json
+import math
+import sqlite3
+import sys
+import time
+from datetime import date, datetime
+from itertools import islice
+
+import db
+
+NAME_COLUMNS = ("name", "task", "task_name")
+DATE_COLUMNS = ("date", "day")
+TIME_COLUMNS = ("seconds", "total_time", "duration")
+DATE_FORMATS = ("%Y/%m/%d", "%d.%m.%Y")
+
+# Invalid rows listed in the summary (the rest are only counted)
+MAX_ERRORS = 20
+
+
+class InvalidRow(ValueError):
+    """Raised for a record that cannot be imported."""
+
+
+def read_records(path, fmt=None):
+    """
+    Stream the records of an input file.
+
+    Parameters:
+    - path (str): CSV or JSONL file.
+    - fmt (str): 'csv' or 'jsonl' (default: from the file extension).
+
+    Yields:
+    - tuple: (line number, fields) where fields is the raw (name, date, time)
+      values, or an error message for a line that is not a JSON object.
+
+    Raises:
+    - InvalidRow: If a CSV header lacks a name, date or time column.
+    """
+    fmt = fmt or ("jsonl" if path.lower().endswith((".jsonl", ".json")) else "csv")
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        if fmt == "csv":
+            reader = csv.reader(f)
+            header = [column.strip().lower() for column in next(reader, [])]
+            indexes = [column_index(header, columns) for columns in (NAME_COLUMNS, DATE_COLUMNS, TIME_COLUMNS)]
+            if None in indexes:
+                raise InvalidRow(f"{path}: the header needs name, date and time columns")
+            width = max(indexes) + 1
+            for record in reader:
+                if len(record) < width:
+                    record = record + [None] * (width - len(record))
+                yield reader.line_num, tuple(record[index] for index in indexes)
+        else:
+            for number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    yield number, "invalid JSON"
+                    continue
+                if not isinstance(record, dict):
+                    yield number, "not a JSON object"
+                    continue
+                record = {str(key).lower(): value for key, value in record.items()}
+                yield number, (pick(record, NAME_COLUMNS), pick(record, DATE_COLUMNS), pick(record, TIME_COLUMNS))
+
+
+def column_index(header, columns):
+    """Return the position in header of the first of columns present, or None."""
+    for column in columns:
+        if column in header:
+            return header.index(column)
+    return None
+
+
+def normalize_record(fields):
+    """
+    Validate the raw fields of a record and return them as (name, date, seconds).
+
+    Raises:
+    - InvalidRow: If a field is missing or cannot be parsed.
+    """
+    if isinstance(fields, str):
+        raise InvalidRow(fields)
+    name, day, seconds = fields
+    name = " ".join(str(name or "").split())
+    if not name:
+        raise InvalidRow("missing task name")
+    return name, parse_date(day), parse_seconds(seconds)
+
+
+def pick(record, columns):
+    """Return the first non-empty value of record among columns, or None."""
+    for column in columns:
+        value = record.get(column)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def parse_date(value):
+    """Return value as a YYYY-MM-DD string (see DATE_FORMATS)."""
+    if value is None or value == "":
+        raise InvalidRow("missing date")
+    text = str(value).strip()
+    try:
+        return date.fromisoformat(text[:10]).isoformat()
+    except ValueError:
+        pass
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date().isoformat()
+        except ValueError:
+            pass
+    raise InvalidRow(f"invalid date {text!r}")
+
+
+def parse_seconds(value):
+    """Return value (seconds or h:mm[:ss]) as a whole, non-negative number of seconds."""
+    if value is None or value == "":
+        raise InvalidRow("missing time")
+    text = str(value).strip()
+    if text.isdigit():
+        return int(text)
+    try:
+        if ":" in text:
+            parts = [float(part) for part in text.split(":")]
+            if len(parts) == 2:
+                parts.append(0.0)
+            if len(parts) != 3:
+                raise ValueError
+            hours, minutes, secs = parts
+            seconds = hours * 3600 + minutes * 60 + secs
+        else:
+            seconds = float(text)
+    except ValueError:
+        raise InvalidRow(f"invalid time {text!r}") from None
+    if not math.isfinite(seconds) or seconds < 0:
+        raise InvalidRow(f"invalid time {text!r}")
+    return int(round(seconds))
+
+
+def chunks(rows, size):
+    """Yield lists of up to size items from an iterator."""
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_name_ids(cursor):
+    """
+    Return name_key -> task id for every known task name.
+
+    Imported names are matched on db.name_key, like the Add Task duplicate
+    check, so a name known in another case is reused.
+    """
+    cursor.execute("SELECT name_key, id FROM task_names WHERE name_key IS NOT NULL")
+    return dict(cursor.fetchall())
+
+
+def drop_task_indexes(cursor):
+    """
+    Drop the indexes and triggers of 'tasks'.
+
+    Returns:
+    - list: Their CREATE statements, to run again once the rows are in.
+    """
+    cursor.execute("""
+        SELECT type, name, sql FROM sqlite_master
+        WHERE tbl_name = 'tasks' AND type IN ('index', 'trigger') AND sql IS NOT NULL
+    """)
+    saved = cursor.fetchall()
+    for kind, name, _ in saved:
+        cursor.execute(f"DROP {kind.upper()} {name}")
+    return [sql for _, _, sql in saved]
+
+
+def apply_staged_totals(cursor):
+    """
+    Add the staged rows to the rollups and bump the data versions of their
+    months: what the 'tasks' triggers do row by row, as set-based statements.
+    """
+    for table, (key, expression) in db.ROLLUPS.items():
+        cursor.execute(f"""
+            INSERT INTO {table} ({key}, task_id, total_time)
+            SELECT {expression}, task_id, SUM(total_time) FROM temp.import_rows WHERE true
+            GROUP BY 1, 2
+            ON CONFLICT ({key}, task_id) DO UPDATE SET total_time = total_time + excluded.total_time
+        """)
+    cursor.execute("""
+        INSERT INTO data_versions (month, version)
+        SELECT DISTINCT substr(date, 1, 7), 1 FROM temp.import_rows WHERE true
+        ON CONFLICT (month) DO UPDATE SET version = version + 1
+    """)
+
+
+def import_files(conn, paths, fmt=None, chunk_size=50000, bulk_threshold=200000, strict=False, dry_run=False, progress=None):
+    """
+    Import daily task totals from CSV/JSONL files in a single transaction.
+
+    Parameters:
+    - conn (sqlite3.Connection): Connection opened with isolation_level=None,
+      on a database at the latest schema version.
+    - paths (list): Input files.
+    - fmt (str): 'csv' or 'jsonl' (default: from each file's extension).
+    - chunk_size (int): Rows staged per executemany call (default is 50000).
+    - bulk_threshold (int): From this many new rows, the indexes and triggers
+      of 'tasks' are dropped during the insert and rebuilt after (default is 200000).
+    - strict (bool): Abort on the first invalid record instead of skipping it.
+    - dry_run (bool): Roll back at the end (counts only).
+    - progress (function): Called with the stats dict after each chunk (optional).
+
+    Returns:
+    - dict: read, invalid, duplicates (repeated in the input), existing
+      (already in the database), archived (in a year sealed into the
+      archive), inserted, new_names, bulk, seconds,
+      rows_per_second and errors ((file, line, message), at most MAX_ERRORS).
+
+    Behavior:
+    - Records are streamed and staged chunk by chunk into a temporary table
+      keyed on (task, date), so memory stays bounded whatever the file size;
+      only the task name dictionary is held in Python.
+    - The first record of a (task, date) wins; a day that already has an
+      entry in the database is skipped, never merged.
+    - Records of sealed years are skipped: their history lives in the
+      archive (see archive.py) and would otherwise be counted twice.
+    - Either the whole import is committed or nothing is.
+    """
+    started = time.perf_counter()
+    stats = {"read": 0, "invalid": 0, "duplicates": 0, "existing": 0, "archived": 0, "inserted": 0, "new_names": 0, "bulk": False}
+    errors = []
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute("""
+            CREATE TEMP TABLE import_rows (
+                task_id INTEGER NOT NULL,
+                date TEXT NOT NULL,
+                total_time INTEGER NOT NULL,
+                PRIMARY KEY (task_id, date)
+            ) WITHOUT ROWID
+        """)
+        name_ids = load_name_ids(cursor)
+
+        def task_id(name):
+            key = db.name_key(name)
+            if key not in name_ids:
+                cursor.execute("INSERT INTO task_names (name, name_key) VALUES (?, ?)", (name, key))
+                name_ids[key] = cursor.lastrowid
+                stats["new_names"] += 1
+            return name_ids[key]
+
+        def rows():
+            for path in paths:
+                for number, fields in read_records(path, fmt):
+                    stats["read"] += 1
+                    try:
+                        name, day, seconds = normalize_record(fields)
+                    except InvalidRow as e:
+                        if strict:
+                            raise InvalidRow(f"{path}:{number}: {e}") from None
+                        stats["invalid"] += 1
+                        if len(errors) < MAX_ERRORS:
+                            errors.append((path, number, str(e)))
+                        continue
+                    yield task_id(name), day, seconds
+
+        staged = 0
+        for chunk in chunks(rows(), chunk_size):
+            cursor.executemany("INSERT OR IGNORE INTO temp.import_rows (task_id, date, total_time) VALUES (?, ?, ?)", chunk)
+            staged += cursor.rowcount
+            stats["duplicates"] += len(chunk) - cursor.rowcount
+            if progress is not None:
+                progress(dict(stats, seconds=time.perf_counter() - started))
+
+        cursor.execute("""
+            DELETE FROM temp.import_rows
+            WHERE EXISTS (
+                SELECT 1 FROM tasks t
+                WHERE t.task_id = import_rows.task_id AND t.date = import_rows.date AND t.status != 'correction'
+            )
+        """)
+        stats["existing"] = cursor.rowcount
+        cursor.execute("DELETE FROM temp.import_rows WHERE substr(date, 1, 4) IN (SELECT year FROM archived_years)")
+        stats["archived"] = cursor.rowcount
+        stats["inserted"] = staged - stats["existing"] - stats["archived"]
+
+        insert = """
+            INSERT INTO tasks (task_id, start_time, end_time, total_time, status, date)
+            SELECT task_id, NULL, NULL, total_time, 'paused', date FROM temp.import_rows
+            ORDER BY date, task_id
+        """
+        if stats["inserted"] >= bulk_threshold:
+            stats["bulk"] = True
+            schema = drop_task_indexes(cursor)
+            cursor.execute(insert)
+            apply_staged_totals(cursor)
+            for sql in schema:
+                cursor.execute(sql)
+        elif stats["inserted"]:
+            cursor.execute(insert)
+
+        cursor.execute("DROP TABLE temp.import_rows")
+        cursor.execute("ROLLBACK" if dry_run else "COMMIT")
+    except BaseException:
+        cursor.execute("ROLLBACK")
+        raise
+
+    seconds = time.perf_counter() - started
+    stats["seconds"] = seconds
+    stats["rows_per_second"] = stats["read"] / seconds if seconds else 0.0
+    stats["errors"] = errors
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import timesheet history from CSV or JSONL files.")
+    parser.add_argument("files", nargs="+", help="CSV or JSONL files to import.")
+    parser.add_argument("--db", default=db.DB_PATH, help="Database file (default is db.DB_PATH).")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default=None, help="Input format (default: from the file extension).")
+    parser.add_argument("--chunk-size", type=int, default=50000, help="Rows staged per batch (default is 50000).")
+    parser.add_argument("--bulk-threshold", type=int, default=200000, help="Rebuild the indexes after the insert from this many new rows (default is 200000).")
+    parser.add_argument("--strict", action="store_true", help="Abort on the first invalid record.")
+    parser.add_argument("--dry-run", action="store_true", help="Validate and count, then roll back.")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=10, isolation_level=None)
+    conn.execute("PRAGMA journal_mode=WAL;")
+    db.migrate(conn)
+
+    def progress(stats):
+        rate = stats["read"] / stats["seconds"] if stats["seconds"] else 0.0
+        print(f"{stats['read']:>12,} rows read  {rate:>10,.0f} rows/s", file=sys.stderr)
+
+    try:
+        stats = import_files(
+            conn, args.files, args.format, args.chunk_size, args.bulk_threshold, args.strict, args.dry_run, progress
+        )
+    except InvalidRow as e:
+        sys.exit(f"Import aborted, nothing written: {e}")
+    finally:
+        conn.close()
+
+    for path, number, message in stats["errors"]:
+        print(f"{path}:{number}: {message}")
+    mode = "bulk, indexes rebuilt" if stats["bulk"] else "incremental"
+    action = "would be imported (dry run)" if args.dry_run else "imported"
+    print(
+        f"{stats['inserted']:,} rows {action} ({mode}), {stats['existing']:,} already present, "
+        f"{stats['archived']:,} in archived years, "
+        f"{stats['duplicates']:,} duplicates, {stats['invalid']:,} invalid, {stats['new_names']:,} new tasks; "
+        f"{stats['read']:,} rows in {stats['seconds']:.3f}s ({stats['rows_per_second']:,.0f} rows/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+# lookup_cache.py
+
+import re
+from bisect import bisect_left, insort
+
+from db import name_key as fold
+
+WORD = re.compile(r"\w+")
+
+
+class LookupCache:
+    def __init__(self, cursor):
+        """
+        Initialize the cache of task names and tracked years used by the dialogs.
+
+        Parameters:
+        - cursor (sqlite3.Cursor): Cursor used to load the cache and check it is current.
+
+        Behavior:
+        - Names come from the 'task_names' dictionary (into a NameIndex) and years from the
+          monthly rollup and the archived years, so the load does not scan
+          the raw history.
+        - Writers of this process keep the cache current with add(); refresh()
+          reloads it after other processes (imports, archiving, another app)
+          added names, months or archived years.
+        """
+        self.cursor = cursor
+        self.load()
+
+    def load(self):
+        """Load the names and years, and remember the stamp they were loaded at."""
+        self.stamp = cache_stamp(self.cursor)
+        self.cursor.execute("SELECT name FROM task_names WHERE name_key IS NOT NULL ORDER BY id")
+        self.names = NameIndex(row[0] for row in self.cursor.fetchall())
+        self.cursor.execute("SELECT substr(month, 1, 4) FROM monthly_totals UNION SELECT year FROM archived_years ORDER BY 1")
+        self.years = [row[0] for row in self.cursor.fetchall()]
+
+    def refresh(self):
+        """
+        Reload the cache if the database gained names, months or archived years since it was loaded.
+
+        Returns:
+        - bool: True if the cache was reloaded.
+
+        Behavior:
+        - The check is three indexed lookups, cheap enough to run on every
+          periodic flush; ordinary timer writes do not trigger a reload.
+        """
+        if cache_stamp(self.cursor) == self.stamp:
+            return False
+        self.load()
+        return True
+
+    def add(self, name, date):
+        """
+        Record a task name and date that have just been written to the DB.
+
+        Parameters:
+        - name (str): Task name.
+        - date (str): Date of the entry (YYYY-MM-DD).
+        """
+        self.names.add(name)
+        add_sorted(self.years, date[:4])
+
+    def get_task_names(self):
+        """Return all known task names, sorted case-insensitively."""
+        return self.names.all()
+
+    def search(self, text, limit=50):
+        """Return up to limit task names matching text (see NameIndex.search)."""
+        return self.names.search(text, limit)
+
+    def find_task_name(self, name):
+        """Return the known spelling of a task name, matched case-insensitively, or None."""
+        return self.names.find(name)
+
+    def get_years(self):
+        """Return all years (YYYY) with tracked entries, sorted."""
+        return list(self.years)
+
+
+def cache_stamp(cursor):
+    """
+    Return what changes when names or years are added: the last task name id,
+    the number of months with data (data_versions rows are never deleted) and
+    the archived years.
+    """
+    cursor.execute("""
+        SELECT (SELECT MAX(id) FROM task_names),
+               (SELECT COUNT(*) FROM data_versions),
+               (SELECT COUNT(*) || ':' || IFNULL(MAX(sealed_at), '') FROM archived_years)
+    """)
+    return cursor.fetchone()
+
+
+def add_sorted(values, value):
+    """
+    Insert value into the sorted list values unless it is already present.
+    """
+    index = bisect_left(values, value)
+    if index == len(values) or values[index] != value:
+        insort(values, value, lo=index)
+
+
+class NameIndex:
+    def __init__(self, names=()):
+        """
+        Initialize a case-folded search index over task names.
+
+        Parameters:
+        - names (iterable): Names to index; names that fold to the same key
+          as an earlier one are skipped (the first spelling wins).
+
+        Behavior:
+        - Exact lookups go through a dict (O(1)).
+        - Prefix lookups bisect two sorted arrays, one of whole-name keys and
+          one of the words in each name, so a search costs O(log n) plus the
+          matches returned, not a pass over every name.
+        """
+        self.by_key = {}
+        self.keys = []
+        self.words = []
+        for name in names:
+            key = fold(name)
+            if key and key not in self.by_key:
+                self.by_key[key] = name
+                self.keys.append((key, name))
+                self.words.extend((word, name) for word in set(WORD.findall(key)))
+        self.keys.sort()
+        self.words.sort()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, name):
+        """Index a name unless a name with the same key is already indexed."""
+        key = fold(name)
+        if not key or key in self.by_key:
+            return
+        self.by_key[key] = name
+        insort(self.keys, (key, name))
+        for word in set(WORD.findall(key)):
+            insort(self.words, (word, name))
+
+    def find(self, name):
+        """Return the indexed spelling of name, matched case-insensitively, or None."""
+        return self.by_key.get(fold(name))
+
+    def all(self):
+        """Return every indexed name, sorted case-insensitively."""
+        return [name for _, name in self.keys]
+
+    def search(self, text, limit=50):
+        """
+        Return up to limit names matching text, best matches first.
+
+        Parameters:
+        - text (str): What the user typed.
+        - limit (int): Maximum number of names returned.
+
+        Behavior:
+        - Names starting with text come first, alphabetically; then names
+          having a word that starts with each word of text, in any order
+          (e.g. 'des pro' finds 'Project 19 - Design').
+        - Empty text returns the first names alphabetically.
+        """
+        key = fold(text)
+        lo, hi = prefix_range(self.keys, key)
+        results = [name for _, name in self.keys[lo:min(hi, lo + limit)]]
+        tokens = WORD.findall(key)
+        if len(results) >= limit or not tokens:
+            return results
+
+        # Walk the words of the most selective token, check the others per name
+        found = set(results)
+        lo, hi = min((prefix_range(self.words, token) for token in tokens), key=lambda bounds: bounds[1] - bounds[0])
+        for _, name in self.words[lo:hi]:
+            if name in found:
+                continue
+            words = WORD.findall(fold(name))
+            if all(any(word.startswith(token) for word in words) for token in tokens):
+                found.add(name)
+                results.append(name)
+                if len(results) >= limit:
+                    break
+        return results
+
+
+def prefix_range(entries, prefix):
+    """
+    Return the (lo, hi) slice of a sorted list of (key, name) entries whose key starts with prefix.
+    """
+    return bisect_left(entries, (prefix,)), bisect_left(entries, (prefix + "\U0010ffff",))
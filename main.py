@@ -1,48 +1,62 @@
 # main.py
 
+import startup  # first import: starts the cold-start clock
+
+import math
 import tkinter as tk
-from tkinter import messagebox, simpledialog, ttk
+from tkinter import messagebox, simpledialog
 from datetime import datetime
-from db import initialize_database, get_connection
-from task import Task
+from engine import EngineError
+from engine_client import connect_engine
+from task_model import Task
+from task_list import TaskListView
 from task import add_negative_time_button_handler
-from reports import open_monthly_report_dialog
-from pynput import mouse
+from exports import format_time
+from scheduler import Ticker
+from name_picker import NamePicker
+from idle import IdleMonitor
+
+startup.mark("imports")
 
 
 
 class TaskTrackerApp:
-    def __init__(self, root):
+    def __init__(self, root, engine):
         """
         Initialize the TaskTrackerApp.
 
         Parameters:
         - root (tk.Tk): The main Tkinter window.
+        - engine (TrackerEngine or DaemonClient): Tracking engine owning the
+          tasks and the DB, in this process or in the daemon (see connect_engine).
 
         Behavior:
-        - Connects to the SQLite database.
         - Initializes UI components and idle monitoring.
+        - Shows today's tasks from the engine and keeps them in sync.
         - Sets up task management and event handlers.
         """
         self.root = root
         self.root.title("Task Manager")
+        # Display copies of the engine's tasks, updated from its snapshots
         self.tasks = {}
-        self.task_names = set()
 
-        self.conn = get_connection()
-        self.cursor = self.conn.cursor()
+        self.engine = engine
+        self.version = None
+        self.sync_interval = 2  # segundos entre consultas ao motor
+        self.ticker = Ticker(self.root, self.update_timers)
 
         self.idle_timeout = 30 * 60  # 30 minutos em segundos
-        self.idle_counter = 0
         self.idle_detection_enabled = tk.BooleanVar(value=True)    # Pode ser mais tarde configurável
 
         self.build_header()
         self.start_inactivity_monitor()
 
-        self.task_list_frame = tk.Frame(self.root, bg="white")
-        self.task_list_frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=20)
+        self.task_list = TaskListView(self.root, self.format_time, self.toggle_task, self.edit_time)
+        self.task_list.frame.pack(fill=tk.BOTH, expand=True, pady=10, padx=20)
 
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+        self.root.bind_all("<Control-D>", self.open_debug_window)  # Ctrl+Shift+D
+        self.sync_loop()
 
     def build_header(self):
         """
@@ -72,7 +86,7 @@ class TaskTrackerApp:
             bg="#83df0e",
             fg="white",
             font=("Arial", 10, "bold"),
-            command=lambda: open_monthly_report_dialog(self.root, self.cursor, self.format_time)
+            command=self.open_report_dialog,
         )
         report_button.pack(side=tk.LEFT, padx=10)
 
@@ -83,7 +97,8 @@ class TaskTrackerApp:
             onvalue=True,
             offvalue=False,
             font=("Arial", 10),
-            bg="#f5f5f5"
+            bg="#f5f5f5",
+            command=self.reset_idle_timer
         )
         idle_toggle.pack(side=tk.LEFT, padx=10)
 
@@ -141,7 +156,7 @@ class TaskTrackerApp:
             bg="#e0a000",
             fg="white",
             font=("Arial", 10, "bold"),
-            command=lambda: add_negative_time_button_handler(self.root, self.cursor, self.tasks, self.format_time),
+            command=lambda: add_negative_time_button_handler(self.root, self.engine, self.format_time, self.apply, self.search_names),
         )
         add_negative_btn.pack(side=tk.LEFT, padx=10)
 
@@ -149,35 +164,70 @@ class TaskTrackerApp:
 
 
 
+    def open_report_dialog(self):
+        """
+        Open the monthly report dialog.
+
+        Behavior:
+        - The reports module is imported on first use rather than at startup.
+        - Reports read the engine's database file on their own connections.
+        - Shows an error instead if the daemon cannot be reached.
+        """
+        from reports import open_monthly_report_dialog
+
+        try:
+            db_path = self.engine.info()["db"]
+        except ConnectionError as e:
+            messagebox.showerror("Task Manager", str(e), parent=self.root)
+            return
+        open_monthly_report_dialog(self.root, None, self.format_time, self.engine, db_path)
+
+    def open_debug_window(self, event=None):
+        """
+        Open the hidden performance window (Ctrl+Shift+D).
+
+        Behavior:
+        - Shows the metrics module's timings together with the writer and
+          write-behind queue counters; imported on first use.
+        """
+        from debug_window import open_debug_window
+
+        open_debug_window(self.root, {
+            "writer": lambda: self.engine.stats()["writer"],
+            "persistence": lambda: self.engine.stats()["persistence"],
+        })
+
+    def on_first_paint(self):
+        """
+        Finish startup once the main window is on screen.
+
+        Behavior:
+        - Starts the idle listeners here, so loading pynput and spawning its
+          threads does not delay the first paint.
+        - Records time-to-first-paint (see startup.py).
+        """
+        self.idle_monitor.start()
+        startup.finish(self.root, self.on_closing)
+
     def add_task(self):
         """
         Open a modal to add a new task or select an existing one.
 
         Behavior:
-        - Queries existing task names from DB.
-        - Displays a dropdown and input field for user choice.
-        - Calls confirm_task_handler after selection.
+        - Matching task names are listed as the user types, from the engine's
+          name index (see NamePicker).
+        - Calls confirm_task_handler with the typed or chosen name.
         """
-        self.cursor.execute("SELECT DISTINCT name FROM tasks")
-        existing_tasks = [row[0] for row in self.cursor.fetchall()]
-
         modal = tk.Toplevel(self.root)
         modal.title("Select or Add Task")
-        modal.geometry("400x250")
+        modal.geometry("400x330")
         modal.config(bg="#f5f5f5")
 
-        label = tk.Label(modal, text="Select a task or add a new one:", font=("Arial", 12, "bold"), pady=10)
+        label = tk.Label(modal, text="Type to find a task or add a new one:", font=("Arial", 12, "bold"), pady=10)
         label.pack()
 
-        dropdown_var = tk.StringVar()
-        dropdown = ttk.Combobox(modal, textvariable=dropdown_var, values=existing_tasks, height=10, state="readonly", font=("Arial", 10))
-        dropdown.pack(pady=5, padx=20, fill=tk.X)
-
-        entry_label = tk.Label(modal, text="Or enter a new task name:", font=("Arial", 11), pady=5)
-        entry_label.pack()
-
-        task_entry = tk.Entry(modal, font=("Arial", 10), relief=tk.GROOVE, bd=2)
-        task_entry.pack(pady=5, padx=20, fill=tk.X)
+        picker = NamePicker(modal, self.search_names, on_pick=lambda name: self.confirm_task_handler(name, modal))
+        picker.pack(pady=5, padx=20, fill=tk.X)
 
         confirm = tk.Button(
             modal,
@@ -185,240 +235,204 @@ class TaskTrackerApp:
             font=("Arial", 11, "bold"),
             bg="#1980e6",
             fg="white",
-            command=lambda: self.confirm_task_handler(dropdown_var, task_entry, modal),
+            command=lambda: self.confirm_task_handler(picker.get(), modal),
         )
         confirm.pack(pady=15)
 
         for widget in modal.winfo_children():
-            if isinstance(widget, (tk.Label, tk.Entry, tk.Button)):
+            if isinstance(widget, (tk.Label, tk.Button)):
                 widget.config(bg="#f5f5f5")
 
         modal.transient(self.root)
         modal.grab_set()
+        picker.entry.focus_set()
         self.root.wait_window(modal)
 
-    def confirm_task_handler(self, dropdown_var, task_entry, modal):
+    def search_names(self, text, limit=50):
+        """
+        Return up to limit known task names matching text, for a NamePicker.
+
+        Behavior:
+        - If the daemon cannot be reached, shows the error and returns no
+          names, so the typed name can still be confirmed.
+        """
+        try:
+            return self.engine.search(text, limit)
+        except ConnectionError as e:
+            messagebox.showerror("Task Manager", str(e), parent=self.root)
+            return []
+
+    def confirm_task_handler(self, task_name, modal):
         """
         Handle task confirmation and initialization.
 
         Parameters:
-        - dropdown_var: tk.StringVar from dropdown selection.
-        - task_entry: Entry widget for new task name.
+        - task_name (str): Typed or chosen task name.
         - modal: Modal dialog window.
 
         Behavior:
-        - Inserts task in DB if it's new.
-        - Updates UI with task row and timer label.
+        - The engine adds the task (see TrackerEngine.add_task), using the
+          spelling of a known task that matches case-insensitively.
+        - Adds the task to the scrollable task list.
         """
-        task_name = dropdown_var.get() or task_entry.get()
-        if not task_name:
-            return
-        
-        # Check if the task already exists for today
-        self.cursor.execute(
-            "SELECT 1 FROM tasks WHERE LOWER(name) = ? AND date = ?",
-            (task_name, today)
-        )
-        existing = self.cursor.fetchone()
-
-        if existing:
-            messagebox.showinfo("Duplicate Task", f"Task '{task_name}' already exists for today.", parent=self.root)
-            modal.destroy()
+        if not " ".join(task_name.split()):
             return
-
-        self.task_names.add(task_name)
-        today = datetime.now().strftime("%Y-%m-%d")
-
-        self.cursor.execute(
-            "SELECT total_time FROM tasks WHERE name = ? AND date = ?",
-            (task_name, today),
-        )
-        row = self.cursor.fetchone()
-
-        if not row:
-            self.cursor.execute("""
-                INSERT INTO tasks (name, start_time, end_time, total_time, status, date)
-                VALUES (?, NULL, NULL, 0, 'paused', ?)
-            """, (task_name, today))
-            self.conn.commit()
-            total_time = 0
-        else:
-            total_time = row[0]
-
-        timer_label = self.create_task_row(task_name)
-        task = Task(name=task_name, total_time=total_time)
-        task.bind_ui(row_widget=timer_label.master, timer_label=timer_label)
-        self.tasks[task_name] = task
-        timer_label.config(text=self.format_time(total_time))
+        try:
+            self.apply(self.engine.add_task(task_name))
+        except EngineError as e:
+            messagebox.showinfo("Duplicate Task", str(e), parent=self.root)
+        except ConnectionError as e:
+            messagebox.showerror("Task Manager", str(e), parent=self.root)
         modal.destroy()
 
-    def create_task_row(self, task_name):
+    def apply(self, snapshot):
         """
-        Create a row in the UI for the given task.
+        Show the state of one task reported by the engine.
 
         Parameters:
-        - task_name (str): Name of the task.
-
-        Returns:
-        - tk.Label: Reference to the timer label.
+        - snapshot (dict): Task state (see TrackerEngine.snapshot).
 
         Behavior:
-        - Adds icons, labels, and a start/pause button for the task.
-        """
-        row = tk.Frame(self.task_list_frame, bg="white")
-        row.pack(fill=tk.X, pady=5)
-
-        clock_icon = tk.Label(row, text="🕒", font=("Arial", 14), bg="#e7edf3", width=3)
-        clock_icon.pack(side=tk.LEFT, padx=5)
-
-        details = tk.Frame(row, bg="white")
-        details.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
+        - Tasks added by another client are appended to the list.
+        - Registers running tasks with the shared ticker and refreshes the row.
+        """
+        task = self.tasks.get(snapshot["name"])
+        if task is None:
+            task = Task(name=snapshot["name"])
+            self.tasks[task.name] = task
+            self.task_list.add(task)
+        if task.sync(snapshot["total"], snapshot["correction"], snapshot["running"], snapshot["session"]):
+            if task.running:
+                self.ticker.register(task)
+            else:
+                self.ticker.unregister(task)
+        self.task_list.refresh(task)
 
-        label = tk.Label(details, text=task_name, font=("Arial", 12, "bold"), bg="white")
-        label.pack(anchor="w")
+    def sync_loop(self):
+        """
+        Periodically pick up changes made through the engine by any client.
 
-        timer = tk.Label(details, text="00:00:00", font=("Arial", 12, "bold"), fg="#4e7397", bg="white")
-        timer.pack(anchor="w")
-        timer.bind("<Button-1>", lambda e: self.edit_time(task_name, timer))
+        Behavior:
+        - Asks only for changes since the last seen version, so an idle engine
+          answers with a version number; timers tick locally in between.
+        - A daemon that cannot be reached is retried on the next round.
+        """
+        try:
+            changes = self.engine.changes(self.version)
+        except ConnectionError:
+            changes = None
+        if changes is not None:
+            for snapshot in changes["tasks"] or ():
+                self.apply(snapshot)
+            self.version = changes["version"]
+        self.root.after(int(self.sync_interval * 1000), self.sync_loop)
 
-        button = tk.Button(
-            row,
-            text="Start",
-            font=("Arial", 10, "bold"),
-            bg="#1980e6",
-            fg="white",
-            command=lambda: self.toggle_task(task_name, timer, button),
-        )
-        button.pack(side=tk.RIGHT, padx=10)
-        task = Task(name=task_name)
-        task.bind_ui(row_widget=row, timer_label=timer)
-        self.tasks[task_name] = task
+    def call_engine(self, operation, *args):
+        """
+        Run an engine operation and show the snapshots it returns.
 
-        return timer
+        Returns:
+        - The operation's result, or None if it failed (an error is shown).
+        """
+        try:
+            result = operation(*args)
+        except (EngineError, ConnectionError) as e:
+            messagebox.showerror("Task Manager", str(e), parent=self.root)
+            return None
+        for snapshot in result if isinstance(result, list) else [result]:
+            self.apply(snapshot)
+        return result
 
-    def toggle_task(self, task_name, timer_label, action_button):
+    def toggle_task(self, task):
         """
         Toggle the task's state (start, pause, continue).
 
         Parameters:
-        - task_name (str)
-        - timer_label (tk.Label)
-        - action_button (tk.Button)
+        - task (Task): Task whose button was clicked.
 
         Behavior:
-        - Switches between running/paused states.
-        - Calls appropriate handler based on button label.
+        - Pauses a running task and starts (or continues) any other.
         """
-        task = self.tasks[task_name]
-        if action_button["text"] == "Start":
-            self.start_task(task_name, timer_label, action_button)
-        elif action_button["text"] == "Pause":
-            self.pause_task(task_name, action_button)
-        elif action_button["text"] == "Continue":
-            self.start_task(task_name, timer_label, action_button)
+        if task.running:
+            self.pause_task(task)
+        else:
+            self.start_task(task)
 
-    def start_task(self, task_name, timer_label, action_button):
+    def start_task(self, task):
         """
         Start or resume a task.
 
         Parameters:
-        - task_name (str)
-        - timer_label (tk.Label)
-        - action_button (tk.Button)
+        - task (Task)
 
         Behavior:
-        - Starts internal timer and UI update.
-        - Changes button label to 'Pause'.
+        - The engine starts the timer and persists the session start.
+        - Registers the task with the shared ticker and refreshes its row
+          (button shows 'Pause').
         """
-        task = self.tasks[task_name]
-        if not task.running:
-            task.start()
-            action_button.config(text="Pause")
-            self.update_timer(task_name, timer_label)
+        self.call_engine(self.engine.start, task.name)
 
-    def pause_task(self, task_name, action_button):
+    def pause_task(self, task):
         """
         Pause the task.
 
         Parameters:
-        - task_name (str)
-        - action_button (tk.Button)
+        - task (Task)
 
         Behavior:
-        - Stops timer and updates time in DB.
-        - Changes button to 'Continue'.
+        - The engine stops the timer and logs the finished session in the DB.
+        - Refreshes the task's row (button shows 'Continue').
         """
-        task = self.tasks[task_name]
-        if task.running:
-            task.pause()
-            action_button.config(text="Continue")
-            self.cursor.execute(
-                "UPDATE tasks SET total_time = ? WHERE name = ?",
-                (task.total_time, task.name),
-            )
-            self.conn.commit()
+        self.call_engine(self.engine.pause, task.name)
 
-    def update_timer(self, task_name, timer_label):
+    def update_timers(self, running_tasks):
         """
-        Periodically update the task timer.
+        Update all running task timers on one shared tick.
 
         Parameters:
-        - task_name (str)
-        - timer_label (tk.Label)
+        - running_tasks (list): Task instances currently registered with the ticker.
 
         Behavior:
-        - Updates UI label and saves time to DB every second.
+        - Reconfigures a timer label only when its hh:mm:ss text changes.
+        - Nothing is written to the DB; sessions are logged once on pause.
         """
-        task = self.tasks[task_name]
-        if task.running:
-            total_time = task.get_elapsed_time()
-            timer_label.config(text=self.format_time(total_time))
-            today = datetime.now().strftime("%Y-%m-%d")
-            self.cursor.execute(
-                "UPDATE tasks SET total_time = ? WHERE name = ? AND date = ?",
-                (total_time, task.name, today)
-            )
-            self.conn.commit()
-            self.root.after(1000, lambda: self.update_timer(task_name, timer_label))
-
-    def edit_time(self, task_name, timer_label):
+        for task in running_tasks:
+            task.render(self.format_time)
+
+    def edit_time(self, task):
         """
         Allow manual editing of a task's time.
 
         Parameters:
-        - task_name (str)
-        - timer_label (tk.Label)
+        - task (Task): Task whose timer was clicked.
 
         Behavior:
         - Opens input dialog for hh:mm:ss format.
-        - Updates task time in UI and DB.
+        - The time typed is what the timer shows afterwards: today's
+          corrections are already counted in it (see TrackerEngine.set_time).
+        - Sets the time through the engine and updates the task's row.
         """
-        new_time = simpledialog.askstring("Edit Timer", "Enter the new time (hh:mm:ss):", parent=self.root)
+        new_time = simpledialog.askstring(
+            "Edit Timer", "Enter the new time for today, corrections included (hh:mm:ss):", parent=self.root
+        )
         if not new_time:
             return
         try:
             h, m, s = map(int, new_time.split(":"))
-            total = h * 3600 + m * 60 + s
-            self.tasks[task_name].set_manual_time(total)
-            timer_label.config(text=self.format_time(total))
-            today = datetime.now().strftime("%Y-%m-%d")
-            self.cursor.execute("UPDATE tasks SET total_time = ? WHERE name = ? AND date = ?", (total, task_name, today))
-            self.conn.commit()
         except Exception as e:
             messagebox.showerror("Invalid Input", str(e))
+            return
+        self.call_engine(self.engine.set_time, task.name, h * 3600 + m * 60 + s)
 
     def pause_all(self):
         """
         Pause all currently running tasks.
 
         Behavior:
-        - Iterates through tasks and pauses those that are active.
-        - Updates each task in DB.
+        - The engine pauses the active tasks and logs their sessions.
+        - Updates each task's row.
         """
-        for name, task in self.tasks.items():
-            if task.running:
-                action_button = task.row_widget.winfo_children()[-1]
-                self.pause_task(name, action_button)
+        self.call_engine(self.engine.pause_all)
 
     def format_time(self, seconds):
         """
@@ -430,65 +444,74 @@ class TaskTrackerApp:
         Returns:
         - str: Time formatted as hh:mm:ss.
         """
-        h = int(seconds // 3600)
-        m = int((seconds % 3600) // 60)
-        s = int(seconds % 60)
-        return f"{h:02}:{m:02}:{s:02}"
+        return format_time(seconds)
 
     def on_closing(self):
         """
         Handle application shutdown.
 
         Behavior:
-        - Closes DB connection.
+        - An in-process engine ends the sessions of running tasks, flushes
+          them and closes the DB; a daemon client only disconnects, and the
+          daemon keeps the tasks running.
         - Destroys Tkinter root window.
         """
-        self.conn.close()
+        self.engine.close()
+        self.idle_monitor.stop()
         self.root.destroy()
 
 
     # IDLE PAUSE METHODS
     def start_inactivity_monitor(self):
         """
-        Start monitoring mouse activity for idle detection.
+        Start monitoring mouse and keyboard activity for idle detection.
 
         Behavior:
-        - Uses pynput to listen to mouse movements.
+        - Uses an IdleMonitor (pynput listeners) that records the last activity time;
+          the listeners themselves are started by on_first_paint.
         - Starts a loop to check idle timeout.
         """
-        self.mouse_listener = mouse.Listener(on_move=self.reset_idle_timer)
-        self.mouse_listener.start()
+        self.idle_monitor = IdleMonitor()
+        self.idle_label_text = None
         self.check_idle_loop()
 
     def reset_idle_timer(self, *args):
         """
-        Reset idle counter when activity is detected.
+        Restart the idle countdown.
         """
-        self.idle_counter = 0
+        self.idle_monitor.reset()
 
     def check_idle_loop(self):
         """
         Check if user is idle and pause all tasks if threshold exceeded.
 
         Behavior:
-        - Updates idle timer label.
+        - Computes idle time from the last activity timestamp (monotonic clock).
+        - Updates idle timer label when its text changes.
         - Triggers pause_all() if idle timeout is reached.
+        - Wakes when the countdown reaches its next whole second, so the
+          pause happens within a fraction of a second of the timeout.
         """
+        delay = 1.0
         if self.idle_detection_enabled.get():
-            self.idle_counter += 1
-            time_remaining = max(0, self.idle_timeout - self.idle_counter)
-            self.idle_timer_label.config(text=f"Idle pause in: {self.format_time(time_remaining)}")
+            time_remaining = self.idle_timeout - self.idle_monitor.idle_seconds()
 
-            if self.idle_counter >= self.idle_timeout:
+            if time_remaining <= 0:
                 self.pause_all()
-                self.idle_counter = 0
+                self.idle_monitor.reset()
                 messagebox.showinfo("Idle", "All tasks have been paused due to inactivity.")
-        else:
-            self.idle_timer_label.config(text="Idle detection off")
+                time_remaining = self.idle_timeout
 
-        self.root.after(1000, self.check_idle_loop)
+            text = f"Idle pause in: {self.format_time(math.ceil(time_remaining))}"
+            delay = time_remaining % 1 or 1.0
+        else:
+            text = "Idle detection off"
 
+        if text != self.idle_label_text:
+            self.idle_timer_label.config(text=text)
+            self.idle_label_text = text
 
+        self.root.after(max(1, int(delay * 1000)), self.check_idle_loop)
 
     def set_idle_timeout(self):
         """
@@ -510,7 +533,13 @@ class TaskTrackerApp:
 
 
 if __name__ == "__main__":
-    initialize_database()
+    engine = connect_engine()
+    startup.mark("database")
     root = tk.Tk()
-    app = TaskTrackerApp(root)
+    app = TaskTrackerApp(root, engine)
+    startup.mark("window_built")
+    # First paint: the window is mapped and its pending redraws have run
+    root.wait_visibility()
+    root.update_idletasks()
+    app.on_first_paint()
     root.mainloop()
@@ -0,0 +1,187 @@
+# metrics.py
+#
+# Hot-path instrumentation: SQL statement timings, writer commits, Tk tick
+# lateness, timer rendering and report phases. Off by default; every probe is
+# guarded by the module-level `enabled` flag, so a disabled probe costs one
+# global lookup. Set TIMELOGTRACKR_METRICS=1 to collect from startup, or turn
+# collection on in the debug window (Ctrl+Shift+D, see debug_window.py).
+
+import os
+import sqlite3
+import threading
+import time
+
+enabled = os.environ.get("TIMELOGTRACKR_METRICS") == "1"
+
+# name -> [count, total seconds, max seconds]
+timers = {}
+# SQL text -> [count, total seconds, max seconds]
+statements = {}
+started_at = time.monotonic()
+lock = threading.Lock()
+
+
+def enable(flag=True):
+    """
+    Turn collection on or off.
+
+    Parameters:
+    - flag (bool): True to collect, False to stop (collected data is kept).
+    """
+    global enabled
+    enabled = flag
+
+
+def reset():
+    """Discard everything collected so far."""
+    global started_at
+    with lock:
+        timers.clear()
+        statements.clear()
+        started_at = time.monotonic()
+
+
+def record(name, seconds, table=timers):
+    """
+    Add one measurement to a named timer.
+
+    Parameters:
+    - name (str): Timer name, dotted by area (e.g. 'ui.format_time').
+    - seconds (float): Measured duration.
+
+    Behavior:
+    - Thread-safe: the writer thread records alongside the Tk thread.
+    """
+    with lock:
+        entry = table.get(name)
+        if entry is None:
+            table[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            if seconds > entry[2]:
+                entry[2] = seconds
+
+
+class timed:
+    """
+    Context manager timing a block into a named timer (no-op when disabled).
+
+    Usage:
+        with metrics.timed("report.query"):
+            ...
+    """
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = None
+
+    def __enter__(self):
+        if enabled:
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self.started is not None:
+            record(self.name, time.perf_counter() - self.started)
+        return False
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Cursor recording the time and count of every statement while collection is on.
+
+    Notes:
+    - Measures execute(), i.e. the time to the first row; rows fetched later
+      are not included.
+    """
+
+    def execute(self, sql, parameters=()):
+        if not enabled:
+            return super().execute(sql, parameters)
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            record(sql, time.perf_counter() - started, statements)
+
+    def executemany(self, sql, seq_of_parameters):
+        if not enabled:
+            return super().executemany(sql, seq_of_parameters)
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            record(sql, time.perf_counter() - started, statements)
+
+
+class TimedConnection(sqlite3.Connection):
+    """
+    Connection whose cursors are TimedCursors (pass as sqlite3.connect(factory=...)).
+
+    Notes:
+    - Statements run through the Connection.execute() shortcut are not timed;
+      the app always goes through cursors.
+    """
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+
+def summarize(table, uptime):
+    """
+    Return table as a list of dicts sorted by total time, slowest first.
+    """
+    with lock:
+        items = [(name, list(entry)) for name, entry in table.items()]
+    rows = []
+    for name, (count, total, longest) in items:
+        rows.append({
+            "name": " ".join(name.split()),
+            "count": count,
+            "per_second": round(count / uptime, 3) if uptime else 0.0,
+            "total_ms": round(total * 1000, 3),
+            "avg_ms": round(total / count * 1000, 3),
+            "max_ms": round(longest * 1000, 3),
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows
+
+
+def snapshot(sources=None):
+    """
+    Return everything collected, plus the counters of other components.
+
+    Parameters:
+    - sources (dict): name -> function returning a dict of counters
+      (e.g. {'writer': manager.stats, 'persistence': queue.stats}).
+
+    Returns:
+    - dict: enabled, uptime_s, timers, sql and one entry per source.
+    """
+    uptime = time.monotonic() - started_at
+    data = {
+        "enabled": enabled,
+        "uptime_s": round(uptime, 3),
+        "timers": summarize(timers, uptime),
+        "sql": summarize(statements, uptime),
+    }
+    for name, stats in (sources or {}).items():
+        data[name] = stats()
+    return data
+
+
+def dump(path, sources=None):
+    """
+    Write snapshot(sources) to path as JSON.
+
+    Returns:
+    - str: The path written.
+    """
+    import json
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(sources), f, indent=2)
+    return path
@@ -0,0 +1,87 @@
+# name_picker.py
+
+import tkinter as tk
+
+
+class NamePicker:
+    def __init__(self, parent, search, on_pick=None, limit=50, height=8, font=("Arial", 10)):
+        """
+        Initialize a task name entry with a live list of matching names.
+
+        Parameters:
+        - parent (tk.Widget): Container of the entry and the list.
+        - search (function): Called as search(text, limit), returns the matching names
+          (e.g. LookupCache.search).
+        - on_pick (function): Called with the name when a match is chosen with
+          Enter or a double click, or Enter is pressed in the entry (optional).
+        - limit (int): Maximum number of names listed (default is 50).
+        - height (int): Visible rows of the list (default is 8).
+        - font (tuple): Font of the entry and the list.
+
+        Behavior:
+        - The list is refilled from the index on every keystroke; only the
+          first matches are ever put into the widget, however many names exist.
+        - Down moves from the entry into the list; selecting a match copies it
+          into the entry.
+        """
+        self.search = search
+        self.on_pick = on_pick
+        self.limit = limit
+        self.filling = False
+
+        self.var = tk.StringVar()
+        self.entry = tk.Entry(parent, textvariable=self.var, font=font, relief=tk.GROOVE, bd=2)
+        self.listbox = tk.Listbox(parent, height=height, font=font, activestyle="none", exportselection=False)
+
+        self.var.trace_add("write", lambda *_: self.refresh())
+        self.entry.bind("<Down>", self.focus_list)
+        self.entry.bind("<Return>", lambda _: self.pick(self.get()))
+        self.listbox.bind("<<ListboxSelect>>", self.on_select)
+        self.listbox.bind("<Return>", lambda _: self.pick(self.get()))
+        self.listbox.bind("<Double-Button-1>", lambda _: self.pick(self.get()))
+        self.refresh()
+
+    def pack(self, **options):
+        """Pack the entry and, below it, the list of matches."""
+        self.entry.pack(**options)
+        self.listbox.pack(**options)
+
+    def get(self):
+        """Return the name in the entry, whitespace collapsed."""
+        return " ".join(self.var.get().split())
+
+    def refresh(self):
+        """Refill the list with the matches of the entry text."""
+        if self.filling:
+            return
+        self.listbox.delete(0, tk.END)
+        matches = self.search(self.var.get(), self.limit)
+        if matches:
+            self.listbox.insert(tk.END, *matches)
+
+    def focus_list(self, _event=None):
+        """Move the focus to the first match."""
+        if self.listbox.size():
+            self.listbox.focus_set()
+            self.listbox.selection_clear(0, tk.END)
+            self.listbox.selection_set(0)
+            self.listbox.activate(0)
+            self.on_select()
+        return "break"
+
+    def on_select(self, _event=None):
+        """Copy the selected match into the entry, keeping the list as it is."""
+        selection = self.listbox.curselection()
+        if not selection:
+            return
+        self.filling = True
+        try:
+            self.var.set(self.listbox.get(selection[0]))
+        finally:
+            self.filling = False
+
+    def pick(self, name):
+        """Hand a chosen name to on_pick."""
+        if name and self.on_pick is not None:
+            self.on_pick(name)
+        return "break"
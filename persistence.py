@@ -0,0 +1,313 @@
+# persistence.py
+
+import logging
+import sqlite3
+import threading
+import time
+
+from db import get_task_id
+
+log = logging.getLogger(__name__)
+
+
+class WriteBehindQueue:
+    def __init__(self, manager, interval=5.0):
+        """
+        Initialize a write-behind queue for task entries, totals, sessions and corrections.
+
+        Parameters:
+        - manager (db.ConnectionManager): Owner of the writer thread pending writes are sent to.
+        - interval (float): Seconds between periodic flushes (default is 5).
+
+        Behavior:
+        - Queues manual totals, session starts and session ends as events, in
+          order: a total sets the daily entry, a start stamps it as running
+          once, an end writes one interval row (added to the entry) and clears it.
+        - Repeated edits of the same entry with nothing queued in between
+          cost a single UPDATE (only the latest total is kept).
+        - Flushing hands everything to the writer thread as one job and
+          returns immediately; the caller never waits on SQLite.
+        - One flush is in flight at a time, so flushes commit in order; a flush
+          the database refused (e.g. locked by another process for longer than
+          the writer waits) is put back and retried by the next flush.
+        """
+        self.manager = manager
+        self.interval = interval
+        self.pending_entries = []
+        self.pending_corrections = []
+        self.pending_events = []
+        self.failed = None
+        # Set while no flush is waiting for the writer thread
+        self.idle = threading.Event()
+        self.idle.set()
+
+        self.marks = 0
+        self.flushes = 0
+        self.rows_flushed = 0
+        self.intervals_flushed = 0
+        self.last_latency = 0.0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+        self.failures = 0
+
+    def add_entry(self, name, date):
+        """
+        Queue the creation of a task's daily entry.
+
+        Parameters:
+        - name (str): Task name (added to 'task_names' if new).
+        - date (str): Date of the entry (YYYY-MM-DD).
+        """
+        self.pending_entries.append((name, date))
+
+    def mark_dirty(self, name, date, total_time):
+        """
+        Record the latest total of a task without touching the database.
+
+        Parameters:
+        - name (str): Task name.
+        - date (str): Date of the task entry (YYYY-MM-DD).
+        - total_time (float): Total tracked time in seconds.
+
+        Behavior:
+        - Written in order with the sessions: a session that ended before the
+          edit, even if still queued, is overwritten by it, not added to it.
+        """
+        last = self.pending_events[-1] if self.pending_events else None
+        if last is not None and last[:3] == ("total", name, date):
+            self.pending_events[-1] = ("total", name, date, total_time)
+        else:
+            self.pending_events.append(("total", name, date, total_time))
+        self.marks += 1
+
+    def add_correction(self, name, date, seconds):
+        """
+        Queue a correction row for a task.
+
+        Parameters:
+        - name (str): Task name.
+        - date (str): Date the correction applies to (YYYY-MM-DD).
+        - seconds (int): Seconds to add (negative to subtract).
+        """
+        self.pending_corrections.append((name, date, seconds))
+
+    def record_start(self, name, started_at):
+        """
+        Queue the start of a work session.
+
+        Parameters:
+        - name (str): Task name.
+        - started_at (datetime): Session start (wall clock).
+
+        Behavior:
+        - The daily entry is marked 'running' with its start timestamp, so an
+          open session can be recovered after a crash (see engine.TrackerEngine.restore_today).
+        """
+        self.pending_events.append((
+            "start",
+            name,
+            started_at.strftime("%Y-%m-%d"),
+            started_at.isoformat(timespec="seconds"),
+        ))
+
+    def record_interval(self, name, started_at, ended_at, seconds):
+        """
+        Queue a finished work session.
+
+        Parameters:
+        - name (str): Task name.
+        - started_at (datetime): Session start.
+        - ended_at (datetime): Session end.
+        - seconds (float): Tracked seconds of the session.
+
+        Behavior:
+        - The session is logged against the daily entry of the day it started.
+        """
+        self.pending_events.append((
+            "end",
+            name,
+            started_at.strftime("%Y-%m-%d"),
+            started_at.isoformat(timespec="seconds"),
+            ended_at.isoformat(timespec="seconds"),
+            seconds,
+        ))
+
+    def flush(self):
+        """
+        Send every pending write to the writer thread as one transaction.
+
+        Returns:
+        - concurrent.futures.Future: Resolves to (rows, intervals, seconds) once
+          committed, or None when nothing was sent (nothing pending, or the
+          previous flush is still in flight; its successor sends the writes).
+
+        Behavior:
+        - Entries are written first; manual totals and session starts and
+          ends are then applied in the order they were queued, so a session
+          that ended after an edit is added on top of the edited total and
+          one that ended before it is not.
+        - Writes of a failed flush go before everything queued since.
+        - Correction rows are never overwritten, only the daily entry is.
+        """
+        if not self.idle.is_set():
+            return None
+        if self.failed is not None:
+            entries, corrections, events = self.failed
+            self.failed = None
+            self.pending_entries = entries + self.pending_entries
+            self.pending_corrections = corrections + self.pending_corrections
+            self.pending_events = events + self.pending_events
+        if not self.has_pending():
+            return None
+
+        writes = (self.pending_entries, self.pending_corrections, self.pending_events)
+        self.pending_entries = []
+        self.pending_corrections = []
+        self.pending_events = []
+
+        self.idle.clear()
+        future = self.manager.submit(write_pending, *writes)
+        future.add_done_callback(lambda future: self.record_flush(future, writes))
+        return future
+
+    def has_pending(self):
+        """Return True if writes are waiting to be flushed."""
+        return bool(self.pending_entries or self.pending_corrections or self.pending_events or self.failed)
+
+    def drain(self, attempts=3):
+        """
+        Flush and wait until every pending write is committed (e.g. at shutdown).
+
+        Parameters:
+        - attempts (int): Flushes tried before the remaining writes are given up (default is 3).
+
+        Returns:
+        - bool: True if nothing is left pending.
+        """
+        for _ in range(attempts):
+            self.idle.wait()
+            if not self.has_pending():
+                return True
+            self.flush()
+        self.idle.wait()
+        if self.has_pending():
+            log.error("giving up %d pending writes after %d failed flushes", self.stats()["pending"], attempts)
+            return False
+        return True
+
+    def record_flush(self, future, writes):
+        """
+        Update the flush counters once the writer thread has committed a flush.
+
+        Behavior:
+        - A flush that failed on the database (busy, locked, I/O) is kept in
+          'failed' and sent again by the next flush; a flush whose writes
+          themselves failed would fail again and is dropped. Both are logged.
+        """
+        try:
+            error = future.exception()
+            if error is not None:
+                self.failures += 1
+                if isinstance(error, sqlite3.OperationalError):
+                    log.warning("flush failed, retrying with the next flush: %s", error)
+                    self.failed = writes
+                else:
+                    log.error("flush failed, %d writes dropped: %r", sum(map(len, writes)), error)
+                return
+            self.record_latency(*future.result())
+        finally:
+            self.idle.set()
+
+    def record_latency(self, rows, intervals, latency):
+        """Add a committed flush to the counters."""
+        self.flushes += 1
+        self.rows_flushed += rows
+        self.intervals_flushed += intervals
+        self.last_latency = latency
+        self.max_latency = max(self.max_latency, latency)
+        self.total_latency += latency
+
+    def stats(self):
+        """
+        Return flush counters and latencies.
+
+        Returns:
+        - dict: marks (manual totals queued), flushes (commits actually issued),
+          failures (flushes the writer could not commit), rows_flushed,
+          intervals_flushed, pending and latencies in ms.
+        """
+        pending = len(self.pending_entries) + len(self.pending_corrections) + len(self.pending_events)
+        if self.failed is not None:
+            pending += sum(map(len, self.failed))
+        return {
+            "marks": self.marks,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "rows_flushed": self.rows_flushed,
+            "intervals_flushed": self.intervals_flushed,
+            "pending": pending,
+            "last_latency_ms": self.last_latency * 1000,
+            "max_latency_ms": self.max_latency * 1000,
+            "avg_latency_ms": (self.total_latency / self.flushes * 1000) if self.flushes else 0.0,
+        }
+
+
+def write_pending(cursor, entries, corrections, events):
+    """
+    Writer-thread job applying one flush of the write-behind queue.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): Writer cursor inside the batch transaction.
+    - entries (list): (name, date) daily entries to create.
+    - corrections (list): (name, date, seconds) correction rows.
+    - events (list): ('total', name, date, total_time), ('start', name, date, started_at)
+      and ('end', name, date, started_at, ended_at, seconds) events, in order.
+
+    Returns:
+    - tuple: (rows written, intervals written, seconds spent).
+    """
+    started = time.perf_counter()
+    task_ids = {}
+
+    def task_id(name):
+        if name not in task_ids:
+            task_ids[name] = get_task_id(cursor, name)
+        return task_ids[name]
+
+    for name, date in entries:
+        cursor.execute("""
+            INSERT INTO tasks (task_id, start_time, end_time, total_time, status, date)
+            SELECT ?1, NULL, NULL, 0, 'paused', ?2
+            WHERE NOT EXISTS (SELECT 1 FROM tasks WHERE task_id = ?1 AND date = ?2 AND status != 'correction')
+        """, (task_id(name), date))
+    cursor.executemany(
+        "INSERT INTO tasks (task_id, start_time, end_time, total_time, status, date) VALUES (?, NULL, NULL, ?, 'correction', ?)",
+        [(task_id(name), seconds, date) for name, date, seconds in corrections],
+    )
+
+    intervals = 0
+    for kind, name, date, value, *end in events:
+        if kind == "total":
+            cursor.execute(
+                "UPDATE tasks SET total_time = ? WHERE task_id = ? AND date = ? AND status != 'correction'",
+                (value, task_id(name), date),
+            )
+        elif kind == "start":
+            cursor.execute(
+                "UPDATE tasks SET status = 'running', start_time = ? WHERE task_id = ? AND date = ? AND status != 'correction'",
+                (value, task_id(name), date),
+            )
+        else:
+            ended_at, seconds = end
+            cursor.execute(
+                "INSERT INTO intervals (task_id, date, started_at, ended_at, seconds) VALUES (?, ?, ?, ?, ?)",
+                (task_id(name), date, value, ended_at, seconds),
+            )
+            cursor.execute(
+                "UPDATE tasks SET status = 'paused', start_time = NULL WHERE task_id = ? AND date = ? AND status = 'running'",
+                (task_id(name), date),
+            )
+            intervals += 1
+
+    rows = len(entries) + len(corrections) + len(events)
+    return rows, intervals, time.perf_counter() - started
@@ -0,0 +1,130 @@
+# report_cache.py
+
+import hashlib
+import os
+import re
+import time
+
+from db import get_data_version
+from exports import default_report_dir
+
+# Bump when the layout of generated reports changes, so older cached files are not reused
+REPORT_FORMAT = 1
+
+# Cached files: report_<period>_<kind>_<12 hex digits>.<ext>; other files in the folder are never touched
+CACHED_NAME = re.compile(r"^report_.+_[0-9a-f]{12}\.[a-z]+$")
+
+
+class ReportCache:
+    def __init__(self, report_dir=None, max_bytes=200 * 1024 * 1024, max_age_days=90):
+        """
+        Initialize a content-addressed cache of generated report files.
+
+        Parameters:
+        - report_dir (str): Folder holding the reports (default is ./reports).
+        - max_bytes (int): Total size of cached files kept (default is 200 MB).
+        - max_age_days (float): Cached files unused for longer are deleted (default is 90).
+
+        Behavior:
+        - A report's file name is derived from (database, period, report kind,
+          format, data version of the period). The data version changes with
+          any write or correction dated in the period (db.get_data_version),
+          so an existing file is always up to date and is simply reused.
+        - Reusing a file refreshes its modification time; eviction removes the
+          least recently used files first.
+        """
+        self.report_dir = report_dir or default_report_dir()
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+
+    def path_for(self, cursor, period, kind, start, end, extension):
+        """
+        Return the cache path of a report.
+
+        Parameters:
+        - cursor (sqlite3.Cursor): Cursor to access the database.
+        - period (str): Period label (e.g., '2025-03').
+        - kind (str): Report kind and options (e.g., 'monthly-daily').
+        - start (str): First day included (YYYY-MM-DD).
+        - end (str): First day excluded (YYYY-MM-DD).
+        - extension (str): File extension without the dot.
+        """
+        database = cursor.execute("PRAGMA database_list").fetchone()[2]
+        version = get_data_version(cursor, start, end)
+        key = f"{REPORT_FORMAT}|{database}|{period}|{kind}|{start}|{end}|{version}"
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:12]
+        filename = f"report_{period.replace('-', '_')}_{kind}_{digest}.{extension}"
+        return os.path.join(self.report_dir, filename)
+
+    def get(self, path):
+        """
+        Return True if the report at path is cached, marking it as recently used.
+        """
+        if os.path.exists(path):
+            os.utime(path)
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def build(self, path, write):
+        """
+        Generate a report into the cache.
+
+        Parameters:
+        - path (str): Cache path from path_for().
+        - write (function): Called with a temporary path to write the report to.
+
+        Returns:
+        - str: path.
+
+        Behavior:
+        - The file is renamed into place once complete, so an interrupted
+          or cancelled export never leaves a partial file that would be
+          reused; then stale entries are evicted.
+        """
+        os.makedirs(self.report_dir, exist_ok=True)
+        root, extension = os.path.splitext(path)
+        temp_path = f"{root}.partial{extension}"
+        try:
+            write(temp_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        os.replace(temp_path, path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """
+        Delete cached files older than max_age, then the least recently used
+        ones until the cache fits in max_bytes.
+
+        Parameters:
+        - keep (str): Path never deleted (the report just generated).
+
+        Returns:
+        - int: Number of files deleted.
+        """
+        entries = []
+        for entry in os.scandir(self.report_dir):
+            if entry.is_file() and CACHED_NAME.match(entry.name):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for mtime, size, path in entries:
+            if path == keep:
+                continue
+            if now - mtime <= self.max_age and total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+            deleted += 1
+        return deleted
@@ -0,0 +1,167 @@
+# report_cli.py
+#
+# Headless batch generation of monthly reports (no Tk / display needed).
+#
+# Usage:
+#     python report_cli.py --years 2023 2024 --workers 4
+#     python report_cli.py --years 2025 --months 1 2 3 --db path/to/tasks.db --out reports
+#     python report_cli.py --years 2024 --detail intervals --format jsonl
+#     python report_cli.py --years 2020 2021 2022 2023 2024 --trend week --top 10 --window 4
+
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import db
+from exports import save_summary_workbook, save_report_tables, default_report_dir
+from report_queries import month_range, year_range, iter_detail
+from analytics import load_history
+
+# Read-only connection of the current worker process (see init_worker)
+worker_conn = None
+
+
+def init_worker(db_path):
+    """
+    Open the read-only connection used by every job of this worker process.
+
+    Parameters:
+    - db_path (str): Database file.
+    """
+    global worker_conn
+    worker_conn = db.get_read_connection(db_path)
+
+
+def run_month_job(year, month, report_dir, fmt="xlsx", detail=None):
+    """
+    Generate the report of one month in a worker process.
+
+    Parameters:
+    - year (int): Year of the report.
+    - month (int): Month of the report (1-12).
+    - report_dir (str): Output folder.
+    - fmt (str): 'xlsx', 'csv' or 'jsonl'.
+    - detail (str): Optional detail table, 'Daily' or 'Intervals'.
+
+    Returns:
+    - tuple: (period, task count, file path or None if nothing was tracked, seconds taken).
+    """
+    started = time.perf_counter()
+    period = f"{year:04}-{month:02}"
+    start, end = month_range(year, month)
+    rows = load_history(worker_conn.cursor(), start, end, "month").task_totals()
+
+    file_path = None
+    if rows and sum(row[1] for row in rows) != 0:
+        detail_table = iter_detail(worker_conn.cursor(), detail, start, end) if detail else None
+        if fmt == "xlsx":
+            file_path = save_summary_workbook(rows, period, report_dir=report_dir, detail=detail_table)
+        else:
+            file_path = ", ".join(save_report_tables(rows, period, fmt, report_dir=report_dir, detail=detail_table))
+    return period, len(rows), file_path, time.perf_counter() - started
+
+
+def generate_reports(db_path, years, months, report_dir, workers=None, fmt="xlsx", detail=None):
+    """
+    Generate the monthly reports of every (year, month) combination in parallel.
+
+    Parameters:
+    - db_path (str): Database file.
+    - years (list): Years to report on.
+    - months (list): Months (1-12) to report on for each year.
+    - report_dir (str): Output folder.
+    - workers (int): Number of worker processes (default is one per CPU).
+    - fmt (str): 'xlsx', 'csv' or 'jsonl'.
+    - detail (str): Optional detail table, 'Daily' or 'Intervals'.
+
+    Returns:
+    - list: Job results as returned by run_month_job, in completion order.
+
+    Behavior:
+    - Prints one timing line per job as it completes.
+    """
+    os.makedirs(report_dir, exist_ok=True)
+    jobs = [(year, month) for year in years for month in months]
+    results = []
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(db_path,)) as pool:
+        futures = [pool.submit(run_month_job, year, month, report_dir, fmt, detail) for year, month in jobs]
+        for future in as_completed(futures):
+            period, task_count, file_path, seconds = future.result()
+            target = file_path or "no time tracked, skipped"
+            print(f"{period}  {task_count:>5} tasks  {seconds:8.3f}s  {target}")
+            results.append((period, task_count, file_path, seconds))
+    return results
+
+
+def run_trend_job(db_path, years, report_dir, fmt="xlsx", period="week", top=None, window=None):
+    """
+    Generate one trend report (per-task totals per week or month) spanning years.
+
+    Parameters:
+    - db_path (str): Database file.
+    - years (list): Years covered (from the first to the last, inclusive).
+    - report_dir (str): Output folder.
+    - fmt (str): 'xlsx', 'csv' or 'jsonl'.
+    - period (str): 'week' or 'month'.
+    - top (int): Keep the top tasks and group the rest as 'Other' (optional).
+    - window (int): Add a rolling average of the total over this many periods (optional).
+
+    Returns:
+    - tuple: (label, task count, file path or None if nothing was tracked, seconds taken).
+
+    Behavior:
+    - The whole span is loaded once into the analytics engine; every period
+      is then a vectorized sum, not a query.
+    """
+    started = time.perf_counter()
+    label = f"{min(years)}-{max(years)}_{period}"
+    start, _ = year_range(min(years))
+    _, end = year_range(max(years))
+    conn = db.get_read_connection(db_path)
+    history = load_history(conn.cursor(), start, end, "month" if period == "month" else "day")
+    conn.close()
+
+    rows = history.task_totals()
+    file_path = None
+    if rows and sum(row[1] for row in rows) != 0:
+        table = history.trend_table(period, top, window)
+        if fmt == "xlsx":
+            file_path = save_summary_workbook(rows, label, report_dir=report_dir, detail=table)
+        else:
+            file_path = ", ".join(save_report_tables(rows, label, fmt, report_dir=report_dir, detail=table))
+    return label, len(rows), file_path, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate monthly Excel reports without the GUI.")
+    parser.add_argument("--years", type=int, nargs="+", required=True, help="Years to report on.")
+    parser.add_argument("--months", type=int, nargs="+", default=list(range(1, 13)), help="Months (1-12), default all.")
+    parser.add_argument("--db", default=db.DB_PATH, help="Database file (default is db.DB_PATH).")
+    parser.add_argument("--out", default=default_report_dir(), help="Output folder (default is ./reports).")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default is one per CPU).")
+    parser.add_argument("--format", choices=["xlsx", "csv", "jsonl"], default="xlsx", help="Output format (default is xlsx).")
+    parser.add_argument("--detail", choices=["daily", "intervals"], default=None, help="Add a per-day or per-session detail table.")
+    parser.add_argument("--trend", choices=["week", "month"], default=None, help="Write one per-week or per-month trend report over all --years instead.")
+    parser.add_argument("--top", type=int, default=None, help="Trend: keep the top N tasks, group the rest as 'Other'.")
+    parser.add_argument("--window", type=int, default=None, help="Trend: add a rolling average over N periods.")
+    args = parser.parse_args()
+
+    if args.trend:
+        os.makedirs(args.out, exist_ok=True)
+        label, task_count, file_path, seconds = run_trend_job(
+            args.db, args.years, args.out, args.format, args.trend, args.top, args.window
+        )
+        print(f"{label}  {task_count:>5} tasks  {seconds:8.3f}s  {file_path or 'no time tracked, skipped'}")
+        return
+
+    detail = args.detail.capitalize() if args.detail else None
+    started = time.perf_counter()
+    results = generate_reports(args.db, args.years, args.months, args.out, args.workers, args.format, detail)
+    written = sum(1 for result in results if result[2])
+    print(f"{written} of {len(results)} reports written to {args.out} in {time.perf_counter() - started:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# report_queries.py
+
+from datetime import date, timedelta
+
+
+def day_range(day):
+    """
+    Return the half-open date range covering a single day.
+
+    Parameters:
+    - day (datetime.date): The day.
+
+    Returns:
+    - tuple: (start, end) as YYYY-MM-DD strings, end exclusive.
+    """
+    return day.isoformat(), (day + timedelta(days=1)).isoformat()
+
+
+def week_range(day):
+    """
+    Return the half-open date range of the ISO week (Monday to Sunday) containing day.
+
+    Parameters:
+    - day (datetime.date): Any day of the week.
+    """
+    monday = day - timedelta(days=day.weekday())
+    return monday.isoformat(), (monday + timedelta(days=7)).isoformat()
+
+
+def month_range(year, month):
+    """
+    Return the half-open date range of a month.
+
+    Parameters:
+    - year (int or str): Year in YYYY format.
+    - month (int or str): Month number (1-12 or 'MM').
+    """
+    year, month = int(year), int(month)
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start.isoformat(), end.isoformat()
+
+
+def quarter_range(year, quarter):
+    """
+    Return the half-open date range of a quarter.
+
+    Parameters:
+    - year (int or str): Year in YYYY format.
+    - quarter (int): Quarter number (1-4).
+    """
+    first_month = (int(quarter) - 1) * 3 + 1
+    start, _ = month_range(year, first_month)
+    _, end = month_range(year, first_month + 2)
+    return start, end
+
+
+def year_range(year):
+    """
+    Return the half-open date range of a year.
+
+    Parameters:
+    - year (int or str): Year in YYYY format.
+    """
+    return f"{int(year):04}-01-01", f"{int(year) + 1:04}-01-01"
+
+
+def iter_query(cursor, sql, params=(), batch_size=1000):
+    """
+    Yield the rows of a query in batches, without loading the whole result.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): Cursor used to run the query.
+    - sql (str): Query to run.
+    - params (tuple): Query parameters.
+    - batch_size (int): Rows fetched per round trip.
+    """
+    cursor.execute(sql, params)
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        yield from batch
+
+
+DAILY_HEADER = ["Date", "Task Name", "Seconds"]
+
+# Detail tables read from SQLite: title -> (header, query over a half-open date range)
+DETAIL_QUERIES = {
+    "Intervals": (
+        ["Date", "Task Name", "Started At", "Ended At", "Seconds"],
+        "SELECT i.date, n.name, i.started_at, i.ended_at, i.seconds FROM intervals i JOIN task_names n ON n.id = i.task_id "
+        "WHERE i.date >= ? AND i.date < ? ORDER BY i.date, i.id",
+    ),
+}
+
+
+def iter_detail(cursor, kind, start, end):
+    """
+    Build a streamed detail table for a half-open date range.
+
+    Parameters:
+    - cursor (sqlite3.Cursor): Cursor used to run the query (not shared while iterating).
+    - kind (str): 'Daily' (per task per day) or 'Intervals' (per work session).
+    - start (str): First day included (YYYY-MM-DD).
+    - end (str): First day excluded (YYYY-MM-DD).
+
+    Returns:
+    - tuple: (title, header, rows generator), as accepted by the exports writers.
+
+    Notes:
+    - 'Daily' goes through analytics.load_history, so archived years are
+      included; work sessions are never archived and come from SQLite.
+    """
+    if kind == "Daily":
+        from analytics import load_history
+
+        return kind, DAILY_HEADER, load_history(cursor, start, end).daily_rows()
+    header, sql = DETAIL_QUERIES[kind]
+    return kind, header, iter_query(cursor, sql, (start, end))
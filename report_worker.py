@@ -0,0 +1,117 @@
+# report_worker.py
+
+import queue
+import threading
+
+
+class JobCancelled(Exception):
+    """Raised inside a background job once cancel() has been called."""
+
+
+class BackgroundJob:
+    def __init__(self, root, work, on_done, on_error=None, on_progress=None, on_cancelled=None, poll_ms=50):
+        """
+        Initialize a job that runs off the Tk thread and reports back to it.
+
+        Parameters:
+        - root (tk.Misc): Widget used to poll for results with after().
+        - work (function): Called as work(job) on the worker thread; its
+          return value is passed to on_done. Calls job.progress() to report
+          progress, which also raises JobCancelled once the job is cancelled.
+        - on_done (function): Called with the result, on the Tk thread.
+        - on_error (function): Called with the exception, on the Tk thread (optional).
+        - on_progress (function): Called with (fraction 0-1, message), on the Tk thread (optional).
+        - on_cancelled (function): Called without arguments once a cancelled job has stopped (optional).
+        - poll_ms (int): Interval of the Tk-side queue polling (default is 50).
+
+        Behavior:
+        - Tk is single-threaded: the worker never touches widgets, it only puts
+          events on a queue that the Tk loop drains with after(). Timers and
+          the idle countdown keep running while the job works.
+        - Work that needs the database must open its own connection on the
+          worker thread (SQLite connections belong to one thread).
+        """
+        self.root = root
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancelled = on_cancelled
+        self.poll_ms = poll_ms
+        self.events = queue.Queue()
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="report-job", daemon=True)
+        self.finished = False
+
+    def start(self):
+        """Start the worker thread and the Tk-side polling."""
+        self.thread.start()
+        self.root.after(self.poll_ms, self.poll)
+        return self
+
+    def cancel(self):
+        """Ask the job to stop at its next progress() call."""
+        self.cancelled.set()
+
+    def progress(self, fraction, message=""):
+        """
+        Report progress from the worker thread.
+
+        Parameters:
+        - fraction (float): Share of the work done (0-1).
+        - message (str): Short status text.
+
+        Raises:
+        - JobCancelled: If cancel() has been called.
+        """
+        if self.cancelled.is_set():
+            raise JobCancelled()
+        self.events.put(("progress", (fraction, message)))
+
+    def track(self, rows, count, start, end, every=500):
+        """
+        Yield rows, reporting progress from start to end as they are consumed.
+
+        Parameters:
+        - rows (iterable): Rows streamed to a writer.
+        - count (int): Expected number of rows.
+        - start (float): Progress fraction before the first row.
+        - end (float): Progress fraction after the last row.
+        - every (int): Rows between two progress reports (and cancellation checks).
+        """
+        for index, row in enumerate(rows):
+            if index % every == 0:
+                self.progress(start + (end - start) * index / max(count, 1), f"Writing rows ({index}/{count})...")
+            yield row
+
+    def run(self):
+        """Worker thread body: run the work and queue its outcome."""
+        try:
+            result = self.work(self)
+        except JobCancelled:
+            self.events.put(("cancelled", None))
+        except Exception as e:
+            self.events.put(("error", e))
+        else:
+            self.events.put(("done", result))
+
+    def poll(self):
+        """Tk-side: dispatch queued events to the callbacks, then poll again until finished."""
+        while True:
+            try:
+                kind, value = self.events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if self.on_progress is not None and not self.cancelled.is_set():
+                    self.on_progress(*value)
+                continue
+            self.finished = True
+            if kind == "done":
+                self.on_done(value)
+            elif kind == "error" and self.on_error is not None:
+                self.on_error(value)
+            elif kind == "cancelled" and self.on_cancelled is not None:
+                self.on_cancelled()
+            return
+        self.root.after(self.poll_ms, self.poll)
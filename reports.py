@@ -1,23 +1,29 @@
 from tkinter import Toplevel, messagebox, Label, Button, StringVar, ttk
 import tkinter as tk
-import os
-import random
-import string
-from openpyxl import Workbook
+from exports import save_summary_workbook
+from report_queries import month_range
+from analytics import load_history, WEEKDAYS
+from report_cache import ReportCache
+from report_worker import BackgroundJob
+from db import get_read_connection
+import metrics
 
 
-def open_monthly_report_dialog(root, cursor, format_time_callback):
+def open_monthly_report_dialog(root, cursor, format_time_callback, lookup_cache=None, db_path=None):
     """
     Open a dialog to select the month and year for which to generate a report.
 
     Parameters:
     - root (tk.Tk): The main application window.
-    - cursor (sqlite3.Cursor): Cursor to execute SQL queries.
+    - cursor (sqlite3.Cursor): Cursor to execute SQL queries (None when lookup_cache is given).
     - format_time (function): Function to convert seconds to hh:mm:ss string.
+    - lookup_cache (LookupCache): Cache providing the available years (optional; anything
+      with get_years(), e.g. the tracking engine).
+    - db_path (str): Database the report worker reads (default is db.DB_PATH).
     """
     report_window = Toplevel(root)
     report_window.title("Generate Monthly Report")
-    report_window.geometry("300x200")
+    report_window.geometry("300x250")
     report_window.grab_set()
 
     Label(report_window, text="Select Month:", font=("Arial", 11)).pack(pady=5)
@@ -30,13 +36,16 @@ def open_monthly_report_dialog(root, cursor, format_time_callback):
     year_var = StringVar()
     year_combo = ttk.Combobox(report_window, textvariable=year_var, state="readonly")
 
-    # Extract distinct years from DB
-    cursor.execute("SELECT DISTINCT date FROM tasks")
-    years = sorted({row[0][:4] for row in cursor.fetchall()})
+    # Available years, from the cache or the (small) monthly rollup and archive registry
+    if lookup_cache is not None:
+        years = lookup_cache.get_years()
+    else:
+        cursor.execute("SELECT substr(month, 1, 4) FROM monthly_totals UNION SELECT year FROM archived_years ORDER BY 1")
+        years = [row[0] for row in cursor.fetchall()]
     year_combo["values"] = years
     year_combo.pack(pady=5)
 
-    Button(
+    generate_button = Button(
         report_window,
         text="Generate Report",
         bg="#1980e6",
@@ -46,71 +55,173 @@ def open_monthly_report_dialog(root, cursor, format_time_callback):
             month_var.get(),
             year_var.get(),
             report_window,
-            cursor,
+            db_path,
             format_time_callback,
-            root
+            root,
+            generate_button,
         )
-    ).pack(pady=15)
+    )
+    generate_button.pack(pady=15)
 
 
-def generate_monthly_report(month, year, window, cursor, format_time, root):
+def generate_monthly_report(month, year, window, db_path, format_time, root, button=None):
     """
-    Generates a monthly report for a given month and year, saves it to an Excel file,
-    and displays the results in a popup.
+    Generates a monthly report for a given month and year in the background, saves
+    it to an Excel file, and displays the results in a popup.
 
     Parameters:
     - month (str): Month in MM format (e.g., '01' for January).
     - year (str): Year in YYYY format.
     - window (tk.Toplevel): The modal window to destroy after generating.
-    - cursor (sqlite3.Cursor): Cursor to access the task data from the database.
+    - db_path (str): Database the report worker reads (None for db.DB_PATH).
     - format_time (function): Function to convert seconds to hh:mm:ss string.
     - root (tk.Tk): The main application root to use as parent for messagebox.
+    - button (tk.Button): The dialog's generate button, turned into 'Cancel' while running (optional).
     """
     if not month or not year:
         messagebox.showerror("Missing Fields", "Please select both month and year.")
         return
 
-    cursor.execute("""
-        SELECT name, SUM(total_time) 
-        FROM tasks 
-        WHERE strftime('%m', date) = ? AND strftime('%Y', date) = ?
-        GROUP BY name
-    """, (month, year))
-    rows = cursor.fetchall()
+    start, end = month_range(year, month)
+    generate_report(f"{year}-{month}", "Monthly", start, end, window, db_path, format_time, root, button)
 
-    if not rows:
-        messagebox.showinfo("No Data", "No tasks found for the selected month.")
-        return
 
-    total_time = sum(row[1] for row in rows)
-    if total_time == 0:
-        messagebox.showinfo("No Time", "No time tracked for the selected month.")
-        return
+def generate_report(period, kind, start, end, window, db_path, format_time, root, button=None):
+    """
+    Generates a report for any half-open date range on a background worker, saves
+    it to an Excel file (summary plus a per-day sheet), and displays the results
+    in a popup.
+
+    Parameters:
+    - period (str): Period label used in titles and the filename (e.g., '2025-03').
+    - kind (str): Report kind shown in titles (e.g., 'Monthly', 'Weekly').
+    - start (str): First day included (YYYY-MM-DD).
+    - end (str): First day excluded (YYYY-MM-DD).
+    - window (tk.Toplevel): The modal window to destroy after generating.
+    - db_path (str): Database the report worker reads (None for db.DB_PATH).
+    - format_time (function): Function to convert seconds to hh:mm:ss string.
+    - root (tk.Tk): The main application root to use as parent for messagebox.
+    - button (tk.Button): Button turned into 'Cancel' while the job runs (optional).
 
-    # === 1. Generate unique filename ===
-    rand_str = ''.join(random.choices(string.ascii_uppercase + string.digits, k=6))
-    filename = f"report_{year}_{month}_{rand_str}.xlsx"
+    Behavior:
+    - The query and the export run in build_report on a worker thread with
+      its own read-only connection; a progress bar in window follows it and
+      the Tk loop (timers, idle countdown) keeps running.
+    - Cancelling, or closing window, stops the job at its next progress check.
+    """
+    progress = ttk.Progressbar(window, mode="determinate", maximum=1.0)
+    progress.pack(fill=tk.X, padx=20)
+    status = Label(window, text="Starting...", font=("Arial", 9))
+    status.pack()
+    restore = {"text": button.cget("text"), "command": button.cget("command")} if button else None
 
-    # === 2. Create 'reports' folder if it doesn't exist ===
-    report_dir = os.path.join(os.getcwd(), "reports")
-    os.makedirs(report_dir, exist_ok=True)
+    def finish():
+        if window.winfo_exists():
+            progress.destroy()
+            status.destroy()
+            if button is not None:
+                button.config(**restore)
 
-    file_path = os.path.join(report_dir, filename)
+    def on_progress(fraction, message):
+        if window.winfo_exists():
+            progress.config(value=fraction)
+            status.config(text=message)
 
-    # === 3. Save Excel report ===
-    wb = Workbook()
-    ws = wb.active
-    ws.title = f"{year}-{month} Report"
-    ws.append(["Task Name", "Total Time", "Percentage"])
+    def on_done(result):
+        finish()
+        if not window.winfo_exists():
+            return
+        rows, total_time, weekdays, file_path = result
+        if not rows:
+            messagebox.showinfo("No Data", "No tasks found for the selected period.", parent=window)
+        elif total_time == 0:
+            messagebox.showinfo("No Time", "No time tracked for the selected period.", parent=window)
+        else:
+            with metrics.timed("report.render"):
+                show_report(kind, period, rows, total_time, weekdays, file_path, window, format_time, root)
 
-    for name, time in rows:
-        percent = (time / total_time) * 100
-        ws.append([name, format_time(time), f"{percent:.1f}"])
+    def on_error(error):
+        finish()
+        messagebox.showerror("Report Failed", str(error), parent=root)
+
+    def on_cancelled():
+        finish()
+        if window.winfo_exists():
+            messagebox.showinfo("Cancelled", "Report generation was cancelled.", parent=window)
 
-    wb.save(file_path)
+    job = BackgroundJob(
+        root,
+        lambda job: build_report(job, db_path, period, kind, start, end, format_time),
+        on_done,
+        on_error=on_error,
+        on_progress=on_progress,
+        on_cancelled=on_cancelled,
+    )
+    if button is not None:
+        button.config(text="Cancel", command=job.cancel)
+    window.protocol("WM_DELETE_WINDOW", lambda: (job.cancel(), window.destroy()))
+    job.start()
 
+
+def build_report(job, db_path, period, kind, start, end, format_time):
+    """
+    Worker-thread part of generate_report: load the range and export the workbook.
+
+    Parameters:
+    - job (BackgroundJob): The running job (progress and cancellation).
+    - db_path, period, kind, start, end, format_time: See generate_report.
+
+    Returns:
+    - tuple: (rows, total_time, weekday totals, file path); the last two are
+      None when nothing was tracked.
+
+    Behavior:
+    - The range is loaded once into the analytics engine; the per-task totals
+      and the weekday breakdown are both computed from it.
+    - The workbook comes from the report cache: if nothing in the period has
+      changed since it was last generated, the existing file is reused.
+    - The data version (the cache key) and the history are read in one read
+      transaction, so a write committed meanwhile can never be filed under a
+      version that already includes it.
+    - With metrics enabled, the phases are timed ('report.query', 'report.export').
+    """
+    conn = get_read_connection(db_path)
+    try:
+        cursor = conn.cursor()
+        cache = ReportCache()
+        job.progress(0.05, "Loading history...")
+        with metrics.timed("report.query"):
+            cursor.execute("BEGIN")
+            try:
+                file_path = cache.path_for(cursor, period, kind.lower(), start, end, "xlsx")
+                history = load_history(cursor, start, end)
+            finally:
+                cursor.execute("COMMIT")
+            rows = history.task_totals()
+        total_time = sum(row[1] for row in rows)
+        if total_time == 0:
+            return rows, total_time, None, None
+
+        job.progress(0.3, "Writing workbook...")
+        with metrics.timed("report.export"):
+            if not cache.get(file_path):
+                title, header, detail_rows = history.trend_table("day")
+                detail = (title, header, job.track(detail_rows, len(detail_rows), 0.3, 0.9))
+                cache.build(file_path, lambda path: save_summary_workbook(
+                    rows, period, format_time, detail=detail, file_path=path
+                ))
+        job.progress(1.0, "Done")
+        return rows, total_time, history.per_weekday().sum(axis=0).tolist(), file_path
+    finally:
+        conn.close()
+
+
+def show_report(kind, period, rows, total_time, weekdays, file_path, window, format_time, root):
+    """
+    Builds the report text and shows it in a copyable popup, replacing window.
+    """
     # === 4. Build table text ===
-    table_text = f"Monthly Report for {year}-{month}\n\n"
+    table_text = f"{kind} Report for {period}\n\n"
     table_text += f"Time format: hh:mm:ss\n\n"
     table_text += f"{'Task':<20} {'Time':<10} {'%':<5}\n"
     table_text += "-" * 40 + "\n"
@@ -119,13 +230,18 @@ def generate_monthly_report(month, year, window, cursor, format_time, root):
         percent = (time / total_time) * 100
         table_text += f"{name:<20} {format_time(time):<10} {percent:.1f}%\n"
 
+    table_text += "\nBy weekday:\n"
+    for day, time in zip(WEEKDAYS, weekdays):
+        if time:
+            table_text += f"{day:<20} {format_time(time):<10}\n"
+
     table_text += f"\nReport saved to:\n{file_path}"
 
     # === 5. Show report in copyable popup ===
     window.destroy()
 
     report_window = Toplevel(root)
-    report_window.title("Monthly Report")
+    report_window.title(f"{kind} Report")
     report_window.geometry("500x400")
     report_window.grab_set()
 
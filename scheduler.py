@@ -0,0 +1,82 @@
+# scheduler.py
+
+import time
+
+import metrics
+
+
+class Ticker:
+    def __init__(self, root, callback, interval_ms=1000):
+        """
+        Initialize a single periodic ticker shared by all running tasks.
+
+        Parameters:
+        - root (tk.Tk): Tk root used to schedule the ticks.
+        - callback (function): Called once per tick with the list of running tasks.
+        - interval_ms (int): Tick interval in milliseconds (default is 1000).
+
+        Behavior:
+        - Runs only while at least one task is registered.
+        - Ticks are scheduled against a fixed monotonic deadline, so a slow tick
+          does not push every following tick later.
+        - With metrics enabled, records how late each tick fires ('tk.tick_lateness')
+          and how long the callback takes ('tk.tick').
+        """
+        self.root = root
+        self.callback = callback
+        self.interval_ms = interval_ms
+        self.running = {}
+        self.after_id = None
+        self.next_deadline = 0.0
+
+    def register(self, task):
+        """
+        Add a task to the running registry and start ticking if needed.
+
+        Parameters:
+        - task (Task): Task that has just been started.
+
+        Behavior:
+        - Registering an already registered task has no effect, so a quick
+          pause/resume never creates a second tick chain.
+        """
+        self.running[task.name] = task
+        if self.after_id is None:
+            self.next_deadline = time.monotonic()
+            self.schedule()
+
+    def unregister(self, task):
+        """
+        Remove a task from the running registry and stop ticking when empty.
+
+        Parameters:
+        - task (Task): Task that has just been paused.
+        """
+        self.running.pop(task.name, None)
+        if not self.running and self.after_id is not None:
+            self.root.after_cancel(self.after_id)
+            self.after_id = None
+
+    def schedule(self):
+        """Schedule the next tick at the next deadline."""
+        self.next_deadline += self.interval_ms / 1000
+        now = time.monotonic()
+        if self.next_deadline < now:
+            # Fell more than a full interval behind: skip the missed ticks
+            self.next_deadline = now + self.interval_ms / 1000
+        delay = int((self.next_deadline - now) * 1000)
+        self.after_id = self.root.after(max(0, delay), self.tick)
+
+    def tick(self):
+        """Run the callback over all running tasks and schedule the next tick."""
+        self.after_id = None
+        if not self.running:
+            return
+        if metrics.enabled:
+            started = time.monotonic()
+            metrics.record("tk.tick_lateness", max(0.0, started - self.next_deadline))
+            self.callback(list(self.running.values()))
+            metrics.record("tk.tick", time.monotonic() - started)
+        else:
+            self.callback(list(self.running.values()))
+        self.schedule()
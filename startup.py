@@ -0,0 +1,58 @@
+# startup.py
+#
+# Cold-start instrumentation. main.py imports this module first, so the clock
+# starts before any other application import.
+#
+# Set TIMELOGTRACKR_STARTUP=report to print the timings (one JSON line on
+# stderr) after the first paint, or TIMELOGTRACKR_STARTUP=exit to print them
+# and quit (used by benchmarks/startup_budget.py).
+
+import os
+import sys
+import time
+
+STARTED = time.perf_counter()
+MODE = os.environ.get("TIMELOGTRACKR_STARTUP", "")
+
+# (label, milliseconds since STARTED), in order
+marks = []
+
+
+def mark(label):
+    """
+    Record how long after process start a startup step finished.
+
+    Parameters:
+    - label (str): Name of the step (e.g. 'imports', 'first_paint').
+    """
+    marks.append((label, (time.perf_counter() - STARTED) * 1000))
+
+
+def report():
+    """
+    Return the startup timings.
+
+    Returns:
+    - dict: Milliseconds since start for each mark, plus 'loaded_modules'
+      (number of modules in sys.modules at the time of the call).
+    """
+    timings = {label: round(ms, 2) for label, ms in marks}
+    timings["loaded_modules"] = len(sys.modules)
+    return timings
+
+
+def finish(root, close):
+    """
+    Mark the first paint and emit the report if TIMELOGTRACKR_STARTUP asks for it.
+
+    Parameters:
+    - root (tk.Tk): Main window.
+    - close (function): Shuts the app down; scheduled when the mode is 'exit'.
+    """
+    mark("first_paint")
+    if MODE in ("report", "exit"):
+        import json
+
+        print(json.dumps(report()), file=sys.stderr, flush=True)
+    if MODE == "exit":
+        root.after(0, close)
@@ -0,0 +1,188 @@
+# task_list.py
+
+import tkinter as tk
+
+
+class RowSlot:
+    # One recycled row of widgets; shows whichever task is scrolled into its place
+    __slots__ = ("frame", "name_label", "timer_label", "button", "item", "task")
+
+    def __init__(self, frame, name_label, timer_label, button, item):
+        self.frame = frame
+        self.name_label = name_label
+        self.timer_label = timer_label
+        self.button = button
+        self.item = item
+        self.task = None
+
+
+class TaskListView:
+    def __init__(self, parent, format_time, on_toggle, on_edit, row_height=52):
+        """
+        Initialize a scrollable task list that only builds widgets for visible rows.
+
+        Parameters:
+        - parent (tk.Widget): Container of the list.
+        - format_time (function): Function to format seconds into hh:mm:ss.
+        - on_toggle (function): Called with the Task whose start/pause button was clicked.
+        - on_edit (function): Called with the Task whose timer was clicked.
+        - row_height (int): Height of one row in pixels (default is 52).
+
+        Behavior:
+        - Rows are drawn on a Canvas; a pool of row widgets just large enough
+          to fill the window is created once and re-pointed at other tasks
+          while scrolling, so hundreds of tasks cost a screenful of widgets.
+        - All state lives in the Task objects. A task scrolled out of view is
+          unbound from its row (timer_label None), so rendering it is a no-op.
+        """
+        self.format_time = format_time
+        self.on_toggle = on_toggle
+        self.on_edit = on_edit
+        self.row_height = row_height
+        self.tasks = []
+        self.slots = []
+
+        self.frame = tk.Frame(parent, bg="white")
+        self.canvas = tk.Canvas(self.frame, bg="white", highlightthickness=0, yscrollincrement=row_height)
+        self.scrollbar = tk.Scrollbar(self.frame, orient=tk.VERTICAL, command=self.yview)
+        self.canvas.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+
+        self.canvas.bind("<Configure>", self.on_configure)
+        self.bind_wheel(self.canvas)
+
+    def add(self, task):
+        """
+        Append a task at the bottom of the list.
+
+        Parameters:
+        - task (Task): Task to display.
+        """
+        self.tasks.append(task)
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.tasks) * self.row_height))
+        self.layout()
+
+    def refresh(self, task):
+        """
+        Redraw the row of a task after its state changed (no-op when not visible).
+
+        Parameters:
+        - task (Task): Task that was started, paused or edited.
+        """
+        slot = task.row_widget
+        if slot is not None:
+            task.render(self.format_time)
+            slot.button.config(text=button_text(task))
+
+    def yview(self, *args):
+        """Scrollbar command: scroll the canvas and re-point the rows."""
+        self.canvas.yview(*args)
+        self.layout()
+
+    def on_configure(self, event):
+        """Stretch the rows to the canvas width and fill a resized window."""
+        for slot in self.slots:
+            self.canvas.itemconfigure(slot.item, width=event.width)
+        self.layout()
+
+    def on_wheel(self, event):
+        """Scroll one row per wheel notch (Windows/macOS delta, X11 buttons 4/5)."""
+        if getattr(event, "num", None) == 4 or getattr(event, "delta", 0) > 0:
+            self.yview("scroll", -1, "units")
+        else:
+            self.yview("scroll", 1, "units")
+
+    def bind_wheel(self, widget):
+        """Route mouse wheel events over widget to the list."""
+        widget.bind("<MouseWheel>", self.on_wheel)
+        widget.bind("<Button-4>", self.on_wheel)
+        widget.bind("<Button-5>", self.on_wheel)
+
+    def layout(self):
+        """
+        Show the tasks that fall inside the visible area.
+
+        Behavior:
+        - Grows the row pool to one screenful (plus one partial row) if needed,
+          then binds each row to the task at its position and hides the rest.
+        """
+        height = max(self.canvas.winfo_height(), self.row_height)
+        needed = min(len(self.tasks), height // self.row_height + 2)
+        while len(self.slots) < needed:
+            self.slots.append(self.make_slot())
+
+        first = max(0, int(self.canvas.canvasy(0)) // self.row_height)
+        for offset, slot in enumerate(self.slots):
+            index = first + offset
+            if offset < needed and index < len(self.tasks):
+                self.show(slot, self.tasks[index], index)
+            else:
+                self.hide(slot)
+
+    def show(self, slot, task, index):
+        """Bind a row to a task and move it to the task's position."""
+        self.canvas.coords(slot.item, 0, index * self.row_height)
+        self.canvas.itemconfigure(slot.item, state="normal")
+        if slot.task is not task:
+            self.unbind(slot)
+            if task.row_widget is not None:
+                self.unbind(task.row_widget)
+            slot.task = task
+            slot.name_label.config(text=task.name)
+            task.bind_ui(row_widget=slot, timer_label=slot.timer_label)
+        self.refresh(task)
+
+    def hide(self, slot):
+        """Unbind a row from its task and hide it."""
+        self.canvas.itemconfigure(slot.item, state="hidden")
+        self.unbind(slot)
+
+    def unbind(self, slot):
+        """Detach a row from its task (the task may already show in another row)."""
+        task = slot.task
+        if task is not None:
+            slot.task = None
+            if task.row_widget is slot:
+                task.bind_ui(row_widget=None, timer_label=None)
+
+    def make_slot(self):
+        """
+        Create one reusable row: icon, name, timer and a start/pause button.
+        """
+        row = tk.Frame(self.canvas, bg="white", height=self.row_height)
+        row.pack_propagate(False)
+
+        clock_icon = tk.Label(row, text="🕒", font=("Arial", 14), bg="#e7edf3", width=3)
+        clock_icon.pack(side=tk.LEFT, padx=5)
+
+        details = tk.Frame(row, bg="white")
+        details.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=10)
+
+        name_label = tk.Label(details, font=("Arial", 12, "bold"), bg="white")
+        name_label.pack(anchor="w")
+
+        timer = tk.Label(details, text="00:00:00", font=("Arial", 12, "bold"), fg="#4e7397", bg="white")
+        timer.pack(anchor="w")
+
+        button = tk.Button(row, text="Start", font=("Arial", 10, "bold"), bg="#1980e6", fg="white")
+        button.pack(side=tk.RIGHT, padx=10)
+
+        item = self.canvas.create_window(0, 0, window=row, anchor="nw", width=self.canvas.winfo_width(), height=self.row_height)
+        slot = RowSlot(row, name_label, timer, button, item)
+
+        # Handlers look the task up on the slot at click time, as the slot is recycled
+        timer.bind("<Button-1>", lambda e: slot.task and self.on_edit(slot.task))
+        button.config(command=lambda: slot.task and self.on_toggle(slot.task))
+        for widget in (row, clock_icon, details, name_label, timer, button):
+            self.bind_wheel(widget)
+        return slot
+
+
+def button_text(task):
+    """
+    Return the start/pause button label matching a task's state.
+    """
+    if task.running:
+        return "Pause"
+    return "Continue" if task.total_time else "Start"
@@ -0,0 +1,169 @@
+# task_model.py
+#
+# The Task timer, free of any GUI import so the headless engine (engine.py,
+# daemon.py) can use it; the Tk dialogs on tasks stay in task.py.
+
+import time
+from datetime import datetime, timedelta
+
+import metrics
+
+
+class Task:
+    # Fixed attribute set: no per-instance __dict__, which keeps thousands of tasks compact
+    __slots__ = (
+        "name", "total_time", "correction_time", "running", "start_ns", "start_time",
+        "row_widget", "timer_label", "label_text",
+    )
+
+    def __init__(self, name, total_time=0):
+        """
+        Initialize a Task instance.
+
+        Parameters:
+        - name (str): Name of the task.
+        - total_time (float): Total accumulated time in seconds (default is 0).
+        """
+        self.name = name
+        self.total_time = total_time
+        self.correction_time = 0
+        self.running = False
+        self.start_ns = 0
+        self.start_time = None
+        self.row_widget = None
+        self.timer_label = None
+        self.label_text = None
+
+    def start(self):
+        """
+        Start tracking time for the task.
+
+        Behavior:
+        - Elapsed time is measured on the monotonic clock, so NTP corrections,
+          DST changes and suspend/resume do not corrupt it.
+        - The wall-clock start (start_time) is only kept as an anchor for the
+          timestamps written to the DB.
+        """
+        if not self.running:
+            self.start_ns = time.monotonic_ns()
+            self.start_time = datetime.now()
+            self.running = True
+
+    def resume(self, started_at):
+        """
+        Resume a session that was started earlier, e.g. before a crash.
+
+        Parameters:
+        - started_at (datetime): Wall-clock start of the session.
+
+        Behavior:
+        - The time elapsed since started_at is converted once into a monotonic
+          offset; from then on the session is timed like one started with start().
+        """
+        if not self.running:
+            elapsed_ns = max(0, int((datetime.now() - started_at).total_seconds() * 1e9))
+            self.start_ns = time.monotonic_ns() - elapsed_ns
+            self.start_time = started_at
+            self.running = True
+
+    def pause(self):
+        """
+        Pause the task and update total time.
+
+        Returns:
+        - tuple: (started_at, ended_at, seconds) of the session that just ended,
+          or None if the task was not running. ended_at is the wall-clock
+          anchor plus the monotonic duration.
+        """
+        if self.running:
+            elapsed = (time.monotonic_ns() - self.start_ns) / 1e9
+            session = (self.start_time, self.start_time + timedelta(seconds=elapsed), elapsed)
+            self.total_time += elapsed
+            self.running = False
+            self.start_time = None
+            return session
+        return None
+
+    def get_elapsed_time(self):
+        """Return total tracked time (including current session if running)."""
+        if self.running:
+            return self.total_time + (time.monotonic_ns() - self.start_ns) / 1e9
+        return self.total_time
+
+    def set_manual_time(self, total_seconds):
+        """
+        Manually set the total time of the task.
+
+        Parameters:
+        - total_seconds (float): Total time to be set in seconds.
+        """
+        self.total_time = total_seconds
+
+    def sync(self, total_time, correction_time, running, session=0.0):
+        """
+        Adopt the state of the task reported by the tracking engine.
+
+        Parameters:
+        - total_time (float): Seconds tracked before the current session.
+        - correction_time (float): Sum of today's correction rows, in seconds.
+        - running (bool): Whether a session is running.
+        - session (float): Seconds of the current session.
+
+        Returns:
+        - bool: True if the task started or stopped running.
+
+        Behavior:
+        - A running session is re-anchored on the local monotonic clock, so
+          the timer keeps ticking between two syncs.
+        """
+        changed = running != self.running
+        self.total_time = total_time
+        self.correction_time = correction_time
+        self.running = running
+        self.start_ns = time.monotonic_ns() - int(session * 1e9) if running else 0
+        return changed
+
+    def bind_ui(self, row_widget, timer_label):
+        """
+        Bind the UI components to the task for future updates.
+
+        Parameters:
+        - row_widget (RowSlot): The list row currently showing the task, or None.
+        - timer_label (tk.Label): The label showing the task's time, or None.
+        """
+        self.row_widget = row_widget
+        self.timer_label = timer_label
+        self.label_text = None
+
+    def render(self, format_time):
+        """
+        Refresh the timer label, reconfiguring it only when the text changes.
+
+        Parameters:
+        - format_time (function): Function to format seconds into hh:mm:ss.
+
+        Returns:
+        - bool: True if the label was reconfigured.
+
+        Behavior:
+        - Does nothing while the task is scrolled out of view (no label bound).
+        - With metrics enabled, times formatting ('ui.format_time') and label
+          reconfiguration ('ui.label_update').
+        """
+        if self.timer_label is None:
+            return False
+        timing = metrics.enabled
+        if timing:
+            started = time.perf_counter()
+        text = format_time(self.get_elapsed_time() + self.correction_time)
+        if timing:
+            metrics.record("ui.format_time", time.perf_counter() - started)
+        if text == self.label_text:
+            return False
+        if timing:
+            started = time.perf_counter()
+        self.timer_label.config(text=text)
+        if timing:
+            metrics.record("ui.label_update", time.perf_counter() - started)
+        self.label_text = text
+        return True
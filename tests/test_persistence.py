@@ -0,0 +1,76 @@
+# tests/test_persistence.py
+#
+# Run from the repository root:
+#     python -m unittest discover tests
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+import db
+from persistence import WriteBehindQueue
+
+
+class WriteOrderTest(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, "tasks.db")
+        db.initialize_database(self.path)
+        self.manager = db.ConnectionManager(self.path)
+        self.queue = WriteBehindQueue(self.manager)
+        self.today = datetime.now().strftime("%Y-%m-%d")
+
+    def tearDown(self):
+        self.manager.close()
+        shutil.rmtree(self.folder)
+
+    def total(self, name):
+        conn = sqlite3.connect(self.path)
+        try:
+            return conn.execute("""
+                SELECT t.total_time FROM tasks t JOIN task_names n ON n.id = t.task_id
+                WHERE n.name = ? AND t.date = ? AND t.status != 'correction'
+            """, (name, self.today)).fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_edit_overrides_session_queued_behind_a_flush_in_flight(self):
+        self.queue.add_entry("A", self.today)
+        self.queue.flush().result()
+
+        # Hold the writer thread so the next flush stays in flight
+        gate = threading.Event()
+        self.manager.submit(lambda cursor: gate.wait())
+        self.queue.add_entry("B", self.today)
+        in_flight = self.queue.flush()
+        self.assertIsNotNone(in_flight)
+
+        # A 1 s session ends, then the time is set to 100 s; both wait behind the flush
+        started_at = datetime.now() - timedelta(seconds=1)
+        self.queue.record_start("A", started_at)
+        self.queue.record_interval("A", started_at, started_at + timedelta(seconds=1), 1.0)
+        self.assertIsNone(self.queue.flush())
+        self.queue.mark_dirty("A", self.today, 100)
+
+        gate.set()
+        in_flight.result()
+        self.queue.idle.wait()
+        self.queue.flush().result()
+        self.assertEqual(self.total("A"), 100)
+
+    def test_session_ended_after_an_edit_is_added(self):
+        self.queue.add_entry("A", self.today)
+        self.queue.mark_dirty("A", self.today, 100)
+        started_at = datetime.now() - timedelta(seconds=5)
+        self.queue.record_start("A", started_at)
+        self.queue.record_interval("A", started_at, started_at + timedelta(seconds=5), 5.0)
+        self.queue.flush().result()
+        self.assertEqual(self.total("A"), 105)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+# tracker_cli.py
+#
+# Control today's tasks from a terminal, through the running daemon (see
+# daemon.py).
+#
+# Usage:
+#     python tracker_cli.py list
+#     python tracker_cli.py add "Code review"
+#     python tracker_cli.py start "Code review"
+#     python tracker_cli.py pause "Code review"
+#     python tracker_cli.py toggle "Code review"
+#     python tracker_cli.py pause-all
+#     python tracker_cli.py set-time "Code review" 01:30:00
+#     python tracker_cli.py correct "Code review" 2024-05-02 00:15:00 --remove
+#     python tracker_cli.py search review
+
+import argparse
+import sys
+
+from engine import EngineError
+from engine_client import DaemonClient
+from exports import format_time
+
+
+def parse_duration(text):
+    """
+    Return the seconds of an hh:mm:ss duration.
+
+    Raises:
+    - argparse.ArgumentTypeError: If text is not hh:mm:ss.
+    """
+    try:
+        h, m, s = map(int, text.split(":"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid duration {text!r}, expected hh:mm:ss") from None
+    return h * 3600 + m * 60 + s
+
+
+def print_task(task):
+    """Print one task snapshot: state, time of today and name."""
+    state = "running" if task["running"] else "paused "
+    print(f"{state}  {format_time(task['total'] + task['session'] + task['correction'])}  {task['name']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Control today's tasks through the tracking daemon.")
+    parser.add_argument("--socket", default=None, help="Socket of the daemon (default is TIMELOGTRACKR_SOCKET or '<database>.sock').")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Show today's tasks.")
+    for command in ("add", "start", "pause", "toggle"):
+        commands.add_parser(command, help=f"{command.capitalize()} a task.").add_argument("name")
+    commands.add_parser("pause-all", help="Pause all running tasks.")
+    set_time = commands.add_parser("set-time", help="Set the time of one of today's tasks.")
+    set_time.add_argument("name")
+    set_time.add_argument("time", type=parse_duration, help="New time for today, corrections included (hh:mm:ss).")
+    correct = commands.add_parser("correct", help="Add a correction to a task on a day.")
+    correct.add_argument("name")
+    correct.add_argument("date", help="Day (YYYY-MM-DD).")
+    correct.add_argument("time", type=parse_duration, help="Time to add (hh:mm:ss).")
+    correct.add_argument("--remove", action="store_true", help="Remove the time instead of adding it.")
+    search = commands.add_parser("search", help="Find known task names.")
+    search.add_argument("text")
+    search.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    client = DaemonClient(args.socket)
+    try:
+        if args.command == "list":
+            for task in client.list_tasks():
+                print_task(task)
+        elif args.command == "pause-all":
+            for task in client.pause_all():
+                print_task(task)
+        elif args.command == "set-time":
+            print_task(client.set_time(args.name, args.time))
+        elif args.command == "correct":
+            seconds = -args.time if args.remove else args.time
+            task = client.add_correction(args.name, args.date, seconds)
+            print(f"{'Removed' if args.remove else 'Added'} {format_time(args.time)} ({args.name}, {args.date}).")
+            if task is not None:
+                print_task(task)
+        elif args.command == "search":
+            for name in client.search(args.text, args.limit):
+                print(name)
+        else:
+            method = {"add": client.add_task, "start": client.start, "pause": client.pause, "toggle": client.toggle}[args.command]
+            print_task(method(args.name))
+    except (EngineError, ConnectionError) as e:
+        sys.exit(str(e))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()